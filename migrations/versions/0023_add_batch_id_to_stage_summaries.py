@@ -0,0 +1,30 @@
+"""Add batch_id to audit_stage_summaries for OpenAI Batch API submissions."""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0023_add_stage_summary_batch_id"
+down_revision: Union[str, None] = "0022_add_report_pdf"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "audit_stage_summaries",
+        sa.Column("batch_id", sa.Text(), nullable=True),
+    )
+    op.create_index(
+        "ix_audit_stage_summaries_batch_id",
+        "audit_stage_summaries",
+        ["batch_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_stage_summaries_batch_id", table_name="audit_stage_summaries")
+    op.drop_column("audit_stage_summaries", "batch_id")
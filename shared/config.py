@@ -16,6 +16,7 @@ from dataclasses import dataclass
 from typing import Literal, Optional
 
 Environment = Literal["local", "dev", "staging", "prod"]
+ArtifactChecksumAlgo = Literal["blake2b", "md5"]
 
 
 @dataclass(frozen=True)
@@ -48,6 +49,7 @@ class AppConfig:
     domain_lock_ttl_seconds: int
     domain_lock_max_retries: int
     domain_lock_backoff_base_ms: int
+    domain_lock_backoff_cap_ms: int
     domain_min_delay_ms: int
     domain_throttle_ttl_seconds: int
     disable_throttle: bool
@@ -56,6 +58,12 @@ class AppConfig:
     # HTML artifact retention (worker; TECH_SPEC_V1.1.md, TECH_SPEC_V1.md)
     html_retention_days: int  # default 14, configurable 7–30
 
+    # Artifact checksum algorithm: "md5" (default, bare hex) or "blake2b" (128-bit digest,
+    # stored as "blake2b:<hex>" so rows record the algorithm).
+    artifact_checksum_algo: ArtifactChecksumAlgo
+    # Deflate level for html_gz artifacts (1 = fastest, 9 = smallest); default 6.
+    html_gz_level: int
+
     # Retention cleanup job (TECH_SPEC_V1.1.md)
     retention_cleanup_enabled: bool
     retention_cleanup_batch_size: int
@@ -114,6 +122,18 @@ class AppConfig:
                 return 14
             return max(7, min(30, days))
 
+        def _artifact_checksum_algo() -> str:
+            raw = os.getenv("ARTIFACT_CHECKSUM_ALGO", "md5").strip().lower()
+            return raw if raw in ("blake2b", "md5") else "md5"
+
+        def _html_gz_level() -> int:
+            raw = os.getenv("HTML_GZ_LEVEL", "6").strip()
+            try:
+                level = int(raw)
+            except ValueError:
+                return 6
+            return max(1, min(9, level))
+
         # In local/dev, default to disabling locks & throttle unless explicitly overridden.
         locks_disabled_by_default = environment in {"local", "dev"}
         throttle_disabled_by_default = environment in {"local", "dev"}
@@ -130,11 +150,14 @@ class AppConfig:
             domain_lock_ttl_seconds=int(os.getenv("DOMAIN_LOCK_TTL_SECONDS", "300")),
             domain_lock_max_retries=int(os.getenv("DOMAIN_LOCK_MAX_RETRIES", "3")),
             domain_lock_backoff_base_ms=int(os.getenv("DOMAIN_LOCK_BACKOFF_BASE_MS", "1000")),
+            domain_lock_backoff_cap_ms=int(os.getenv("DOMAIN_LOCK_BACKOFF_CAP_MS", "10000")),
             domain_min_delay_ms=int(os.getenv("DOMAIN_MIN_DELAY_MS", "2000")),
             domain_throttle_ttl_seconds=int(os.getenv("DOMAIN_THROTTLE_TTL_SECONDS", "60")),
             disable_throttle=_bool_env("DISABLE_THROTTLE", throttle_disabled_by_default),
             disable_locks=_bool_env("DISABLE_LOCKS", locks_disabled_by_default),
             html_retention_days=_html_retention_days(),
+            artifact_checksum_algo=_artifact_checksum_algo(),  # type: ignore[arg-type]
+            html_gz_level=_html_gz_level(),
             retention_cleanup_enabled=_bool_env("RETENTION_CLEANUP_ENABLED", False),
             retention_cleanup_batch_size=int(os.getenv("RETENTION_CLEANUP_BATCH_SIZE", "100")),
             retention_cleanup_dry_run=_bool_env("RETENTION_CLEANUP_DRY_RUN", False),
@@ -9,7 +9,7 @@ and worker services.
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterable, Optional
 from urllib.parse import urlparse
 from uuid import UUID, uuid4
 
@@ -977,6 +977,7 @@ class AuditRepository:
         model_version: str,
         token_usage: dict,
         cost_usd: float,
+        batch_id: Optional[str] = None,
     ) -> Optional[dict]:
         """
         Save or update a stage summary for a session.
@@ -988,6 +989,7 @@ class AuditRepository:
             model_version: Model version used
             token_usage: Dict with input_tokens and output_tokens
             cost_usd: Cost in USD
+            batch_id: OpenAI batch ID when the summary is produced via the Batch API
 
         Returns:
             Saved summary dict, or None if table doesn't exist
@@ -997,6 +999,16 @@ class AuditRepository:
 
         summary_id = uuid4()
         generated_at = datetime.now(timezone.utc)
+        values = {
+            "summary": summary,
+            "generated_at": generated_at,
+            "model_version": model_version,
+            "token_usage": token_usage,
+            "cost_usd": cost_usd,
+        }
+        if "batch_id" in self.stage_summaries_table.c:
+            # Always written, so a synchronous save also detaches the row from a batch.
+            values["batch_id"] = batch_id
 
         existing_stmt = select(self.stage_summaries_table).where(
             and_(
@@ -1015,13 +1027,7 @@ class AuditRepository:
                         self.stage_summaries_table.c.stage == stage,
                     )
                 )
-                .values(
-                    summary=summary,
-                    generated_at=generated_at,
-                    model_version=model_version,
-                    token_usage=token_usage,
-                    cost_usd=cost_usd,
-                )
+                .values(**values)
             )
             self.session.execute(update_stmt)
             self.session.flush()
@@ -1039,11 +1045,7 @@ class AuditRepository:
                 id=summary_id,
                 session_id=session_id,
                 stage=stage,
-                summary=summary,
-                generated_at=generated_at,
-                model_version=model_version,
-                token_usage=token_usage,
-                cost_usd=cost_usd,
+                **values,
             )
             self.session.execute(insert_stmt)
             self.session.flush()
@@ -1054,6 +1056,34 @@ class AuditRepository:
             result = self.session.execute(select_stmt).first()
             return dict(result._mapping) if result else None
 
+    def delete_batch_stage_summaries(
+        self, batch_id: str, *, keep_stages: Iterable[str] = ()
+    ) -> int:
+        """
+        Delete stage summaries still tagged with a Batch API batch ID.
+
+        Used to clear pending placeholders once a batch has ended without producing
+        them, so the stages are regenerated instead of staying "pending".
+
+        Args:
+            batch_id: OpenAI batch ID
+            keep_stages: Stages saved from this batch that must be kept
+
+        Returns:
+            Number of rows deleted (0 if the table or column doesn't exist)
+        """
+        table = self.stage_summaries_table
+        if table is None or "batch_id" not in table.c:
+            return 0
+
+        delete_stmt = table.delete().where(table.c.batch_id == batch_id)
+        keep = list(keep_stages)
+        if keep:
+            delete_stmt = delete_stmt.where(table.c.stage.not_in(keep))
+        result = self.session.execute(delete_stmt)
+        self.session.flush()
+        return result.rowcount
+
     def get_stage_summaries_by_session(self, session_id: UUID) -> list[dict]:
         """
         Get all stage summaries for a session.
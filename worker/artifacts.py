@@ -116,7 +116,7 @@ def save_visible_text(
     page_type: str,
     viewport: str,
     domain: str,
-    visible_text: str,
+    visible_text: str | bytes,
 ) -> Optional[str]:
     """Write visible text to storage; create artifact only on success."""
     try:
@@ -238,7 +238,7 @@ def save_html_gz(
     page_type: str,
     viewport: str,
     domain: str,
-    html_content: str,
+    html_content: str | bytes,
 ) -> Optional[str]:
     """Write HTML (gzip) to storage; create artifact only on success. Returns "html_gz" or None."""
     try:
@@ -21,3 +21,7 @@ PDP_VIEWPORTS = [
 # Redis key prefixes for domain lock and throttle (TECH_SPEC_V1.1.md §2, §3, §5)
 LOCK_KEY_PREFIX = "lock:domain:"
 THROTTLE_KEY_PREFIX = "throttle:domain:"
+
+# Lock/throttle keys carry a Redis Cluster hash tag "{p<n>}" with n = crc32(domain) % shards,
+# spreading domains across slots while keeping a domain's lock and throttle keys together
+LOCK_KEY_SHARDS = 64
@@ -62,6 +62,7 @@ from worker.crawl.pdp_candidates import (
 )
 from worker.crawl.pdp_validation import (
     PRICE_PATTERN,
+    build_pdp_validation_signals,
     evaluate_pdp_validation_signals,
     extract_pdp_validation_signals,
     is_valid_pdp_page,
@@ -126,6 +127,7 @@ __all__ = [
     "extract_pdp_candidate_links",
     # pdp_validation
     "PRICE_PATTERN",
+    "build_pdp_validation_signals",
     "evaluate_pdp_validation_signals",
     "is_valid_pdp_page",
     "extract_pdp_validation_signals",
@@ -7,6 +7,7 @@ dependencies. Returns True only when both overlay heuristic and blocking signal
 
 from __future__ import annotations
 
+import asyncio
 from typing import TypedDict
 
 from playwright.async_api import Page
@@ -187,6 +188,7 @@ def _overlay_hide_options() -> dict:
 async def apply_overlay_hide_in_frames(page: Page) -> tuple[int, int]:
     """
     Apply overlay hide (visibility: hidden) in main document and all iframes, one pass per frame.
+    Frames are evaluated concurrently.
 
     Per TECH_SPEC_V1.1.md §5 v1.23: hide elements matching overlay heuristic only;
     exclude structural nodes (html, body, main, header, nav, footer). Does not remove nodes.
@@ -196,11 +198,16 @@ async def apply_overlay_hide_in_frames(page: Page) -> tuple[int, int]:
     evaluate succeeded; cross-origin or otherwise failing frames are skipped.
     """
     options = _overlay_hide_options()
+    results = await asyncio.gather(
+        *(frame.evaluate(_OVERLAY_HIDE_JS, options) for frame in page.frames),
+        return_exceptions=True,
+    )
     total_hidden = 0
     frame_count = 0
-    for frame in page.frames:
+    for raw in results:
+        if isinstance(raw, BaseException):
+            continue
         try:
-            raw = await frame.evaluate(_OVERLAY_HIDE_JS, options)
             total_hidden += int(raw.get("hiddenCount", 0))
             frame_count += 1
         except Exception:
@@ -8,6 +8,7 @@ Per TECH_SPEC_V1.1.md §5 Popup Handling Policy v1.7.
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Iterable
 
 from playwright.async_api import BrowserContext, Page
@@ -334,32 +335,29 @@ def _iubenda_init_script() -> str:
     )
 
 
+# Script text is fixed per vendor, so build each once at import time.
+_PRECONSENT_SCRIPTS: dict[str, str] = {
+    VENDOR_ONETRUST: _onetrust_init_script(),
+    VENDOR_SHOPWARE: _shopware_init_script(),
+    VENDOR_COOKIEBOT: _cookiebot_init_script(),
+    VENDOR_TRUSTARC: _trustarc_init_script(),
+    VENDOR_QUANTCAST: _quantcast_init_script(),
+    VENDOR_DIDOMI: _didomi_init_script(),
+    VENDOR_USERCENTRICS: _usercentrics_init_script(),
+    VENDOR_COMPLIANZ: _complianz_init_script(),
+    VENDOR_CIVIC: _civic_init_script(),
+    VENDOR_OSANO: _osano_init_script(),
+    VENDOR_IUBENDA: _iubenda_init_script(),
+}
+
+
+@lru_cache(maxsize=32)
+def _preconsent_scripts_for(vendors: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+    return tuple((v, _PRECONSENT_SCRIPTS[v]) for v in vendors if v in _PRECONSENT_SCRIPTS)
+
+
 def get_preconsent_scripts(vendors: Iterable[str]) -> list[tuple[str, str]]:
-    scripts: list[tuple[str, str]] = []
-    for v in vendors:
-        if v == VENDOR_ONETRUST:
-            scripts.append((v, _onetrust_init_script()))
-        elif v == VENDOR_SHOPWARE:
-            scripts.append((v, _shopware_init_script()))
-        elif v == VENDOR_COOKIEBOT:
-            scripts.append((v, _cookiebot_init_script()))
-        elif v == VENDOR_TRUSTARC:
-            scripts.append((v, _trustarc_init_script()))
-        elif v == VENDOR_QUANTCAST:
-            scripts.append((v, _quantcast_init_script()))
-        elif v == VENDOR_DIDOMI:
-            scripts.append((v, _didomi_init_script()))
-        elif v == VENDOR_USERCENTRICS:
-            scripts.append((v, _usercentrics_init_script()))
-        elif v == VENDOR_COMPLIANZ:
-            scripts.append((v, _complianz_init_script()))
-        elif v == VENDOR_CIVIC:
-            scripts.append((v, _civic_init_script()))
-        elif v == VENDOR_OSANO:
-            scripts.append((v, _osano_init_script()))
-        elif v == VENDOR_IUBENDA:
-            scripts.append((v, _iubenda_init_script()))
-    return scripts
+    return list(_preconsent_scripts_for(tuple(vendors)))
 
 
 async def add_preconsent_init_scripts(context: BrowserContext, vendors: Iterable[str]) -> list[str]:
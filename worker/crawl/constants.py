@@ -26,24 +26,59 @@ SCROLL_STEP_RATIO = 0.8  # Scroll step as a ratio of viewport height
 MAX_SCROLL_STEPS = 20  # Max incremental scroll steps per page
 SCROLL_BOTTOM_WAIT_MS = 2000  # Extra wait at bottom for lazy loads
 
-# URL path patterns for PDP candidates (case-insensitive); match path segment or full path
-PDP_PATH_PATTERNS = [
+# URL path patterns for PDP candidates (case-insensitive); match path segment or full path.
+# PDP-filter constants below are tuples: read-only, compiled or iterated at import/call time.
+PDP_PATH_PATTERNS = (
     r"/product(?:s)?/",  # /product/, /products/
     r"/p/",
     r"/item(?:s)?/",
     r"/collections/[^/]+/products/",  # Shopify
     r"/products/",  # Shopify
     r"/shop/",  # common
-]
-# Paths to exclude (account, cart, checkout, logout)
-EXCLUDED_PATH_SEGMENTS = {"account", "cart", "checkout", "logout", "login", "signin", "signout"}
+)
+# Paths to exclude (account, cart, checkout, logout). Whole segments, matched anywhere in the
+# path; frozen because pdp_candidates compiles its exclusion regex from it at import.
+EXCLUDED_PATH_SEGMENTS = frozenset(
+    {"account", "cart", "checkout", "logout", "login", "signin", "signout"}
+)
+
+# Multi-label public suffixes for the eTLD+1 heuristic (any single-label TLD is implicit).
+# Not the full Public Suffix List: enough that shop.example.co.uk -> example.co.uk rather
+# than co.uk, so unrelated stores under a shared suffix are not treated as one site.
+MULTI_LABEL_PUBLIC_SUFFIXES = (
+    "co.uk",
+    "org.uk",
+    "ac.uk",
+    "gov.uk",
+    "com.au",
+    "net.au",
+    "org.au",
+    "co.nz",
+    "co.jp",
+    "co.kr",
+    "co.in",
+    "co.za",
+    "com.br",
+    "com.mx",
+    "com.ar",
+    "com.tr",
+    "com.cn",
+    "com.tw",
+    "com.sg",
+    "com.al",
+    "net.al",
+    "org.al",
+    "com.mk",
+    "com.gr",
+    "com.cy",
+)
 
 # Max PDP candidates to validate (deterministic cap)
 MAX_PDP_CANDIDATES = 20
 
 # Container element selectors (product-like boxes). Links inside are candidates when
 # the container has at least PRODUCT_CONTAINER_MIN_SIGNALS of: price, title, image, add-to-cart.
-PRODUCT_CONTAINER_SELECTORS = [
+PRODUCT_CONTAINER_SELECTORS = (
     ".product",
     "[class*='product-box']",
     "[class*='product-card']",
@@ -52,11 +87,11 @@ PRODUCT_CONTAINER_SELECTORS = [
     "[class*='theProduct']",
     "[data-product-id]",
     "[data-product]",
-]
+)
 
 # Legacy: broad "container a[href]" selectors for pattern-free candidate collection.
 # Context pass uses PRODUCT_CONTAINER_SELECTORS + 2-of-4 signal check instead.
-PRODUCT_LIKE_CONTAINER_SELECTORS = [
+PRODUCT_LIKE_CONTAINER_SELECTORS = (
     ".product a[href]",
     "[class*='product-box'] a[href]",
     "[class*='product-card'] a[href]",
@@ -65,25 +100,23 @@ PRODUCT_LIKE_CONTAINER_SELECTORS = [
     "[class*='theProduct'] a[href]",
     "[data-product-id] a[href]",
     "[data-product] a[href]",
-]
+)
 
 # Minimum signals (2-of-4) required inside a product-like container to accept its links.
 PRODUCT_CONTAINER_MIN_SIGNALS = 2
 
 # Selectors for container signal detection (price, title, image, add-to-cart).
 # Used when evaluating product-like containers; at least MIN_SIGNALS must match.
-PRODUCT_CONTAINER_PRICE_SELECTORS = [
-    "[class*='price'], [data-price], [itemprop='price']",
-]
-PRODUCT_CONTAINER_TITLE_SELECTORS = [
+PRODUCT_CONTAINER_PRICE_SELECTORS = ("[class*='price'], [data-price], [itemprop='price']",)
+PRODUCT_CONTAINER_TITLE_SELECTORS = (
     "h1, h2, h3, [class*='product-name'], [class*='product_title'], [itemprop='name']",
-]
+)
 PRODUCT_CONTAINER_IMAGE_SELECTOR = "img"
-PRODUCT_CONTAINER_ADD_TO_CART_SELECTORS = [
+PRODUCT_CONTAINER_ADD_TO_CART_SELECTORS = (
     "[class*='add-to-cart'], [class*='addToCart'], [name='add-to-cart']",
     "button:has-text('Add to Cart'), button:has-text('Add to Bag'), button:has-text('Buy Now')",
     "[class*='cart']",
-]
+)
 
 # --- Popup handling (TECH_SPEC_V1.1.md §5 Popup Handling Policy v1.6) ---
 # Selectors are categorized; only dismiss semantics (no buy/checkout/allow notifications).
@@ -355,12 +388,12 @@ POPUP_CONTAINER_SELECTORS = (
 MAX_DISMISSALS_PER_PASS = 5
 POPUP_VISIBILITY_TIMEOUT_MS = 1000
 POPUP_CLICK_TIMEOUT_MS = 2000
-# Settle delay after each popup dismiss click 
+# Settle delay after each popup dismiss click
 POPUP_SETTLE_AFTER_DISMISS_MS = 750
-# Settle delay after overlay hide fallback, before extraction 
+# Settle delay after overlay hide fallback, before extraction
 OVERLAY_HIDE_SETTLE_MS = 750
 
-# Extra deterministic wait before first popup pass to catch late overlays 
+# Extra deterministic wait before first popup pass to catch late overlays
 POPUP_PRE_PASS_WAIT_MS = 500
 
 # Safe dismiss keywords (button/link text); minimal set for deterministic matching.
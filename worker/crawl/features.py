@@ -6,15 +6,25 @@ Per TECH_SPEC_V1.md; no behavior change.
 
 from __future__ import annotations
 
+import copy
 import json
 import re
+from functools import lru_cache
 from typing import Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from playwright.async_api import Page
 
 from worker.crawl.pdp_validation import PRICE_PATTERN
 from worker.crawl.text import normalize_whitespace
 
+# Largest JSON-LD block (characters) whose parse is memoized by parse_product_ldjson.
+LDJSON_CACHE_MAX_CHARS = 16 * 1024
+
 
 async def extract_features_json(page: Page) -> dict:
     """
@@ -137,10 +147,24 @@ def parse_product_ldjson(content: str) -> dict[str, Any]:
     Parse Product schema.org JSON-LD and return product_fields (pure, for tests).
 
     Returns dict with name, sku, brand, offers, aggregateRating when present.
+    Blocks up to LDJSON_CACHE_MAX_CHARS are memoized on the raw content (variant PDPs often
+    repeat the same block); larger ones are parsed each time so the cache never pins big
+    LD graphs. Each call gets its own deep copy, nested values included.
     """
+    if not isinstance(content, str) or len(content) > LDJSON_CACHE_MAX_CHARS:
+        return _parse_product_ldjson(content)
+    return copy.deepcopy(_parse_product_ldjson_cached(content))
+
+
+@lru_cache(maxsize=256)
+def _parse_product_ldjson_cached(content: str) -> dict[str, Any]:
+    return _parse_product_ldjson(content)
+
+
+def _parse_product_ldjson(content: str) -> dict[str, Any]:
     out: dict[str, Any] = {}
     try:
-        data = json.loads(content)
+        data = orjson.loads(content) if orjson is not None else json.loads(content)
         if isinstance(data, list):
             for item in data:
                 if isinstance(item, dict) and item.get("@type") == "Product":
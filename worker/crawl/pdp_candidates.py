@@ -10,8 +10,9 @@ Validation (2-of-4 rule) and determinism unchanged. Cap applied after dedupe.
 from __future__ import annotations
 
 import re
-from typing import Optional
-from urllib.parse import urljoin, urlparse
+from functools import lru_cache
+from typing import Iterable, Optional
+from urllib.parse import urljoin, urlsplit
 
 from playwright.async_api import Page
 
@@ -19,6 +20,7 @@ from shared.logging import get_logger
 from worker.crawl.constants import (
     EXCLUDED_PATH_SEGMENTS,
     MAX_PDP_CANDIDATES,
+    MULTI_LABEL_PUBLIC_SUFFIXES,
     PDP_PATH_PATTERNS,
     PRODUCT_CONTAINER_ADD_TO_CART_SELECTORS,
     PRODUCT_CONTAINER_IMAGE_SELECTOR,
@@ -30,14 +32,40 @@ from worker.crawl.pdp_validation import PRICE_PATTERN
 
 logger = get_logger(__name__)
 
+# PDP_PATH_PATTERNS as one alternation, searched anywhere in the path (one C-level scan).
+# Both regexes are case-insensitive, so callers pass paths as-is (no lowercased copy).
+_PDP_PATH_RE = re.compile("|".join(f"(?:{p})" for p in PDP_PATH_PATTERNS), re.IGNORECASE)
+# Any whole path segment in EXCLUDED_PATH_SEGMENTS
+_EXCLUDED_SEGMENT_RE = re.compile(
+    r"(?:^|/)(?:" + "|".join(map(re.escape, sorted(EXCLUDED_PATH_SEGMENTS))) + r")(?:/|$)",
+    re.IGNORECASE,
+)
+
+
+def _build_suffix_trie(suffixes: tuple[str, ...]) -> dict[str, dict]:
+    """Reversed-label trie ("co.uk" -> {"uk": {"co": {"": {}}}}); "" marks a suffix end."""
+    trie: dict[str, dict] = {}
+    for suffix in suffixes:
+        node = trie
+        for label in reversed(suffix.split(".")):
+            node = node.setdefault(label, {})
+        node[""] = {}
+    return trie
+
+
+_SUFFIX_TRIE = _build_suffix_trie(MULTI_LABEL_PUBLIC_SUFFIXES)
+
 
+@lru_cache(maxsize=1024)
 def get_etld_plus_one(netloc: str) -> str:
     """
     Return eTLD+1 (site domain) for internal link comparison.
 
     Same eTLD+1 => internal (e.g. foleja.com and www.foleja.com).
-    Heuristic: strip leading "www.", then for 3+ parts use last two
-    (e.g. shop.example.com -> example.com).
+    Heuristic: strip leading "www.", then keep the public suffix plus one label. The suffix
+    is the last label, or the longest MULTI_LABEL_PUBLIC_SUFFIXES match found by walking
+    _SUFFIX_TRIE right to left (shop.example.com -> example.com,
+    shop.example.co.uk -> example.co.uk). Memoized: a page's links share few hosts.
     """
     n = (netloc or "").lower().strip()
     if not n:
@@ -45,8 +73,16 @@ def get_etld_plus_one(netloc: str) -> str:
     if n.startswith("www."):
         n = n[4:]
     parts = n.split(".")
-    if len(parts) >= 3:
-        return ".".join(parts[-2:])
+    suffix_len = 1
+    node = _SUFFIX_TRIE
+    for depth, label in enumerate(reversed(parts), start=1):
+        node = node.get(label)
+        if node is None:
+            break
+        if "" in node:
+            suffix_len = depth
+    if len(parts) > suffix_len:
+        return ".".join(parts[-(suffix_len + 1) :])
     return n
 
 
@@ -56,80 +92,139 @@ def is_pdp_candidate_path(path: str) -> bool:
 
     Pure function for unit tests.
     """
-    path_lower = path.lower().strip()
-    if not path_lower or path_lower == "/":
+    path = path.strip()
+    if not path or path == "/":
         return False
-    for pattern in PDP_PATH_PATTERNS:
-        if re.search(pattern, path_lower):
-            return True
-    return False
+    return _PDP_PATH_RE.search(path) is not None
 
 
 def _path_has_excluded_segment(path: str) -> bool:
-    """Return True if path contains an excluded segment (account, cart, etc.)."""
-    segments = [s.lower() for s in path.strip("/").split("/") if s]
-    return bool(segments and any(seg in EXCLUDED_PATH_SEGMENTS for seg in segments))
+    """Return True if path contains an excluded segment (account, cart, etc.; case-insensitive)."""
+    return _EXCLUDED_SEGMENT_RE.search(path) is not None
 
 
-def normalize_internal_url(href: str, base_url: str) -> Optional[str]:
+# Characters urlsplit treats specially (stripped, ;params, IPv6 brackets); hrefs containing
+# any of them take the urljoin/urlsplit path so both paths stay equivalent.
+_SLOW_PATH_CHARS_RE = re.compile(r"[;\[\]\t\r\n]")
+
+
+def _split_absolute_http(href: str) -> Optional[tuple[str, str, str]]:
     """
-    Resolve href against base_url; return normalized URL if same-domain and http(s), else None.
+    Single-pass split of an absolute http(s) href into (normalized, netloc, path).
 
-    Excludes mailto:, tel:, fragment-only. Pure function for unit tests.
+    Returns None when href needs the general urljoin/urlsplit path (relative, other scheme,
+    empty or non-ASCII host, or characters urlsplit treats specially).
+    """
+    if href.startswith("https://"):
+        scheme, start = "https", 8
+    elif href.startswith("http://"):
+        scheme, start = "http", 7
+    else:
+        return None
+    if _SLOW_PATH_CHARS_RE.search(href):
+        return None
+    end = len(href)
+    for sep in "?#":
+        i = href.find(sep, start, end)
+        if i != -1:
+            end = i
+    slash = href.find("/", start, end)
+    host_end = end if slash == -1 else slash
+    netloc = href[start:host_end].lower()
+    if not netloc or not netloc.isascii():
+        # Empty hosts resolve against base_url; non-ASCII ones get urlsplit's NFKC check.
+        return None
+    path = href[host_end:end].rstrip("/") or "/"
+    return f"{scheme}://{netloc}{path}", netloc, path
+
+
+def _normalize_internal_parts(href: str, base_url: str) -> Optional[tuple[str, str, str]]:
+    """
+    normalize_internal_url, also returning the (lowercased) netloc and path it was built from.
+
+    Lets the filters check site and path without parsing the normalized URL a second time.
     """
     href = (href or "").strip()
     if not href or href.startswith("mailto:") or href.startswith("tel:") or href.startswith("#"):
         return None
+    fast = _split_absolute_http(href)
+    if fast is not None:
+        return fast
     try:
-        full = urljoin(base_url, href)
-        parsed = urlparse(full)
-        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        scheme, netloc, path, _, _ = urlsplit(urljoin(base_url, href))
+        if scheme not in ("http", "https") or not netloc:
             return None
+        # Drop ;params from the last segment, as urlparse would
+        semi = path.find(";", max(path.rfind("/"), 0))
+        if semi != -1:
+            path = path[:semi]
         # Normalize: lowercase host, path without trailing slash (except /)
-        path = (parsed.path or "/").rstrip("/") or "/"
-        return f"{parsed.scheme}://{parsed.netloc.lower()}{path}"
+        netloc = netloc.lower()
+        path = path.rstrip("/") or "/"
+        return f"{scheme}://{netloc}{path}", netloc, path
     except Exception:
         return None
 
 
-def filter_pdp_candidate_urls(
-    urls: list[str],
+def normalize_internal_url(href: str, base_url: str) -> Optional[str]:
+    """
+    Resolve href against base_url; return normalized URL if same-domain and http(s), else None.
+
+    Excludes mailto:, tel:, fragment-only. Pure function for unit tests.
+    """
+    parts = _normalize_internal_parts(href, base_url)
+    return parts[0] if parts else None
+
+
+def _filter_internal_urls(
+    urls: Iterable[str],
     base_url: str,
-    max_candidates: int = MAX_PDP_CANDIDATES,
+    max_candidates: int,
+    require_path_pattern: bool,
 ) -> list[str]:
     """
-    Filter URLs to same-site (eTLD+1), PDP-path candidates; exclude account/cart/checkout/logout;
-    dedupe and return in input (insertion) order; cap applied after dedupe.
-
-    Pure function for unit tests.
+    Single pass over urls: normalize, dedupe (first occurrence wins), same-site, exclusions,
+    optional PDP path pattern; stops as soon as max_candidates URLs are kept.
     """
-    parsed_base = urlparse(base_url)
-    base_site = get_etld_plus_one(parsed_base.netloc or "")
+    if max_candidates <= 0:
+        return []
+    base_site = get_etld_plus_one(urlsplit(base_url).netloc)
     seen: set[str] = set()
     result: list[str] = []
     for raw in urls:
-        normalized = normalize_internal_url(raw, base_url)
-        if not normalized:
+        parts = _normalize_internal_parts(raw, base_url)
+        if not parts or parts[0] in seen:
             continue
-        parsed = urlparse(normalized)
-        if get_etld_plus_one(parsed.netloc or "") != base_site:
+        normalized, netloc, path = parts
+        if get_etld_plus_one(netloc) != base_site:
             continue
-        path = (parsed.path or "/").lower()
         if _path_has_excluded_segment(path):
             continue
-        if not is_pdp_candidate_path(path):
-            continue
-        if normalized in seen:
+        if require_path_pattern and not is_pdp_candidate_path(path):
             continue
         seen.add(normalized)
         result.append(normalized)
         if len(result) >= max_candidates:
             break
-    return result[:max_candidates]
+    return result
+
+
+def filter_pdp_candidate_urls(
+    urls: Iterable[str],
+    base_url: str,
+    max_candidates: int = MAX_PDP_CANDIDATES,
+) -> list[str]:
+    """
+    Filter URLs to same-site (eTLD+1), PDP-path candidates; exclude account/cart/checkout/logout;
+    dedupe and return in input (insertion) order; cap applied after dedupe.
+
+    Pure function for unit tests.
+    """
+    return _filter_internal_urls(urls, base_url, max_candidates, require_path_pattern=True)
 
 
 def filter_product_context_urls(
-    urls: list[str],
+    urls: Iterable[str],
     base_url: str,
     max_candidates: int = MAX_PDP_CANDIDATES,
 ) -> list[str]:
@@ -139,27 +234,7 @@ def filter_product_context_urls(
     Use for product-like container links (e.g. /categories/tv/TV-LED-FUEGO-43EL720GTV).
     Dedupe and return in input order; cap applied after dedupe. Pure function for tests.
     """
-    parsed_base = urlparse(base_url)
-    base_site = get_etld_plus_one(parsed_base.netloc or "")
-    seen: set[str] = set()
-    result: list[str] = []
-    for raw in urls:
-        normalized = normalize_internal_url(raw, base_url)
-        if not normalized:
-            continue
-        parsed = urlparse(normalized)
-        if get_etld_plus_one(parsed.netloc or "") != base_site:
-            continue
-        path = (parsed.path or "/").lower()
-        if _path_has_excluded_segment(path):
-            continue
-        if normalized in seen:
-            continue
-        seen.add(normalized)
-        result.append(normalized)
-        if len(result) >= max_candidates:
-            break
-    return result[:max_candidates]
+    return _filter_internal_urls(urls, base_url, max_candidates, require_path_pattern=False)
 
 
 async def _container_has_min_signals(container, min_signals: int) -> bool:
@@ -197,21 +272,54 @@ async def _container_has_min_signals(container, min_signals: int) -> bool:
     return count >= min_signals
 
 
-async def _is_inside_nav_or_footer(link_handle) -> bool:
-    """Return True if the link is inside nav or footer (and not inside a product container)."""
-    try:
-        # Check if any ancestor is nav or footer
-        return await link_handle.evaluate("""(el) => {
-            let n = el;
-            while (n) {
-                const tag = (n.tagName || '').toLowerCase();
-                if (tag === 'nav' || tag === 'footer') return true;
-                n = n.parentElement;
+# Pattern pass scopes, highest priority first: anchors inside an element matching the scope
+# ("main" -> "main a[href]"); None means any anchor on the page.
+_PATTERN_PASS_SCOPES = (
+    "[class*='product-grid']",
+    "[class*='featured-products']",
+    "[class*='products']",
+    "main",
+    None,
+)
+
+# Raw href attributes of anchors in each scope (in scope order, then DOM order), each element
+# once, skipping anchors inside nav or footer. Runs in the page: one round-trip. Pierces open
+# shadow roots the way page.locator() does: each root's anchors, then its shadow roots' (depth
+# first), and a scope may be an ancestor across the shadow boundary (reached via the host).
+_PATTERN_PASS_HREFS_JS = """(scopes) => {
+    const anchors = [];
+    const walk = (root) => {
+        anchors.push(...root.querySelectorAll('a[href]'));
+        for (const el of root.querySelectorAll('*')) {
+            if (el.shadowRoot) walk(el.shadowRoot);
+        }
+    };
+    walk(document);
+    const parentOf = (el) => el.parentElement || (el.parentNode && el.parentNode.host) || null;
+    const inScope = (el, scope) => {
+        for (let n = parentOf(el); n; n = parentOf(n)) {
+            if (n.matches(scope)) return true;
+        }
+        return false;
+    };
+    const seen = new Set();
+    const hrefs = [];
+    for (const scope of scopes) {
+        for (const a of anchors) {
+            if (seen.has(a)) continue;
+            try {
+                if (scope !== null && !inScope(a, scope)) continue;
+            } catch (e) {
+                break;
             }
-            return false;
-        }""")
-    except Exception:
-        return False
+            seen.add(a);
+            if (a.closest('nav, footer')) continue;
+            const href = a.getAttribute('href');
+            if (href) hrefs.push(href);
+        }
+    }
+    return hrefs;
+}"""
 
 
 async def extract_pdp_candidate_links(
@@ -230,25 +338,26 @@ async def extract_pdp_candidate_links(
     Links in nav/footer are skipped unless from the context pass (inside a product container).
     Same-site by eTLD+1; exclude account/cart/checkout; dedupe by normalized URL.
     """
-    base_site = get_etld_plus_one(urlparse(base_url).netloc or "")
+    base_site = get_etld_plus_one(urlsplit(base_url).netloc)
     hrefs: list[str] = []
     seen_urls: set[str] = set()
 
     def _same_site(netloc: str) -> bool:
         return get_etld_plus_one(netloc or "") == base_site
 
-    def _accept_link(normalized: str, require_path_pattern: bool) -> bool:
-        if not normalized or normalized in seen_urls:
-            return False
-        parsed = urlparse(normalized)
-        if not _same_site(parsed.netloc or ""):
-            return False
-        path = (parsed.path or "/").lower()
+    def _accept_link(href: str, require_path_pattern: bool) -> Optional[str]:
+        """Normalized URL if the link is a new same-site candidate, else None."""
+        parts = _normalize_internal_parts(href, base_url)
+        if not parts or parts[0] in seen_urls:
+            return None
+        normalized, netloc, path = parts
+        if not _same_site(netloc):
+            return None
         if _path_has_excluded_segment(path):
-            return False
+            return None
         if require_path_pattern and not is_pdp_candidate_path(path):
-            return False
-        return True
+            return None
+        return normalized
 
     # Pass 1: product-like containers with 2-of-4 signals
     for container_sel in PRODUCT_CONTAINER_SELECTORS:
@@ -269,8 +378,8 @@ async def extract_pdp_candidate_links(
                         href = await link.get_attribute("href")
                         if not href:
                             continue
-                        normalized = normalize_internal_url(href, base_url)
-                        if not _accept_link(normalized, require_path_pattern=False):
+                        normalized = _accept_link(href, require_path_pattern=False)
+                        if not normalized:
                             continue
                         seen_urls.add(normalized)
                         hrefs.append(normalized)
@@ -283,40 +392,25 @@ async def extract_pdp_candidate_links(
 
     context_pass_count = len(hrefs)
 
-    # Pass 2: pattern-based selectors; skip links that are only in nav/footer
-    pattern_selectors = [
-        "[class*='product-grid'] a[href]",
-        "[class*='featured-products'] a[href]",
-        "[class*='products'] a[href]",
-        "main a[href]",
-        "a[href]",
-    ]
-    for selector in pattern_selectors:
+    # Pass 2: pattern-based selectors; skip links that are only in nav/footer.
+    # Hrefs are collected in the page with one evaluate instead of per-link round-trips.
+    if len(hrefs) < max_candidates:
         try:
-            links = await page.locator(selector).all()
-            for link in links:
-                if len(hrefs) >= max_candidates:
-                    break
-                try:
-                    if await _is_inside_nav_or_footer(link):
-                        continue
-                    href = await link.get_attribute("href")
-                    if not href:
-                        continue
-                    normalized = normalize_internal_url(href, base_url)
-                    if not _accept_link(normalized, require_path_pattern=True):
-                        continue
-                    seen_urls.add(normalized)
-                    hrefs.append(normalized)
-                except Exception:
-                    continue
+            raw_hrefs = await page.evaluate(_PATTERN_PASS_HREFS_JS, list(_PATTERN_PASS_SCOPES))
+        except Exception:
+            raw_hrefs = []
+        for href in raw_hrefs:
+            normalized = _accept_link(href, require_path_pattern=True)
+            if not normalized:
+                continue
+            seen_urls.add(normalized)
+            hrefs.append(normalized)
             if len(hrefs) >= max_candidates:
                 break
-        except Exception:
-            continue
 
     pattern_pass_count = len(hrefs) - context_pass_count
-    result = list(dict.fromkeys(hrefs))[:max_candidates]
+    # hrefs is already deduped (seen_urls) and capped inside both passes
+    result = hrefs[:max_candidates]
     logger.info(
         "pdp_candidate_extraction_complete",
         context_pass_count=context_pass_count,
@@ -10,9 +10,15 @@ import re
 
 from playwright.async_api import Page
 
-# Price: currency + numeric pattern
+# How long extraction waits for <body> to be attached before giving up.
+PDP_BODY_TIMEOUT_MS = 5000
+
+# Price: currency + numeric pattern. Amounts before the currency start only at the head of a
+# digit run ((?<!\d), \b): same leftmost match, but no quadratic retry inside long digit runs.
 PRICE_PATTERN = re.compile(
-    r"[\$£€]\s*\d+(?:[.,]\d{2})?|\d+(?:[.,]\d{2})?\s*[\$£€]|\b\d+(?:[.,]\d+)?\s*(?:usd|eur|gbp)\b",
+    r"[\$£€]\s*\d+(?:[.,]\d{2})?"
+    r"|(?<!\d)\d+(?:[.,]\d{2})?\s*[\$£€]"
+    r"|\b\d+(?:[.,]\d+)?\s*(?:usd|eur|gbp)\b",
     re.I,
 )
 
@@ -53,68 +59,110 @@ def is_valid_pdp_page(signals: dict) -> bool:
     return valid
 
 
+def build_pdp_validation_signals(
+    *,
+    body_text: str,
+    has_price_element: bool,
+    has_add_to_cart: bool,
+    has_product_schema: bool,
+    has_title: bool,
+    has_image: bool,
+) -> dict:
+    """
+    Turn raw page facts into PDP validation signals (pure function for tests).
+
+    Price: PRICE_PATTERN in body text, else a price element. Title+image: h1 or product
+    title, plus an img. Product schema is decided in the page (see _PDP_FACTS_JS).
+    """
+    return {
+        "has_price": bool(PRICE_PATTERN.search(body_text)) or has_price_element,
+        "has_add_to_cart": has_add_to_cart,
+        "has_product_schema": has_product_schema,
+        "has_title_and_image": has_title and has_image,
+    }
+
+
+# Selectors and button texts behind the page facts (button texts mirror :has-text: substring,
+# case-insensitive, whitespace-collapsed).
+_PDP_FACT_SELECTORS = {
+    "price": "[class*='price'], [data-price], [itemprop='price']",
+    "addToCart": '[name="add-to-cart"], [class*="add-to-cart"], [class*="addToCart"]',
+    "addToCartTexts": ["add to cart", "add to bag", "buy now"],
+    "title": "h1, [class*='product-title'], [class*='product_title'], [itemprop='name']",
+}
+
+# Raw facts for build_pdp_validation_signals in one round-trip (body text, price element,
+# add-to-cart, product schema, title, image). Product schema: any JSON-LD block mentioning
+# "@type" and Product, checked in the page so large LD graphs never cross the wire.
+# Like the page.locator() calls it replaces, every lookup also searches open shadow roots,
+# and button text is read the way :has-text does (shadow content included, script/style
+# skipped).
+_PDP_FACTS_JS = """(sel) => {
+    const roots = [];
+    const walk = (root) => {
+        roots.push(root);
+        for (const el of root.querySelectorAll('*')) {
+            if (el.shadowRoot) walk(el.shadowRoot);
+        }
+    };
+    walk(document);
+    const any = (selector) => roots.some((root) => root.querySelector(selector) !== null);
+    const all = (selector) => roots.flatMap((root) => Array.from(root.querySelectorAll(selector)));
+    const skipText = new Set(['SCRIPT', 'NOSCRIPT', 'STYLE']);
+    const deepText = (node) => {
+        let text = '';
+        for (let child = node.firstChild; child; child = child.nextSibling) {
+            if (child.nodeType === Node.TEXT_NODE) text += child.nodeValue || '';
+            else if (child.nodeType === Node.ELEMENT_NODE && !skipText.has(child.nodeName)) {
+                text += deepText(child);
+            }
+        }
+        if (node.shadowRoot) text += deepText(node.shadowRoot);
+        return text;
+    };
+    const hasAddToCartText = () => all('button').some((b) => {
+        const text = deepText(b).replace(/\\u200b/g, '').replace(/\\s+/g, ' ').toLowerCase();
+        return sel.addToCartTexts.some((t) => text.includes(t));
+    });
+    return {
+        bodyText: document.body ? document.body.innerText : '',
+        hasPriceElement: any(sel.price),
+        hasAddToCart: any(sel.addToCart) || hasAddToCartText(),
+        hasProductSchema: all('script[type="application/ld+json"]').some((s) => {
+            const text = s.textContent || '';
+            return text.includes('"@type"') && text.includes('Product');
+        }),
+        hasTitle: any(sel.title),
+        hasImage: any('img'),
+    };
+}"""
+
+
 async def extract_pdp_validation_signals(page: Page) -> dict:
     """
     Extract PDP validation signals from current page: price, add-to-cart,
     product schema, title+image.
 
+    Waits up to PDP_BODY_TIMEOUT_MS for <body> to be attached, then reads every
+    fact in one page.evaluate. The facts arrive together, so there are no
+    partial results: if the wait or the evaluate fails, every signal is False.
+
     Returns dict with boolean keys: has_price, has_add_to_cart,
     has_product_schema, has_title_and_image.
     """
-    signals = {
-        "has_price": False,
-        "has_add_to_cart": False,
-        "has_product_schema": False,
-        "has_title_and_image": False,
-    }
     try:
-        # Price: body text or common price selectors
-        body_text = await page.inner_text("body", timeout=5000)
-        signals["has_price"] = bool(PRICE_PATTERN.search(body_text))
-        if not signals["has_price"]:
-            price_el = (
-                await page.locator(
-                    "[class*='price'], [data-price], [itemprop='price']"
-                ).first.count()
-                > 0
-            )
-            signals["has_price"] = price_el
-
-        # Add-to-cart / buy button
-        add_selectors = [
-            'button:has-text("Add to Cart")',
-            'button:has-text("Add to Bag")',
-            'button:has-text("Buy Now")',
-            '[name="add-to-cart"]',
-            '[class*="add-to-cart"]',
-            '[class*="addToCart"]',
-        ]
-        for sel in add_selectors:
-            if await page.locator(sel).first.count() > 0:
-                signals["has_add_to_cart"] = True
-                break
-
-        # Product schema.org JSON-LD
-        scripts = await page.locator('script[type="application/ld+json"]').all()
-        for script in scripts:
-            try:
-                content = await script.inner_text()
-                if '"@type"' in content and "Product" in content:
-                    signals["has_product_schema"] = True
-                    break
-            except Exception:
-                continue
-
-        # Product title + image cluster (h1 or product title + at least one img)
-        has_h1 = await page.locator("h1").first.count() > 0
-        product_title = (
-            await page.locator(
-                "[class*='product-title'], [class*='product_title'], [itemprop='name']"
-            ).first.count()
-            > 0
-        )
-        has_img = await page.locator("img").first.count() > 0
-        signals["has_title_and_image"] = (has_h1 or product_title) and has_img
+        await page.wait_for_selector("body", state="attached", timeout=PDP_BODY_TIMEOUT_MS)
+        facts = await page.evaluate(_PDP_FACTS_JS, _PDP_FACT_SELECTORS)
     except Exception:
-        pass
-    return signals
+        return dict.fromkeys(
+            ("has_price", "has_add_to_cart", "has_product_schema", "has_title_and_image"),
+            False,
+        )
+    return build_pdp_validation_signals(
+        body_text=facts["bodyText"],
+        has_price_element=facts["hasPriceElement"],
+        has_add_to_cart=facts["hasAddToCart"],
+        has_product_schema=facts["hasProductSchema"],
+        has_title=facts["hasTitle"],
+        has_image=facts["hasImage"],
+    )
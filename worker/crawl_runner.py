@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import re
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
@@ -59,21 +60,23 @@ _EXTRACTION_RETRY_PHRASES = [
     ("Target closed", "target_closed"),
     ("Navigation interrupted", "navigation_interrupted"),
 ]
+_EXTRACTION_RETRY_REASONS = {phrase.lower(): reason for phrase, reason in _EXTRACTION_RETRY_PHRASES}
+_EXTRACTION_RETRY_RE = re.compile(
+    "|".join(re.escape(phrase) for phrase, _ in _EXTRACTION_RETRY_PHRASES), re.IGNORECASE
+)
 
 
 def _is_transient_extraction_error(exc: BaseException) -> bool:
     """True if the exception is a transient error that allows one extraction retry."""
-    msg = str(exc)
-    return any(phrase.lower() in msg.lower() for phrase, _ in _EXTRACTION_RETRY_PHRASES)
+    return _EXTRACTION_RETRY_RE.search(str(exc)) is not None
 
 
 def _transient_extraction_reason(exc: BaseException) -> str:
     """Return the reason string for logging; use 'transient' if no known phrase matches."""
-    msg = str(exc).lower()
-    for phrase, reason in _EXTRACTION_RETRY_PHRASES:
-        if phrase.lower() in msg:
-            return reason
-    return "transient"
+    match = _EXTRACTION_RETRY_RE.search(str(exc))
+    if match is None:
+        return "transient"
+    return _EXTRACTION_RETRY_REASONS[match.group(0).lower()]
 
 
 def _log_popup_events(
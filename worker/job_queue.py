@@ -0,0 +1,45 @@
+"""
+Queue helpers for jobs the worker enqueues itself (stage summary batch polling).
+
+Jobs go on the same "audit_jobs" queue the worker consumes. Delayed jobs rely on
+the RQ scheduler, which worker.main starts alongside the worker.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import redis
+from rq import Queue
+
+from shared.config import get_config
+from shared.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def enqueue_stage_summary_batch_job(batch_id: str, delay_seconds: int = 0) -> str:
+    """
+    Enqueue a poll of an OpenAI stage summary batch, optionally after a delay.
+
+    Returns the RQ job ID.
+    """
+    config = get_config()
+    if not config.redis_url:
+        raise ValueError("REDIS_URL is not configured")
+
+    redis_conn = redis.from_url(config.redis_url)
+    queue = Queue("audit_jobs", connection=redis_conn)
+
+    job_func = "worker.jobs.process_stage_summary_batch_job"
+    if delay_seconds > 0:
+        job = queue.enqueue_in(timedelta(seconds=delay_seconds), job_func, batch_id)
+    else:
+        job = queue.enqueue(job_func, batch_id)
+    logger.info(
+        "stage_summary_batch_job_enqueued",
+        batch_id=batch_id,
+        job_id=job.id,
+        delay_seconds=delay_seconds,
+    )
+    return job.id
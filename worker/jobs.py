@@ -20,10 +20,9 @@ from worker.db import get_db_session
 from worker.error_summary import get_user_safe_error_summary
 from worker.locking import (
     DomainLockTimeoutError,
-    acquire_domain_lock,
+    acquire_domain_lock_and_throttle,
     normalize_domain,
     release_domain_lock,
-    throttle_wait,
     update_throttle_after_session,
 )
 from worker.orchestrator import run_audit_session
@@ -53,6 +52,7 @@ def process_audit_job(session_id: str, url: str) -> None:
 
     config = get_config()
     redis_client = None
+    lock_token: bytes | None = None
 
     with get_db_session() as db_session:
         repository = AuditRepository(db_session)
@@ -66,10 +66,11 @@ def process_audit_job(session_id: str, url: str) -> None:
 
         if not config.disable_locks:
             redis_client = get_current_connection()
-            throttle_wait(redis_client, domain, session_id, config, mode)
             worker_id = f"worker-{os.getpid()}"
             try:
-                acquire_domain_lock(redis_client, domain, worker_id, session_id, config)
+                lock_token = acquire_domain_lock_and_throttle(
+                    redis_client, domain, worker_id, session_id, config, mode
+                )
             except DomainLockTimeoutError as e:
                 logger.error(
                     "lock.acquire.timeout",
@@ -157,8 +158,44 @@ def process_audit_job(session_id: str, url: str) -> None:
                     error_type=type(e).__name__,
                 )
             if not config.disable_locks and redis_client is not None:
-                worker_id = f"worker-{os.getpid()}"
-                release_domain_lock(redis_client, domain, worker_id, session_id)
+                release_domain_lock(redis_client, domain, session_id, lock_token, config)
                 update_throttle_after_session(redis_client, domain, config)
 
     logger.info("audit_job_completed", session_id=session_id)
+
+
+def process_stage_summary_batch_job(batch_id: str) -> str:
+    """
+    RQ job handler that collects an OpenAI stage summary batch.
+
+    Saves each stage summary once the batch has finished. Returns the poll status:
+    while it is "pending" the batch is still running and this job enqueues itself
+    again after BATCH_POLL_INTERVAL_SECONDS. "completed" and "failed" are terminal;
+    placeholders the batch did not fill in have been deleted, so those stages are
+    regenerated synchronously when the report is built.
+
+    Args:
+        batch_id: OpenAI batch ID stored on the pending stage summaries
+    """
+    from worker.job_queue import enqueue_stage_summary_batch_job
+    from worker.stage_summary_generator import (
+        BATCH_POLL_INTERVAL_SECONDS,
+        BATCH_STATUS_PENDING,
+        poll_and_save_batch,
+    )
+
+    with get_db_session() as db_session:
+        repository = AuditRepository(db_session)
+        result = poll_and_save_batch(batch_id, repository)
+
+    if result["status"] == BATCH_STATUS_PENDING:
+        enqueue_stage_summary_batch_job(batch_id, delay_seconds=BATCH_POLL_INTERVAL_SECONDS)
+
+    logger.info(
+        "stage_summary_batch_job_completed",
+        batch_id=batch_id,
+        status=result["status"],
+        saved_count=len(result["saved"]),
+        cleared_count=result["cleared_count"],
+    )
+    return result["status"]
@@ -3,105 +3,236 @@ Redis domain lock and throttle helpers for crawl jobs.
 
 Ensures one active crawl per domain and enforces per-domain delay.
 All events are logged with session_id and domain. No behavior change to crawl outputs.
+
+acquire_domain_lock and throttle_wait have *_async twins for redis.asyncio clients; they
+share keys, scripts, backoff and log events, but wait with asyncio.sleep so an event loop
+can keep serving other sessions while one domain is throttled.
 """
 
 from __future__ import annotations
 
+import asyncio
 import random
+import re
 import time
-from typing import TYPE_CHECKING
-from urllib.parse import urlparse
+import zlib
+from functools import lru_cache
+from typing import TYPE_CHECKING, Awaitable, Callable, NoReturn
 
 from shared.logging import get_logger
-from worker.constants import LOCK_KEY_PREFIX, THROTTLE_KEY_PREFIX
+from worker.constants import LOCK_KEY_PREFIX, LOCK_KEY_SHARDS, THROTTLE_KEY_PREFIX
 
 if TYPE_CHECKING:
     from redis import Redis
+    from redis.asyncio import Redis as AsyncRedis
 
     from shared.config import AppConfig
 
 logger = get_logger(__name__)
 
 
+# Throttle slot reservation, shared by the scripts below (placeholders are KEYS/ARGV indexes:
+# throttle key, client now in ms, min delay in ms (0 skips the wait), throttle TTL in s).
+# Sets the throttle key to the time the crawl may start (now + wait) and leaves the wait in
+# wait_ms. Elapsed time is clamped to >= -min_delay: reserved slots are at most min_delay
+# ahead, so anything further is a wall-clock step between workers and must not turn into an
+# arbitrarily long sleep (the wait is capped at 2 * min_delay). Non-numeric values count as
+# missing.
+_RESERVE_THROTTLE_SLOT_LUA = """
+local now_ms = tonumber(ARGV[{now}])
+local min_delay_ms = tonumber(ARGV[{delay}])
+local wait_ms = 0
+local last_ms = tonumber(redis.call('GET', KEYS[{key}]))
+if last_ms then
+    local elapsed_ms = math.max(now_ms - last_ms, -min_delay_ms)
+    if elapsed_ms < min_delay_ms then
+        wait_ms = min_delay_ms - elapsed_ms
+    end
+end
+redis.call('SET', KEYS[{key}], tostring(now_ms + wait_ms), 'EX', ARGV[{ttl}])
+"""
+
+# Lock SET NX EX plus throttle slot reservation as one atomic script (one round-trip).
+# KEYS: lock key, throttle key. ARGV: lock value, lock TTL (s), client now (ms),
+# min delay (ms), throttle TTL (s). Returns {acquired, wait_ms}.
+_ACQUIRE_AND_THROTTLE_LUA = (
+    """
+if not redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    return {0, 0}
+end
+"""
+    + _RESERVE_THROTTLE_SLOT_LUA.format(key=2, now=3, delay=4, ttl=5)
+    + "return {1, wait_ms}\n"
+)
+
+# Throttle slot reservation alone (GET + SET in one round-trip).
+# KEYS: throttle key. ARGV: client now (ms), min delay (ms), throttle TTL (s). Returns wait_ms.
+_THROTTLE_LUA = _RESERVE_THROTTLE_SLOT_LUA.format(key=1, now=1, delay=2, ttl=3) + "return wait_ms\n"
+
+# Compare-and-delete: delete the lock only if its value is exactly ARGV[1] (the token returned
+# by acquire). Returns 1 deleted, 0 missing, -1 held by someone else.
+_RELEASE_LUA = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    return 0
+end
+if current == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return -1
+"""
+
+# Host part of a URL or bare host. Branch 1: a leading scheme (RFC 3986 characters) and "://",
+# then the netloc up to "/", "?" or "#", as urlparse reads it. A "://" later in the string
+# (e.g. in a query parameter) is not a scheme, so it cannot pick the host. Branch 2: no
+# scheme or empty netloc, the whole string is the host.
+_DOMAIN_RE = re.compile(r"(?:[a-z][a-z0-9+.-]*://)([^/?#]+)|(.+)", re.DOTALL)
+
+
 class DomainLockTimeoutError(Exception):
     """Raised when domain lock could not be acquired after max retries."""
 
 
+@lru_cache(maxsize=4096)
 def normalize_domain(url_or_host: str) -> str:
     """
     Normalize domain: lowercase, strip protocol and optional www.
 
+    One _DOMAIN_RE match (C-level scan) instead of going through urlparse; for
+    scheme://host input the netloc boundaries are the same as urlparse's. Results are
+    memoized per process.
+
     Examples:
         https://www.example.com/path -> example.com
         example.com -> example.com
     """
     s = url_or_host.strip().lower()
-    if "://" in s:
-        parsed = urlparse(s)
-        netloc = parsed.netloc or s
-    else:
-        netloc = s
-    if netloc.startswith("www."):
-        netloc = netloc[4:]
+    match = _DOMAIN_RE.match(s)
+    if match is None:
+        return s
+    netloc = (match[1] or match[2]).removeprefix("www.")
     return netloc or s
 
 
+@lru_cache(maxsize=4096)
+def _key_suffix(domain: str) -> str:
+    """
+    "{p<n>}:<domain>" key suffix: Cluster hash tag for the domain's partition plus domain.
+
+    crc32 keeps the partition stable across processes (unlike hash()); memoized so the
+    lock/throttle keys for a domain are a single concatenation after the first call.
+    """
+    return f"{{p{zlib.crc32(domain.encode('utf-8')) % LOCK_KEY_SHARDS}}}:{domain}"
+
+
 def _lock_key(domain: str) -> str:
-    return f"{LOCK_KEY_PREFIX}{domain}"
+    return LOCK_KEY_PREFIX + _key_suffix(domain)
 
 
 def _throttle_key(domain: str) -> str:
-    return f"{THROTTLE_KEY_PREFIX}{domain}"
+    return THROTTLE_KEY_PREFIX + _key_suffix(domain)
 
 
-def _lock_value(worker_id: str, session_id: str) -> str:
-    ts = int(time.time())
-    return f"{worker_id}:{session_id}:{ts}"
+def _lock_value(worker_id: str, session_id: str) -> bytes:
+    """Lock token b"worker_id:session_id:unix_seconds", built with C-level bytes formatting."""
+    return b"%b:%b:%d" % (
+        worker_id.encode("utf-8"),
+        session_id.encode("utf-8"),
+        time.time_ns() // 1_000_000_000,
+    )
 
 
-def acquire_domain_lock(
-    redis_client: Redis[bytes],
+def _acquire_with_retry(
     domain: str,
     worker_id: str,
     session_id: str,
     config: AppConfig,
-) -> None:
+    try_acquire: Callable[[bytes], bool],
+) -> bytes:
     """
-    Acquire per-domain lock; retry with exponential backoff (max 3 attempts).
+    Call try_acquire(lock_value) until it returns True, with decorrelated-jitter backoff.
+    Returns the lock value that was stored.
 
-    Raises DomainLockTimeoutError if lock cannot be acquired after max retries.
-    Logs lock.acquire.success, lock.acquire.retry, lock.acquire.timeout with session_id and domain.
+    Each wait is drawn uniformly from [base, min(cap, previous_wait * 3)], so workers
+    contending for the same domain spread their retries instead of retrying in lockstep.
+
+    Raises DomainLockTimeoutError after config.domain_lock_max_retries failed attempts.
     """
-    key = _lock_key(domain)
-    ttl = config.domain_lock_ttl_seconds
     max_retries = config.domain_lock_max_retries
-    base_ms = config.domain_lock_backoff_base_ms
+    wait_ms = config.domain_lock_backoff_base_ms
 
     for attempt in range(max_retries):
-        value = _lock_value(worker_id, session_id)
-        acquired = redis_client.set(key, value, nx=True, ex=ttl)
-        if acquired:
-            logger.info(
-                "lock.acquire.success",
-                domain=domain,
-                session_id=session_id,
-                worker_id=worker_id,
-                attempt=attempt + 1,
-            )
-            return
-
-        wait_ms = base_ms * (2**attempt) + random.randint(0, 500)
-        logger.info(
-            "lock.acquire.retry",
-            domain=domain,
-            session_id=session_id,
-            attempt=attempt + 1,
-            max_retries=max_retries,
-            wait_ms=wait_ms,
-        )
+        token = _lock_value(worker_id, session_id)
+        if try_acquire(token):
+            _log_acquired(domain, worker_id, session_id, attempt)
+            return token
+
+        # No retry after the last attempt: neither log one nor wait for it.
         if attempt < max_retries - 1:
+            wait_ms = _next_backoff_ms(domain, session_id, config, attempt, wait_ms)
             time.sleep(wait_ms / 1000.0)
 
+    _raise_acquire_timeout(domain, session_id, max_retries)
+
+
+async def _acquire_with_retry_async(
+    domain: str,
+    worker_id: str,
+    session_id: str,
+    config: AppConfig,
+    try_acquire: Callable[[bytes], Awaitable[bool]],
+) -> bytes:
+    """Async _acquire_with_retry: awaits try_acquire and backs off with asyncio.sleep."""
+    max_retries = config.domain_lock_max_retries
+    wait_ms = config.domain_lock_backoff_base_ms
+
+    for attempt in range(max_retries):
+        token = _lock_value(worker_id, session_id)
+        if await try_acquire(token):
+            _log_acquired(domain, worker_id, session_id, attempt)
+            return token
+
+        # No retry after the last attempt: neither log one nor wait for it.
+        if attempt < max_retries - 1:
+            wait_ms = _next_backoff_ms(domain, session_id, config, attempt, wait_ms)
+            await asyncio.sleep(wait_ms / 1000.0)
+
+    _raise_acquire_timeout(domain, session_id, max_retries)
+
+
+def _log_acquired(domain: str, worker_id: str, session_id: str, attempt: int) -> None:
+    logger.info(
+        "lock.acquire.success",
+        domain=domain,
+        session_id=session_id,
+        worker_id=worker_id,
+        attempt=attempt + 1,
+    )
+
+
+def _next_backoff_ms(
+    domain: str,
+    session_id: str,
+    config: AppConfig,
+    attempt: int,
+    previous_ms: int,
+) -> int:
+    """Draw the next decorrelated-jitter wait and log lock.acquire.retry."""
+    base_ms = config.domain_lock_backoff_base_ms
+    cap_ms = config.domain_lock_backoff_cap_ms
+    wait_ms = int(random.uniform(base_ms, max(base_ms, min(cap_ms, previous_ms * 3))))
+    logger.info(
+        "lock.acquire.retry",
+        domain=domain,
+        session_id=session_id,
+        attempt=attempt + 1,
+        max_retries=config.domain_lock_max_retries,
+        wait_ms=wait_ms,
+    )
+    return wait_ms
+
+
+def _raise_acquire_timeout(domain: str, session_id: str, max_retries: int) -> NoReturn:
     logger.error(
         "lock.acquire.timeout",
         domain=domain,
@@ -111,31 +242,134 @@ def acquire_domain_lock(
     raise DomainLockTimeoutError(f"Domain lock timeout for {domain} after {max_retries} attempts")
 
 
-def release_domain_lock(
+def acquire_domain_lock(
+    redis_client: Redis[bytes],
+    domain: str,
+    worker_id: str,
+    session_id: str,
+    config: AppConfig,
+) -> bytes | None:
+    """
+    Acquire per-domain lock; retry with jittered backoff (max 3 attempts).
+
+    Returns the lock token (pass it to release_domain_lock), or None when
+    config.disable_locks is set, in which case Redis is not called at all.
+
+    Raises DomainLockTimeoutError if lock cannot be acquired after max retries.
+    Logs lock.acquire.success, lock.acquire.retry, lock.acquire.timeout with session_id and domain.
+    """
+    if config.disable_locks:
+        return None
+    key = _lock_key(domain)
+    ttl = config.domain_lock_ttl_seconds
+
+    def _try(value: bytes) -> bool:
+        return bool(redis_client.set(key, value, nx=True, ex=ttl))
+
+    return _acquire_with_retry(domain, worker_id, session_id, config, _try)
+
+
+async def acquire_domain_lock_async(
+    redis_client: AsyncRedis,
+    domain: str,
+    worker_id: str,
+    session_id: str,
+    config: AppConfig,
+) -> bytes | None:
+    """
+    Async acquire_domain_lock for redis.asyncio clients; backoff waits yield to the loop.
+
+    Returns the lock token, or None when config.disable_locks is set. Raises
+    DomainLockTimeoutError if lock cannot be acquired after max retries.
+    """
+    if config.disable_locks:
+        return None
+    key = _lock_key(domain)
+    ttl = config.domain_lock_ttl_seconds
+
+    async def _try(value: bytes) -> bool:
+        return bool(await redis_client.set(key, value, nx=True, ex=ttl))
+
+    return await _acquire_with_retry_async(domain, worker_id, session_id, config, _try)
+
+
+def acquire_domain_lock_and_throttle(
     redis_client: Redis[bytes],
     domain: str,
     worker_id: str,
     session_id: str,
+    config: AppConfig,
+    mode: str,
+) -> bytes | None:
+    """
+    Acquire the per-domain lock and reserve the throttle slot in one Redis round-trip.
+
+    Same lock semantics and retries as acquire_domain_lock. Once the lock is held, the
+    throttle key is read and advanced by the same Lua script; the remaining min-delay wait
+    (if any) is slept on the client. Skips the wait when disable_throttle or mode=debug.
+
+    Returns the lock token for release_domain_lock, or None when config.disable_locks is
+    set, in which case Redis is not called at all. Raises DomainLockTimeoutError if lock
+    cannot be acquired after max retries.
+    """
+    if config.disable_locks:
+        return None
+    lock_key = _lock_key(domain)
+    throttle_key = _throttle_key(domain)
+    skip_wait = config.disable_throttle or mode == "debug"
+    script = redis_client.register_script(_ACQUIRE_AND_THROTTLE_LUA)
+    wait_ms = 0
+
+    def _try(value: bytes) -> bool:
+        nonlocal wait_ms
+        acquired, wait_ms = script(
+            keys=[lock_key, throttle_key],
+            args=[
+                value,
+                config.domain_lock_ttl_seconds,
+                int(time.time() * 1000),
+                0 if skip_wait else config.domain_min_delay_ms,
+                config.domain_throttle_ttl_seconds,
+            ],
+        )
+        return bool(acquired)
+
+    token = _acquire_with_retry(domain, worker_id, session_id, config, _try)
+
+    if not _skip_throttle(domain, session_id, config, mode) and wait_ms > 0:
+        _log_throttle_wait(domain, session_id, wait_ms)
+        time.sleep(wait_ms / 1000.0)
+    return token
+
+
+def release_domain_lock(
+    redis_client: Redis[bytes],
+    domain: str,
+    session_id: str,
+    token: bytes | None,
+    config: AppConfig | None = None,
 ) -> None:
     """
-    Release per-domain lock if we hold it (value matches worker_id:session_id).
+    Release per-domain lock if we still hold it (stored value is exactly token).
+
+    token is the value returned by the acquire call. Compare-and-delete runs as one Lua
+    script, so a lock that expired and was re-acquired by another worker between the check
+    and the delete is never removed. No-op (no Redis call) when token is None or
+    config.disable_locks is set.
 
     Logs lock.release.success or lock.release.stale with session_id and domain.
     """
-    key = _lock_key(domain)
-    raw = redis_client.get(key)
-    if raw is None:
+    if token is None or (config is not None and config.disable_locks):
+        return
+    script = redis_client.register_script(_RELEASE_LUA)
+    result = script(keys=[_lock_key(domain)], args=[token])
+    if result == 0:
         logger.debug(
             "lock.release.missing",
             domain=domain,
             session_id=session_id,
         )
-        return
-
-    current = raw.decode("utf-8") if isinstance(raw, bytes) else str(raw)
-    prefix = f"{worker_id}:{session_id}:"
-    if current.startswith(prefix):
-        redis_client.delete(key)
+    elif result == 1:
         logger.info(
             "lock.release.success",
             domain=domain,
@@ -158,42 +392,80 @@ def throttle_wait(
     mode: str,
 ) -> None:
     """
-    Enforce per-domain minimum delay: wait if needed, then set throttle key.
+    Enforce per-domain minimum delay: reserve the next throttle slot, then wait for it.
+
+    The throttle key is read and advanced by one Lua script (one round-trip); the
+    remaining wait is slept on the client.
 
     Skips wait when disable_throttle or mode=debug. Logs throttle.wait or throttle.skip
     with session_id and domain.
     """
-    if config.disable_throttle or mode == "debug":
-        logger.info(
-            "throttle.skip",
-            domain=domain,
-            session_id=session_id,
-            reason="debug_mode" if mode == "debug" else "testing",
-        )
+    if _skip_throttle(domain, session_id, config, mode):
         _set_throttle_timestamp(redis_client, domain, config)
         return
 
-    key = _throttle_key(domain)
-    min_delay_ms = config.domain_min_delay_ms
-    now_ms = int(time.time() * 1000)
-    raw = redis_client.get(key)
-    if raw is not None:
-        try:
-            last_ms = int(raw.decode("utf-8") if isinstance(raw, bytes) else raw)
-            elapsed_ms = now_ms - last_ms
-            if elapsed_ms < min_delay_ms:
-                wait_ms = min_delay_ms - elapsed_ms
-                logger.info(
-                    "throttle.wait",
-                    domain=domain,
-                    session_id=session_id,
-                    wait_ms=wait_ms,
-                )
-                time.sleep(wait_ms / 1000.0)
-        except (ValueError, TypeError):
-            pass
+    script = redis_client.register_script(_THROTTLE_LUA)
+    wait_ms = script(keys=[_throttle_key(domain)], args=_throttle_args(config))
+    if wait_ms > 0:
+        _log_throttle_wait(domain, session_id, wait_ms)
+        time.sleep(wait_ms / 1000.0)
 
-    _set_throttle_timestamp(redis_client, domain, config)
+
+async def throttle_wait_async(
+    redis_client: AsyncRedis,
+    domain: str,
+    session_id: str,
+    config: AppConfig,
+    mode: str,
+) -> None:
+    """
+    Async throttle_wait for redis.asyncio clients: same script and log events, but the
+    remaining wait is an asyncio.sleep so other sessions on the loop keep running.
+    """
+    if _skip_throttle(domain, session_id, config, mode):
+        await redis_client.set(
+            _throttle_key(domain),
+            str(int(time.time() * 1000)),
+            ex=config.domain_throttle_ttl_seconds,
+        )
+        return
+
+    script = redis_client.register_script(_THROTTLE_LUA)
+    wait_ms = await script(keys=[_throttle_key(domain)], args=_throttle_args(config))
+    if wait_ms > 0:
+        _log_throttle_wait(domain, session_id, wait_ms)
+        await asyncio.sleep(wait_ms / 1000.0)
+
+
+def _skip_throttle(domain: str, session_id: str, config: AppConfig, mode: str) -> bool:
+    """True (and logs throttle.skip) when disable_throttle or mode=debug."""
+    if not (config.disable_throttle or mode == "debug"):
+        return False
+    logger.info(
+        "throttle.skip",
+        domain=domain,
+        session_id=session_id,
+        reason="debug_mode" if mode == "debug" else "testing",
+    )
+    return True
+
+
+def _throttle_args(config: AppConfig) -> list[int]:
+    """_THROTTLE_LUA ARGV: client now (ms), min delay (ms), throttle TTL (s)."""
+    return [
+        int(time.time() * 1000),
+        config.domain_min_delay_ms,
+        config.domain_throttle_ttl_seconds,
+    ]
+
+
+def _log_throttle_wait(domain: str, session_id: str, wait_ms: int) -> None:
+    logger.info(
+        "throttle.wait",
+        domain=domain,
+        session_id=session_id,
+        wait_ms=wait_ms,
+    )
 
 
 def _set_throttle_timestamp(
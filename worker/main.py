@@ -14,6 +14,7 @@ from rq import Connection, Queue, Worker
 
 from shared.config import get_config
 from shared.logging import configure_logging, get_logger
+from worker.storefront_report_card import load_tokenizer
 
 load_dotenv()
 
@@ -54,6 +55,11 @@ def main() -> None:
         print("ERROR: DATABASE_URL environment variable is required.", file=sys.stderr)
         sys.exit(1)
 
+    # Load the prompt tokenizer before taking jobs (the first load may download its BPE
+    # file); job processes inherit it, so report cards never fetch it on the event loop.
+    if not load_tokenizer():
+        logger.warning("tokenizer_preload_failed")
+
     logger.info("worker_starting", redis_url=config.redis_url)
 
     # Start RQ worker
@@ -66,7 +72,8 @@ def main() -> None:
         print("Press Ctrl+C to stop.")
 
         try:
-            worker.work()
+            # The scheduler runs delayed jobs (stage summary batch re-polls).
+            worker.work(with_scheduler=True)
         except KeyboardInterrupt:
             logger.info("worker_stopping")
             print("\nWorker stopped.")
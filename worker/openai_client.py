@@ -0,0 +1,90 @@
+"""
+OpenAI call helper: retry transient failures with exponential backoff and jitter.
+
+Rate limits, timeouts, connection drops and 5xx responses are retried; any
+other error (bad request, auth, etc.) is raised immediately so callers can
+keep their own fallback handling for permanent failures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+import openai
+from openai import AsyncOpenAI, OpenAI
+
+from shared.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Max 3 attempts; backoff 1s, 2s, 4s ... capped at 30s, plus 0–1s jitter
+MAX_OPENAI_ATTEMPTS = 3
+BACKOFF_INITIAL_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+JITTER_SECONDS = 1.0
+
+RETRYABLE_OPENAI_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Exponential backoff for attempt 1-based index, capped, plus jitter."""
+    base = min(BACKOFF_MAX_SECONDS, BACKOFF_INITIAL_SECONDS * (2 ** (attempt - 1)))
+    return base + random.uniform(0, JITTER_SECONDS)
+
+
+def create_chat_completion(client: OpenAI, **body):
+    """
+    Call client.chat.completions.create, retrying transient OpenAI errors.
+
+    Clients should be created with max_retries=0 so the SDK's own retries do
+    not multiply with these.
+
+    Raises:
+        The last retryable error once MAX_OPENAI_ATTEMPTS is exhausted, or any
+        non-retryable error immediately.
+    """
+    for attempt in range(1, MAX_OPENAI_ATTEMPTS + 1):
+        try:
+            return client.chat.completions.create(**body)
+        except RETRYABLE_OPENAI_ERRORS as e:
+            if attempt >= MAX_OPENAI_ATTEMPTS:
+                raise
+            delay = _backoff_seconds(attempt)
+            logger.warning(
+                "openai_call_retry",
+                attempt=attempt,
+                delay_seconds=round(delay, 2),
+                error_type=type(e).__name__,
+                error=str(e),
+            )
+            time.sleep(delay)
+
+
+async def acreate_chat_completion(client: AsyncOpenAI, **body):
+    """
+    Async variant of create_chat_completion for AsyncOpenAI clients.
+
+    Backoff waits use asyncio.sleep so concurrent calls keep running while one retries.
+    """
+    for attempt in range(1, MAX_OPENAI_ATTEMPTS + 1):
+        try:
+            return await client.chat.completions.create(**body)
+        except RETRYABLE_OPENAI_ERRORS as e:
+            if attempt >= MAX_OPENAI_ATTEMPTS:
+                raise
+            delay = _backoff_seconds(attempt)
+            logger.warning(
+                "openai_call_retry",
+                attempt=attempt,
+                delay_seconds=round(delay, 2),
+                error_type=type(e).__name__,
+                error=str(e),
+            )
+            await asyncio.sleep(delay)
@@ -7,7 +7,6 @@ system as tools/export_report_pdf.py.
 
 from __future__ import annotations
 
-import hashlib
 import json
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -29,6 +28,7 @@ from shared.config import get_config
 from shared.logging import get_logger
 from worker.report_generator import generate_audit_report
 from worker.repository import AuditRepository
+from worker.storage import compute_checksum
 
 logger = get_logger(__name__)
 
@@ -214,7 +214,7 @@ def generate_and_save_pdf_report(
 
         pdf_bytes = pdf_path.read_bytes()
         size = len(pdf_bytes)
-        checksum = hashlib.md5(pdf_bytes).hexdigest()
+        checksum = compute_checksum(pdf_bytes)
         storage_uri = f"{root_name}/report.pdf"
 
         retention_until = datetime.now(timezone.utc) + timedelta(days=config.html_retention_days)
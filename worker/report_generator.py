@@ -454,8 +454,11 @@ def generate_audit_report(session_id: UUID, repository: AuditRepository) -> dict
 
     stage_summaries = []
     try:
+        from worker.stage_summary_generator import STAGES, generate_stage_summaries
+
         existing_summaries = repository.get_stage_summaries_by_session(session_id)
-        if existing_summaries:
+        # Regenerate when a stage is missing (e.g. a batch placeholder was cleared).
+        if existing_summaries and {s["stage"] for s in existing_summaries} >= set(STAGES):
             stage_summaries = [
                 {
                     "stage": s["stage"],
@@ -475,8 +478,6 @@ def generate_audit_report(session_id: UUID, repository: AuditRepository) -> dict
                 summary_count=len(stage_summaries),
             )
         else:
-            from worker.stage_summary_generator import generate_stage_summaries
-
             stage_summaries = generate_stage_summaries(session_id, repository)
             logger.info(
                 "stage_summaries_generated_and_included",
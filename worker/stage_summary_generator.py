@@ -12,6 +12,8 @@ Follows developer spec for Revenue Recovery Audit stage summaries:
 
 from __future__ import annotations
 
+import io
+import json
 import os
 from collections import defaultdict
 from datetime import datetime, timezone
@@ -22,12 +24,32 @@ from openai import OpenAI
 
 from shared.config import get_config
 from shared.logging import get_logger
+from worker.job_queue import enqueue_stage_summary_batch_job
+from worker.openai_client import create_chat_completion
 from worker.repository import AuditRepository
 
 logger = get_logger(__name__)
 
 STAGES = ["Awareness", "Consideration", "Conversion"]
 
+SYSTEM_PROMPT = (
+    "Expert e-commerce consultant. Strategic insights, "
+    "optimization, revenue. Concise, buyer-focused."
+)
+
+# Batch API requests are billed at half the synchronous price.
+BATCH_PRICE_MULTIPLIER = 0.5
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_ENDPOINT = "/v1/chat/completions"
+# Delay between polls of a running batch (first poll is this long after submission).
+BATCH_POLL_INTERVAL_SECONDS = 600
+# Batch API states after which a batch will never produce output.
+BATCH_TERMINAL_FAILURE_STATES = frozenset({"failed", "expired", "cancelled"})
+# poll_and_save_batch result statuses; only BATCH_STATUS_PENDING needs another poll.
+BATCH_STATUS_PENDING = "pending"
+BATCH_STATUS_COMPLETED = "completed"
+BATCH_STATUS_FAILED = "failed"
+
 STAGE_FOCUS_ORDER = {
     "Awareness": ["clarity", "trust", "navigation", "performance"],
     "Consideration": ["product info", "proof", "objections", "trust"],
@@ -150,40 +172,68 @@ def _calculate_confidence_score(session_id: UUID, stage: str, repository: AuditR
     return max(1, min(10, score))
 
 
+def _get_openai_api_key() -> Optional[str]:
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        try:
+            config = get_config()
+            api_key = config.openai_api_key
+        except Exception:
+            pass
+    return api_key
+
+
+def _build_completion_body(prompt: str, model: str) -> dict:
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.7,
+        "max_completion_tokens": 400,
+    }
+
+
+def _calculate_cost_usd(input_tokens: int, output_tokens: int, multiplier: float = 1.0) -> float:
+    input_per_1m = float(os.getenv("OPENAI_PRICE_INPUT_PER_1M", "2.50"))
+    output_per_1m = float(os.getenv("OPENAI_PRICE_OUTPUT_PER_1M", "10.00"))
+    cost_usd = (input_tokens / 1_000_000 * input_per_1m) + (
+        output_tokens / 1_000_000 * output_per_1m
+    )
+    return cost_usd * multiplier
+
+
 def _build_summary_prompt(
     stage: str,
     main_theme: str,
-    eligible_questions: list[dict],
+    eligible_with_cat: list[tuple[dict, str]],
     passed_count: int,
     total_count: int,
     score: float,
     url: str,
     evidence_context: str,
 ) -> str:
-    failed_count = len(eligible_questions)
-    theme_questions = [
-        q
-        for q in eligible_questions
-        if _map_to_category(q.get("bar_chart_category", "")) == main_theme
-    ]
-    theme_questions.sort(key=lambda q: q.get("severity", 1), reverse=True)
-    if len(theme_questions) > 10:
-        theme_questions = theme_questions[:10]
-    failed_items = []
+    # eligible_with_cat is (question, category), already severity-sorted by the caller.
+    failed_count = len(eligible_with_cat)
+    theme_questions = [q for q, category in eligible_with_cat if category == main_theme][:10]
+    parts = []
     for q in theme_questions:
         question_text = q.get("question", "").strip()
+        if not question_text:
+            continue
         exact_fix = q.get("exact_fix", "").strip()
         bar_category = q.get("bar_chart_category", "")
-        if question_text:
-            item = f"- {question_text}"
-            if exact_fix:
-                item += f" | Fix: {exact_fix}"
-            if bar_category:
-                item += f" | Category: {bar_category}"
-            failed_items.append(item)
-    failed_section = "\n".join(failed_items) if failed_items else "None"
-    if len(eligible_questions) > len(theme_questions):
-        failed_section += f"\n... and {len(eligible_questions) - len(theme_questions)} more issues"
+        parts.append(
+            f"- {question_text}"
+            f"{f' | Fix: {exact_fix}' if exact_fix else ''}"
+            f"{f' | Category: {bar_category}' if bar_category else ''}"
+        )
+    if not parts:
+        parts.append("None")
+    if failed_count > len(theme_questions):
+        parts.append(f"... and {failed_count - len(theme_questions)} more issues")
+    failed_section = "\n".join(parts)
 
     prompt = f"""You are writing a stage summary for a Revenue Recovery Audit.
 
@@ -247,6 +297,7 @@ def generate_stage_summary(
     session_id: UUID,
     repository: AuditRepository,
     model: str = "gpt-5.2",
+    batch_mode: bool = False,
 ) -> dict:
     """
     Generate AI summary for a specific stage following developer spec.
@@ -258,6 +309,8 @@ def generate_stage_summary(
         session_id: Session UUID for evidence context
         repository: AuditRepository for page context
         model: OpenAI model to use
+        batch_mode: When True, skip the API call and return a pending placeholder
+            carrying the Batch API request line under "batch_request"
 
     Returns:
         Dict with summary text, metadata, confidence score, and cost info
@@ -304,13 +357,12 @@ def generate_stage_summary(
         )
 
     eligible_questions.sort(key=lambda q: q.get("severity", 1), reverse=True)
+    eligible_with_cat = [
+        (q, _map_to_category(q.get("bar_chart_category", ""))) for q in eligible_questions
+    ]
 
-    if len(eligible_questions) >= 10:
-        eligible_questions = [
-            q
-            for q in eligible_questions
-            if _map_to_category(q.get("bar_chart_category", "")) == main_theme
-        ]
+    if len(eligible_with_cat) >= 10:
+        eligible_with_cat = [(q, c) for q, c in eligible_with_cat if c == main_theme]
 
     evidence_context = _build_evidence_context(session_id, stage, repository)
     confidence_score = _calculate_confidence_score(session_id, stage, repository)
@@ -344,13 +396,7 @@ def generate_stage_summary(
     if confidence_score < 7 and not hard_flag_triggered:
         manual_review_reasons.append(f"Confidence score {confidence_score} is below threshold (7)")
 
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        try:
-            config = get_config()
-            api_key = config.openai_api_key
-        except Exception:
-            pass
+    api_key = _get_openai_api_key()
 
     if not api_key:
         logger.error("openai_api_key_missing_for_stage_summary", stage=stage)
@@ -367,37 +413,42 @@ def generate_stage_summary(
             "selected_main_theme": main_theme,
         }
 
-    client = OpenAI(api_key=api_key)
     prompt = _build_summary_prompt(
         stage,
         main_theme,
-        eligible_questions,
+        eligible_with_cat,
         passed_count,
         total_count,
         score,
         url,
         evidence_context,
     )
+    body = _build_completion_body(prompt, model)
 
-    input_per_1m = float(os.getenv("OPENAI_PRICE_INPUT_PER_1M", "2.50"))
-    output_per_1m = float(os.getenv("OPENAI_PRICE_OUTPUT_PER_1M", "10.00"))
+    if batch_mode:
+        return {
+            "stage": stage,
+            "summary": f"Summary pending for {stage} stage (batch submission).",
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "model_version": model,
+            "token_usage": {"input_tokens": 0, "output_tokens": 0},
+            "cost_usd": 0.0,
+            "confidence_score": confidence_score,
+            "manual_review_flag": manual_review_flag,
+            "manual_review_reasons": manual_review_reasons,
+            "selected_main_theme": main_theme,
+            "batch_request": {
+                "custom_id": f"{session_id}:{stage}",
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": body,
+            },
+        }
+
+    client = OpenAI(api_key=api_key, max_retries=0)
 
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "Expert e-commerce consultant. Strategic insights, "
-                        "optimization, revenue. Concise, buyer-focused."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.7,
-            max_completion_tokens=400,
-        )
+        response = create_chat_completion(client, **body)
 
         summary_text = response.choices[0].message.content.strip()
 
@@ -405,9 +456,7 @@ def generate_stage_summary(
         input_tokens = usage.prompt_tokens if usage else 0
         output_tokens = usage.completion_tokens if usage else 0
 
-        cost_usd = (input_tokens / 1_000_000 * input_per_1m) + (
-            output_tokens / 1_000_000 * output_per_1m
-        )
+        cost_usd = _calculate_cost_usd(input_tokens, output_tokens)
 
         logger.info(
             "stage_summary_generated",
@@ -474,10 +523,26 @@ def calculate_stage_score(questions: list[dict]) -> float:
     return (passed / total) * 100.0 if total > 0 else 0.0
 
 
+def _submit_batch(client: OpenAI, batch_requests: list[dict]) -> str:
+    """Upload batch request lines as a JSONL file and create the batch; returns the batch ID."""
+    payload = "\n".join(json.dumps(r) for r in batch_requests).encode("utf-8")
+    batch_file = client.files.create(
+        file=("stage_summaries.jsonl", io.BytesIO(payload)),
+        purpose="batch",
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW,
+    )
+    return batch.id
+
+
 def generate_stage_summaries(
     session_id: UUID,
     repository: AuditRepository,
     model: str = "gpt-5.2",
+    batch_mode: bool = False,
 ) -> list[dict]:
     """
     Generate AI summaries for all stages (Awareness/Consideration/Conversion).
@@ -486,9 +551,14 @@ def generate_stage_summaries(
         session_id: Session UUID
         repository: AuditRepository instance
         model: OpenAI model to use
+        batch_mode: When True, submit all stage requests as one OpenAI batch, save
+            pending placeholders tagged with the batch ID and enqueue
+            process_stage_summary_batch_job, which stores the results via
+            poll_and_save_batch
 
     Returns:
-        List of summary dicts, one per stage
+        List of summary dicts, one per stage; pending batch placeholders also carry
+        "batch_id"
     """
     session_data = repository.get_session_by_id(session_id)
     if not session_data:
@@ -569,16 +639,49 @@ def generate_stage_summaries(
 
     for stage in STAGES:
         stage_questions = questions_by_stage[stage]
-        summary = generate_stage_summary(stage, stage_questions, url, session_id, repository, model)
+        summary = generate_stage_summary(
+            stage, stage_questions, url, session_id, repository, model, batch_mode=batch_mode
+        )
+        summaries.append(summary)
 
+    batch_id = None
+    batch_requests = [s.pop("batch_request") for s in summaries if "batch_request" in s]
+    pending_stages = {r["custom_id"].split(":", 1)[1] for r in batch_requests}
+    if batch_requests:
+        try:
+            batch_id = _submit_batch(OpenAI(api_key=_get_openai_api_key()), batch_requests)
+            logger.info(
+                "stage_summary_batch_submitted",
+                session_id=str(session_id),
+                batch_id=batch_id,
+                request_count=len(batch_requests),
+            )
+        except Exception as e:
+            logger.error(
+                "stage_summary_batch_submit_failed",
+                session_id=str(session_id),
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            for summary in summaries:
+                if summary["stage"] in pending_stages:
+                    summary["summary"] = (
+                        f"Summary generation failed for {summary['stage']} stage: {str(e)}"
+                    )
+                    summary["manual_review_flag"] = True
+                    summary["manual_review_reasons"] = [f"Generation error: {str(e)}"]
+
+    for summary in summaries:
+        stage = summary["stage"]
         try:
             repository.save_stage_summary(
                 session_id=session_id,
-                stage=summary["stage"],
+                stage=stage,
                 summary=summary["summary"],
                 model_version=summary["model_version"],
                 token_usage=summary["token_usage"],
                 cost_usd=summary["cost_usd"],
+                batch_id=batch_id if stage in pending_stages else None,
             )
             logger.debug(
                 "stage_summary_saved_to_db",
@@ -594,7 +697,21 @@ def generate_stage_summaries(
                 error_type=type(e).__name__,
             )
 
-        summaries.append(summary)
+    if batch_id:
+        # Enqueued after the placeholders are saved so the poll job always finds them.
+        try:
+            enqueue_stage_summary_batch_job(batch_id, delay_seconds=BATCH_POLL_INTERVAL_SECONDS)
+        except Exception as e:
+            logger.error(
+                "stage_summary_batch_enqueue_failed",
+                session_id=str(session_id),
+                batch_id=batch_id,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            # Nothing will collect the batch: drop its placeholders so the report
+            # regenerates those stages synchronously.
+            _clear_unsaved_batch_placeholders(batch_id, repository, [])
 
     total_cost = sum(s.get("cost_usd", 0.0) for s in summaries)
     logger.info(
@@ -604,12 +721,165 @@ def generate_stage_summaries(
         total_cost_usd=total_cost,
     )
 
-    return [
-        {
+    results = []
+    for s in summaries:
+        result = {
             "stage": s["stage"],
             "summary": s["summary"],
             "generated_at": s["generated_at"],
             "model_version": s["model_version"],
         }
-        for s in summaries
-    ]
+        if batch_id and s["stage"] in pending_stages:
+            result["batch_id"] = batch_id
+        results.append(result)
+    return results
+
+
+def _clear_unsaved_batch_placeholders(
+    batch_id: str, repository: AuditRepository, saved_stages: list[str]
+) -> int:
+    """Delete pending placeholders the ended batch did not fill in; returns rows deleted."""
+    try:
+        cleared = repository.delete_batch_stage_summaries(batch_id, keep_stages=saved_stages)
+    except Exception as e:
+        logger.warning(
+            "stage_summary_batch_placeholder_clear_failed",
+            batch_id=batch_id,
+            error=str(e),
+            error_type=type(e).__name__,
+        )
+        return 0
+    if cleared:
+        logger.warning(
+            "stage_summary_batch_placeholders_cleared", batch_id=batch_id, cleared_count=cleared
+        )
+    return cleared
+
+
+def poll_and_save_batch(batch_id: str, repository: AuditRepository) -> dict:
+    """
+    Check a stage summary batch and save its results once it has completed.
+
+    Each output line is matched back to its session and stage via the
+    "{session_id}:{stage}" custom_id set at submission time. Once the batch has
+    ended, placeholders it did not fill in (failed/expired/cancelled batch, missing
+    output, failed items) are deleted, so the report regenerates those stages
+    synchronously instead of rendering "Summary pending" text.
+
+    Args:
+        batch_id: OpenAI batch ID returned by generate_stage_summaries(batch_mode=True)
+        repository: AuditRepository instance
+
+    Returns:
+        Dict with "status" (BATCH_STATUS_PENDING while the batch is running, otherwise
+        BATCH_STATUS_COMPLETED or BATCH_STATUS_FAILED; only pending needs another poll),
+        "saved" (saved summary dicts) and "cleared_count" (placeholders deleted)
+    """
+    client = OpenAI(api_key=_get_openai_api_key())
+    batch = client.batches.retrieve(batch_id)
+
+    if batch.status in BATCH_TERMINAL_FAILURE_STATES:
+        logger.error("stage_summary_batch_not_completed", batch_id=batch_id, status=batch.status)
+        cleared = _clear_unsaved_batch_placeholders(batch_id, repository, [])
+        return {"status": BATCH_STATUS_FAILED, "saved": [], "cleared_count": cleared}
+
+    if batch.status != "completed":
+        logger.info("stage_summary_batch_pending", batch_id=batch_id, status=batch.status)
+        return {"status": BATCH_STATUS_PENDING, "saved": [], "cleared_count": 0}
+
+    if not batch.output_file_id:
+        logger.error("stage_summary_batch_missing_output", batch_id=batch_id)
+        cleared = _clear_unsaved_batch_placeholders(batch_id, repository, [])
+        return {"status": BATCH_STATUS_FAILED, "saved": [], "cleared_count": cleared}
+
+    try:
+        content = client.files.content(batch.output_file_id)
+        lines = content.text.splitlines()
+    except Exception as e:
+        logger.error(
+            "stage_summary_batch_output_download_failed",
+            batch_id=batch_id,
+            error=str(e),
+            error_type=type(e).__name__,
+        )
+        cleared = _clear_unsaved_batch_placeholders(batch_id, repository, [])
+        return {"status": BATCH_STATUS_FAILED, "saved": [], "cleared_count": cleared}
+
+    saved = []
+    for line in lines:
+        if not line.strip():
+            continue
+        # One bad line must not stop the rest from saving; its placeholder is cleared below.
+        try:
+            record = json.loads(line)
+            custom_id = record.get("custom_id") or ""
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                logger.warning(
+                    "stage_summary_batch_item_failed",
+                    batch_id=batch_id,
+                    custom_id=custom_id,
+                    error=record.get("error"),
+                )
+                continue
+
+            session_id_str, _, stage = custom_id.partition(":")
+            session_uuid = UUID(session_id_str)
+            body = response.get("body") or {}
+            summary_text = (body["choices"][0]["message"]["content"] or "").strip()
+            if not summary_text:
+                raise ValueError("empty summary content")
+            usage = body.get("usage") or {}
+            input_tokens = usage.get("prompt_tokens", 0)
+            output_tokens = usage.get("completion_tokens", 0)
+            model_version = body.get("model", "")
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            logger.warning(
+                "stage_summary_batch_line_invalid",
+                batch_id=batch_id,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            continue
+
+        cost_usd = _calculate_cost_usd(input_tokens, output_tokens, BATCH_PRICE_MULTIPLIER)
+
+        try:
+            repository.save_stage_summary(
+                session_id=session_uuid,
+                stage=stage,
+                summary=summary_text,
+                model_version=model_version,
+                token_usage={"input_tokens": input_tokens, "output_tokens": output_tokens},
+                cost_usd=cost_usd,
+                batch_id=batch_id,
+            )
+        except Exception as e:
+            logger.warning(
+                "stage_summary_save_failed",
+                session_id=session_id_str,
+                stage=stage,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            continue
+
+        saved.append(
+            {
+                "stage": stage,
+                "summary": summary_text,
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "model_version": model_version,
+            }
+        )
+
+    cleared = _clear_unsaved_batch_placeholders(
+        batch_id, repository, [summary["stage"] for summary in saved]
+    )
+    logger.info(
+        "stage_summary_batch_saved",
+        batch_id=batch_id,
+        saved_count=len(saved),
+        cleared_count=cleared,
+    )
+    return {"status": BATCH_STATUS_COMPLETED, "saved": saved, "cleared_count": cleared}
@@ -7,23 +7,94 @@ and computing metadata (size, checksum) per the naming convention in TECH_SPEC.
 
 from __future__ import annotations
 
-import gzip
 import hashlib
 import json
+import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal, Optional
 from uuid import UUID
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from zlib_ng.gzip_ng import GzipNGFile as _GzipFile
+except ImportError:
+    from gzip import GzipFile as _GzipFile
+
 from shared.config import get_config
 from shared.logging import get_logger
 
+if TYPE_CHECKING:
+    from shared.config import AppConfig
+
 logger = get_logger(__name__)
 
 ArtifactType = Literal["screenshot", "visible_text", "features_json", "html_gz"]
 PageType = Literal["homepage", "pdp"]
 Viewport = Literal["desktop", "mobile"]
 
+# Artifact bytes are written and hashed in slices of this size (one pass over the data).
+WRITE_CHUNK_SIZE = 256 * 1024
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+_EXT_MAP = {
+    "screenshot": "png",
+    "visible_text": "txt",
+    "features_json": "json",
+    "html_gz": "html.gz",
+}
+
+# Config and artifacts root are read once per process (lazily, on first use).
+_CONFIG: Optional[AppConfig] = None
+_ARTIFACTS_ROOT: Optional[Path] = None
+_ARTIFACTS_ROOT_PREFIX: Optional[str] = None
+
+# Artifact directories already created by this process. Set membership/add are atomic
+# under the GIL and mkdir(exist_ok=True) is idempotent, so no lock is needed. Retention
+# cleanup only unlinks files, so cached directories are never removed underneath us.
+_CREATED_DIRS: set[str] = set()
+
+
+def _storage_config() -> AppConfig:
+    """Cached config for storage helpers."""
+    global _CONFIG
+    config = _CONFIG
+    if config is None:
+        config = _CONFIG = get_config()
+    return config
+
+
+def _artifacts_root() -> Path:
+    """Cached Path of config.artifacts_dir."""
+    global _ARTIFACTS_ROOT
+    root = _ARTIFACTS_ROOT
+    if root is None:
+        root = _ARTIFACTS_ROOT = Path(_storage_config().artifacts_dir)
+    return root
+
+
+def _artifacts_root_prefix() -> str:
+    """Cached str of the artifacts root with a trailing separator, for prefix checks."""
+    global _ARTIFACTS_ROOT_PREFIX
+    prefix = _ARTIFACTS_ROOT_PREFIX
+    if prefix is None:
+        prefix = _ARTIFACTS_ROOT_PREFIX = str(_artifacts_root()).rstrip(os.sep) + os.sep
+    return prefix
+
+
+def reset_storage_cache() -> None:
+    """Drop the cached config, artifacts root and created-directory set."""
+    global _CONFIG, _ARTIFACTS_ROOT, _ARTIFACTS_ROOT_PREFIX
+    _CONFIG = None
+    _ARTIFACTS_ROOT = None
+    _ARTIFACTS_ROOT_PREFIX = None
+    _CREATED_DIRS.clear()
+
 
 def build_artifact_path(
     session_id: UUID,
@@ -40,21 +111,11 @@ def build_artifact_path(
     Artifacts at the same path are overwritten deterministically (no skip-if-exists).
     Returns a Path object (does not create the file or directory).
     """
-    config = get_config()
-    artifacts_root = Path(config.artifacts_dir)
-
-    ext_map = {
-        "screenshot": "png",
-        "visible_text": "txt",
-        "features_json": "json",
-        "html_gz": "html.gz",
-    }
-    ext = ext_map[artifact_type]
+    ext = _EXT_MAP[artifact_type]
 
     root_name = _artifact_root_name(domain, session_id)
-    path = artifacts_root / root_name / page_type / viewport / f"{artifact_type}.{ext}"
-
-    return path
+    # One join on a prebuilt relative string instead of four chained Path joins.
+    return _artifacts_root() / f"{root_name}/{page_type}/{viewport}/{artifact_type}.{ext}"
 
 
 def build_session_log_artifact_path(domain: str, session_id: UUID) -> Path:
@@ -64,10 +125,8 @@ def build_session_log_artifact_path(domain: str, session_id: UUID) -> Path:
     Convention: {domain}__{session_id}/session_logs.jsonl
     Per TECH_SPEC v1.20: session log export uses this path under domain-first naming.
     """
-    config = get_config()
-    artifacts_root = Path(config.artifacts_dir)
     root_name = _artifact_root_name(domain, session_id)
-    return artifacts_root / root_name / "session_logs.jsonl"
+    return _artifacts_root() / root_name / "session_logs.jsonl"
 
 
 def build_excel_rubric_artifact_path(domain: str, session_id: UUID) -> Path:
@@ -76,10 +135,8 @@ def build_excel_rubric_artifact_path(domain: str, session_id: UUID) -> Path:
 
     Convention: {domain}__{session_id}/output.xlsx
     """
-    config = get_config()
-    artifacts_root = Path(config.artifacts_dir)
     root_name = _artifact_root_name(domain, session_id)
-    return artifacts_root / root_name / "output.xlsx"
+    return _artifacts_root() / root_name / "output.xlsx"
 
 
 def _artifact_root_name(domain: str, session_id: UUID) -> str:
@@ -88,8 +145,9 @@ def _artifact_root_name(domain: str, session_id: UUID) -> str:
     return f"{normalized_domain}__{session_id}"
 
 
+@lru_cache(maxsize=512)
 def _normalize_domain(domain: str) -> str:
-    """Normalize domain: lowercase and strip leading www."""
+    """Normalize domain: lowercase and strip leading www (memoized; a session reuses few)."""
     value = (domain or "").strip().lower()
     if value.startswith("www."):
         value = value[4:]
@@ -97,8 +155,78 @@ def _normalize_domain(domain: str) -> str:
 
 
 def ensure_artifact_dir(path: Path) -> None:
-    """Ensure the directory for an artifact path exists."""
-    path.parent.mkdir(parents=True, exist_ok=True)
+    """Ensure the directory for an artifact path exists (mkdir once per directory)."""
+    parent = path.parent
+    key = str(parent)
+    if key in _CREATED_DIRS:
+        return
+    parent.mkdir(parents=True, exist_ok=True)
+    _CREATED_DIRS.add(key)
+
+
+def _new_checksum_hasher():
+    """Hash object for the configured artifact checksum algorithm."""
+    if _storage_config().artifact_checksum_algo == "blake2b":
+        return hashlib.blake2b(digest_size=16)
+    return hashlib.md5()
+
+
+def _format_checksum(h) -> str:
+    """
+    Stored checksum for a finished hasher.
+
+    MD5 stays bare hex (the legacy column format); other algorithms are stored as
+    "<algo>:<hex>" so a row always records which algorithm produced it.
+    """
+    if h.name == "md5":
+        return h.hexdigest()
+    return f"{h.name}:{h.hexdigest()}"
+
+
+def compute_checksum(data: bytes) -> str:
+    """Checksum of in-memory bytes, in the same format the write_* helpers return."""
+    h = _new_checksum_hasher()
+    h.update(data)
+    return _format_checksum(h)
+
+
+def _write_and_hash(path: Path, data: bytes) -> tuple[int, str | None]:
+    """
+    Write bytes straight to the file descriptor (no BufferedWriter) while feeding
+    the same slices to the checksum hasher.
+
+    Each slice is written and hashed back to back, so the buffer is traversed once.
+    Returns (size_bytes, checksum).
+    """
+    h = _new_checksum_hasher()
+    view = memoryview(data)
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        for start in range(0, len(view), WRITE_CHUNK_SIZE):
+            chunk = view[start : start + WRITE_CHUNK_SIZE]
+            h.update(chunk)
+            while chunk:
+                chunk = chunk[os.write(fd, chunk) :]
+    finally:
+        os.close(fd)
+    return len(data), _format_checksum(h)
+
+
+class _HashingWriter:
+    """File-like wrapper that hashes and counts bytes as they are written through."""
+
+    def __init__(self, f, h):
+        self.f = f
+        self.h = h
+        self.size = 0
+
+    def write(self, b) -> int:
+        self.h.update(b)
+        self.size += len(b)
+        return self.f.write(b)
+
+    def flush(self) -> None:
+        self.f.flush()
 
 
 def write_screenshot(path: Path, image_bytes: bytes) -> tuple[int, str | None]:
@@ -108,24 +236,24 @@ def write_screenshot(path: Path, image_bytes: bytes) -> tuple[int, str | None]:
     Returns (size_bytes, checksum). May raise OSError/IOError on write failure.
     """
     ensure_artifact_dir(path)
-    path.write_bytes(image_bytes)
-    size = len(image_bytes)
-    checksum = hashlib.md5(image_bytes).hexdigest()
-    return size, checksum
+    return _write_and_hash(path, image_bytes)
+
+
+def _utf8_bytes(text: str | bytes) -> bytes:
+    """Return text as UTF-8 bytes; bytes-like input is passed through without copying."""
+    if isinstance(text, (bytes, bytearray, memoryview)):
+        return text
+    return text.encode("utf-8")
 
 
-def write_text(path: Path, text: str) -> tuple[int, str | None]:
+def write_text(path: Path, text: str | bytes) -> tuple[int, str | None]:
     """
-    Write text content to disk (UTF-8).
+    Write text content to disk (UTF-8). Already-encoded bytes are written as is.
 
     Returns (size_bytes, checksum). May raise OSError/IOError on write failure.
     """
     ensure_artifact_dir(path)
-    text_bytes = text.encode("utf-8")
-    path.write_bytes(text_bytes)
-    size = len(text_bytes)
-    checksum = hashlib.md5(text_bytes).hexdigest()
-    return size, checksum
+    return _write_and_hash(path, _utf8_bytes(text))
 
 
 def write_json(path: Path, data: dict) -> tuple[int, str | None]:
@@ -135,11 +263,11 @@ def write_json(path: Path, data: dict) -> tuple[int, str | None]:
     Returns (size_bytes, checksum). May raise OSError/IOError on write failure.
     """
     ensure_artifact_dir(path)
-    json_bytes = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
-    path.write_bytes(json_bytes)
-    size = len(json_bytes)
-    checksum = hashlib.md5(json_bytes).hexdigest()
-    return size, checksum
+    if orjson is not None:
+        json_bytes = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        json_bytes = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return _write_and_hash(path, json_bytes)
 
 
 def _json_default(obj: Any) -> Any:
@@ -164,25 +292,26 @@ def write_jsonl(path: Path, rows: list[dict]) -> tuple[int, str | None]:
         line = json.dumps(row, default=_json_default, ensure_ascii=False) + "\n"
         lines.append(line)
     content = "".join(lines).encode("utf-8")
-    path.write_bytes(content)
-    size = len(content)
-    checksum = hashlib.md5(content).hexdigest()
-    return size, checksum
+    return _write_and_hash(path, content)
 
 
-def write_html_gz(path: Path, html: str) -> tuple[int, str | None]:
+def write_html_gz(path: Path, html: str | bytes) -> tuple[int, str | None]:
     """
-    Write HTML content as gzip-compressed file.
+    Write HTML content (str, or already-encoded UTF-8 bytes) as gzip-compressed file.
+
+    Uses zlib-ng's gzip implementation when installed (same format, faster deflate),
+    at the configured html_gz_level.
 
     Returns (size_bytes, checksum). May raise OSError/IOError on write failure.
     """
     ensure_artifact_dir(path)
-    html_bytes = html.encode("utf-8")
-    compressed = gzip.compress(html_bytes)
-    path.write_bytes(compressed)
-    size = len(compressed)
-    checksum = hashlib.md5(compressed).hexdigest()
-    return size, checksum
+    h = _new_checksum_hasher()
+    level = _storage_config().html_gz_level
+    with open(path, "wb", buffering=WRITE_CHUNK_SIZE) as f:
+        writer = _HashingWriter(f, h)
+        with _GzipFile(fileobj=writer, mode="wb", compresslevel=level) as gz:
+            gz.write(_utf8_bytes(html))
+    return writer.size, _format_checksum(h)
 
 
 def write_binary(path: Path, content: bytes) -> tuple[int, str | None]:
@@ -192,10 +321,7 @@ def write_binary(path: Path, content: bytes) -> tuple[int, str | None]:
     Returns (size_bytes, checksum). May raise OSError/IOError on write failure.
     """
     ensure_artifact_dir(path)
-    path.write_bytes(content)
-    size = len(content)
-    checksum = hashlib.md5(content).hexdigest()
-    return size, checksum
+    return _write_and_hash(path, content)
 
 
 def get_storage_uri(path: Path) -> str:
@@ -204,11 +330,9 @@ def get_storage_uri(path: Path) -> str:
 
     For local storage, this is just the relative path from artifacts root.
     """
-    config = get_config()
-    artifacts_root = Path(config.artifacts_dir)
-    try:
-        relative = path.relative_to(artifacts_root)
-        return str(relative)
-    except ValueError:
-        # If path is not relative to artifacts root, return absolute path
-        return str(path)
+    value = str(path)
+    prefix = _artifacts_root_prefix()
+    if value.startswith(prefix):
+        return value[len(prefix) :]
+    # If path is not under artifacts root, return it unchanged
+    return value
@@ -2,21 +2,153 @@
 Storefront Report Card generator: Creates AI-generated brief descriptions and final thoughts.
 
 Generates concise stage descriptions and comprehensive final thoughts using OpenAI API.
+The independent completions run concurrently on AsyncOpenAI.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import os
+import threading
+from functools import lru_cache
+from typing import Optional
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 from shared.logging import get_logger
+from worker.openai_client import acreate_chat_completion
 
 logger = get_logger(__name__)
 
+STAGES = ["Awareness", "Consideration", "Conversion"]
+
+MAX_KEEPALIVE_CONNECTIONS = 10
+
+# Stage summaries are trimmed by tokens (tiktoken) when available, else by characters
+TOKENIZER_ENCODING = "o200k_base"
+STAGE_DESCRIPTION_SUMMARY_MAX_TOKENS = 150
+STAGE_DESCRIPTION_SUMMARY_MAX_CHARS = 500
+FINAL_THOUGHTS_SUMMARY_MAX_TOKENS = 90
+FINAL_THOUGHTS_SUMMARY_MAX_CHARS = 300
+
+# Set by load_tokenizer on success only, so a failed load is retried later.
+_ENCODING = None
+_ENCODING_LOAD_LOCK = threading.Lock()
+
+_STAGE_DESCRIPTION_SYSTEM_PROMPT = "Expert e-commerce consultant. Concise, actionable insights."
+_FINAL_THOUGHTS_SYSTEM_PROMPT = "Expert e-commerce consultant. Strategic insights, optimization."
+_FINAL_THOUGHTS_INSTRUCTIONS = """Generate exactly 5 sentences of final thoughts that:
+1. Provide an executive summary of overall performance
+2. Highlight the most critical opportunities for improvement
+3. Connect the stage scores to business impact
+4. Offer strategic recommendations prioritized by impact
+5. Be professional, actionable, and revenue-focused
+
+Output Requirements:
+- Write exactly 5 sentences, no more, no less
+- Write as a single paragraph (no line breaks between sentences)
+- Each sentence should be substantial and meaningful
+- Be professional, actionable, and revenue-focused
+- Write in a clear, professional tone suitable for business stakeholders
+
+Return only the 5-sentence paragraph text, no quotes or formatting."""
+
+
+@lru_cache(maxsize=1)
+def _cost_per_token() -> tuple[float, float]:
+    """(input, output) USD per token from OPENAI_PRICE_*_PER_1M, read once per process."""
+    input_per_1m = float(os.getenv("OPENAI_PRICE_INPUT_PER_1M", "2.50"))
+    output_per_1m = float(os.getenv("OPENAI_PRICE_OUTPUT_PER_1M", "10.00"))
+    return input_per_1m / 1_000_000, output_per_1m / 1_000_000
+
+
+def _cost_usd(input_tokens: int, output_tokens: int) -> float:
+    input_cost, output_cost = _cost_per_token()
+    return input_tokens * input_cost + output_tokens * output_cost
+
+
+def load_tokenizer() -> bool:
+    """
+    Load the tiktoken encoding used to trim prompt inputs; True once it is loaded.
+
+    Blocking: the first load may download the BPE file (no timeout in tiktoken), so the
+    worker calls this at startup rather than from the async report card path. A failed
+    load is not cached; the next call tries again.
+    """
+    global _ENCODING
+    if _ENCODING is not None:
+        return True
+    if tiktoken is None:
+        return False
+    with _ENCODING_LOAD_LOCK:
+        if _ENCODING is None:
+            try:
+                _ENCODING = tiktoken.get_encoding(TOKENIZER_ENCODING)
+            except Exception as e:
+                logger.warning(
+                    "tiktoken_encoding_unavailable", error=str(e), error_type=type(e).__name__
+                )
+                return False
+    return True
+
+
+def _retry_tokenizer_load_in_background() -> None:
+    """Start a tokenizer load on a daemon thread if it is missing (never on the event loop)."""
+    if _ENCODING is None and tiktoken is not None and not _ENCODING_LOAD_LOCK.locked():
+        threading.Thread(target=load_tokenizer, name="tiktoken-load", daemon=True).start()
+
+
+def _encoding():
+    """Loaded tokenizer, or None (trim by characters) until load_tokenizer has succeeded."""
+    return _ENCODING
+
+
+def _trim(text: str, max_tokens: int, max_chars: int) -> str:
+    """Trim text to max_tokens on token boundaries; fall back to max_chars characters."""
+    enc = _encoding()
+    if enc is None:
+        return text[:max_chars]
+    tokens = enc.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens])
+
+
+def _trim_description_summary(stage_summary: str) -> str:
+    return _trim(
+        stage_summary, STAGE_DESCRIPTION_SUMMARY_MAX_TOKENS, STAGE_DESCRIPTION_SUMMARY_MAX_CHARS
+    )
+
+
+def _new_client(api_key: str) -> AsyncOpenAI:
+    """Create an AsyncOpenAI client whose httpx pool keeps connections alive across calls."""
+    return AsyncOpenAI(
+        api_key=api_key,
+        max_retries=0,
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)
+        ),
+    )
+
 
-def generate_stage_description(
-    stage: str, score: float, stage_summary: str, model: str = "gpt-5.2"
+async def generate_stage_description(
+    stage: str,
+    score: float,
+    stage_summary: str,
+    model: str = "gpt-5.2",
+    client: Optional[AsyncOpenAI] = None,
 ) -> tuple[str, dict]:
     """
     Generate a brief description for a stage based on score and summary.
@@ -26,13 +158,12 @@ def generate_stage_description(
         score: Stage score (0-100)
         stage_summary: Full stage summary text
         model: OpenAI model to use
+        client: Shared AsyncOpenAI client; when omitted, one is created and closed here
 
     Returns:
         Tuple of (description: str, token_usage: dict with input_tokens, output_tokens, cost_usd)
     """
     api_key = os.getenv("OPENAI_API_KEY")
-    input_per_1m = float(os.getenv("OPENAI_PRICE_INPUT_PER_1M", "2.50"))
-    output_per_1m = float(os.getenv("OPENAI_PRICE_OUTPUT_PER_1M", "10.00"))
 
     if not api_key:
         logger.warning("openai_api_key_missing_for_stage_description", stage=stage)
@@ -47,12 +178,10 @@ def generate_stage_description(
         )
         return fallback, {"input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
 
-    client = OpenAI(api_key=api_key)
-
     prompt = f"""Generate a brief description (1-2 sentences, max 100 chars) for {stage} audit.
 
 Stage Score: {score}/100
-Stage Summary: {stage_summary[:500]}
+Stage Summary: {_trim_description_summary(stage_summary)}
 
 The description should:
 - Be professional and actionable
@@ -62,13 +191,19 @@ The description should:
 
 Return only the description text, no quotes or formatting."""
 
+    # A client created here is ours to close; a caller's shared client stays open.
+    owns_client = client is None
+    if owns_client:
+        client = _new_client(api_key)
+
     try:
-        response = client.chat.completions.create(
+        response = await acreate_chat_completion(
+            client,
             model=model,
             messages=[
                 {
                     "role": "system",
-                    "content": "Expert e-commerce consultant. Concise, actionable insights.",
+                    "content": _STAGE_DESCRIPTION_SYSTEM_PROMPT,
                 },
                 {
                     "role": "user",
@@ -84,9 +219,7 @@ Return only the description text, no quotes or formatting."""
         usage = response.usage
         input_tokens = usage.prompt_tokens if usage else 0
         output_tokens = usage.completion_tokens if usage else 0
-        cost_usd = (input_tokens / 1_000_000 * input_per_1m) + (
-            output_tokens / 1_000_000 * output_per_1m
-        )
+        cost_usd = _cost_usd(input_tokens, output_tokens)
 
         return description, {
             "input_tokens": input_tokens,
@@ -111,15 +244,121 @@ Return only the description text, no quotes or formatting."""
             )
         )
         return fallback, {"input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+    finally:
+        if owns_client:
+            await client.close()
+
+
+async def generate_stage_descriptions_batched(
+    stage_scores: dict,
+    stage_summaries: list[dict],
+    model: str = "gpt-5.2",
+    client: Optional[AsyncOpenAI] = None,
+) -> Optional[tuple[dict, dict]]:
+    """
+    Generate brief descriptions for all three stages in a single JSON-mode completion.
+
+    Args:
+        stage_scores: Dict with stage scores (awareness, consideration, conversion)
+        stage_summaries: List of stage summary dicts
+        model: OpenAI model to use
+        client: Shared AsyncOpenAI client; when omitted, one is created and closed here
+
+    Returns:
+        Tuple of (descriptions keyed by lowercase stage, token_usage dict), or None if the
+        API key is missing or the call/response could not be used; callers then fall back
+        to generate_stage_description per stage.
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+
+    if not api_key:
+        return None
+
+    summaries_by_stage = {s.get("stage"): s.get("summary", "") for s in stage_summaries}
+    stage_blocks = "\n\n".join(
+        f"{stage} Stage Score: {stage_scores.get(stage.lower(), 0.0)}/100\n"
+        f"{stage} Stage Summary: {_trim_description_summary(summaries_by_stage.get(stage) or '')}"
+        for stage in STAGES
+    )
+
+    prompt = f"""Generate a brief description (1-2 sentences, max 100 chars) for each audit stage.
+
+{stage_blocks}
+
+Each description should:
+- Be professional and actionable
+- Highlight the key strength or weakness
+- Be suitable for display in a report card format
+- Tone: positive (80+), balanced (50-79), concerned (<50)
+
+Return a JSON object with exactly these keys: "awareness", "consideration", "conversion".
+Each value is the description text only, no quotes or formatting."""
+
+    owns_client = client is None
+    if owns_client:
+        client = _new_client(api_key)
+
+    try:
+        response = await acreate_chat_completion(
+            client,
+            model=model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": _STAGE_DESCRIPTION_SYSTEM_PROMPT,
+                },
+                {
+                    "role": "user",
+                    "content": prompt,
+                },
+            ],
+            temperature=0.7,
+            max_completion_tokens=300,
+            response_format={"type": "json_object"},
+        )
+
+        content = response.choices[0].message.content
+        parsed = orjson.loads(content) if orjson is not None else json.loads(content)
+        if not isinstance(parsed, dict):
+            raise ValueError("Expected a JSON object of stage descriptions")
+        descriptions = {}
+        for stage in STAGES:
+            value = parsed.get(stage.lower())
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError(f"Missing description for {stage}")
+            descriptions[stage.lower()] = value.strip()
+
+        usage = response.usage
+        input_tokens = usage.prompt_tokens if usage else 0
+        output_tokens = usage.completion_tokens if usage else 0
+        cost_usd = _cost_usd(input_tokens, output_tokens)
+
+        return descriptions, {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost_usd": cost_usd,
+        }
+
+    except Exception as e:
+        logger.warning(
+            "stage_descriptions_batched_failed",
+            error=str(e),
+            error_type=type(e).__name__,
+        )
+        return None
+    finally:
+        if owns_client:
+            await client.close()
 
 
-def generate_final_thoughts(
+async def generate_final_thoughts(
     url: str,
     stage_scores: dict,
     stage_summaries: list[dict],
     actionable_findings: list[dict],
     overall_score: float,
     model: str = "gpt-5.2",
+    client: Optional[AsyncOpenAI] = None,
 ) -> tuple[str, dict]:
     """
     Generate comprehensive final thoughts for the storefront report card.
@@ -131,13 +370,12 @@ def generate_final_thoughts(
         actionable_findings: List of actionable finding dicts
         overall_score: Overall weighted score (0-100)
         model: OpenAI model to use
+        client: Shared AsyncOpenAI client; when omitted, one is created and closed here
 
     Returns:
         Tuple of (final_thoughts: str, token_usage: dict with input_tokens, output_tokens, cost_usd)
     """
     api_key = os.getenv("OPENAI_API_KEY")
-    input_per_1m = float(os.getenv("OPENAI_PRICE_INPUT_PER_1M", "2.50"))
-    output_per_1m = float(os.getenv("OPENAI_PRICE_OUTPUT_PER_1M", "10.00"))
 
     if not api_key:
         logger.warning("openai_api_key_missing_for_final_thoughts")
@@ -147,16 +385,23 @@ def generate_final_thoughts(
             "cost_usd": 0.0,
         }
 
-    client = OpenAI(api_key=api_key)
-
-    def _row(s: dict) -> str:
+    summary_chunks = []
+    for s in stage_summaries:
         pct = stage_scores.get(s["stage"].lower(), 0)
-        return f"{s['stage']} Stage ({pct:.1f}%): {s['summary'][:300]}"
-
-    stage_summaries_text = "\n\n".join(_row(s) for s in stage_summaries)
-
-    high_priority_findings = [f for f in actionable_findings if f.get("impact") == "High"][:5]
-    findings_text = "\n".join([f"- {f['actionable_finding']}" for f in high_priority_findings])
+        summary = _trim(
+            s["summary"], FINAL_THOUGHTS_SUMMARY_MAX_TOKENS, FINAL_THOUGHTS_SUMMARY_MAX_CHARS
+        )
+        summary_chunks.append(f"{s['stage']} Stage ({pct:.1f}%): {summary}")
+    stage_summaries_text = "\n\n".join(summary_chunks)
+
+    # Top 5 high-impact findings, stopping as soon as 5 are found
+    findings_chunks = []
+    for f in actionable_findings:
+        if f.get("impact") == "High":
+            findings_chunks.append(f"- {f['actionable_finding']}")
+            if len(findings_chunks) == 5:
+                break
+    findings_text = "\n".join(findings_chunks)
 
     prompt = f"""Generate final thoughts for a storefront report card audit.
 
@@ -174,29 +419,20 @@ Stage Summaries:
 Top Priority Findings:
 {findings_text}
 
-Generate exactly 5 sentences of final thoughts that:
-1. Provide an executive summary of overall performance
-2. Highlight the most critical opportunities for improvement
-3. Connect the stage scores to business impact
-4. Offer strategic recommendations prioritized by impact
-5. Be professional, actionable, and revenue-focused
-
-Output Requirements:
-- Write exactly 5 sentences, no more, no less
-- Write as a single paragraph (no line breaks between sentences)
-- Each sentence should be substantial and meaningful
-- Be professional, actionable, and revenue-focused
-- Write in a clear, professional tone suitable for business stakeholders
+{_FINAL_THOUGHTS_INSTRUCTIONS}"""
 
-Return only the 5-sentence paragraph text, no quotes or formatting."""
+    owns_client = client is None
+    if owns_client:
+        client = _new_client(api_key)
 
     try:
-        response = client.chat.completions.create(
+        response = await acreate_chat_completion(
+            client,
             model=model,
             messages=[
                 {
                     "role": "system",
-                    "content": "Expert e-commerce consultant. Strategic insights, optimization.",
+                    "content": _FINAL_THOUGHTS_SYSTEM_PROMPT,
                 },
                 {
                     "role": "user",
@@ -213,9 +449,7 @@ Return only the 5-sentence paragraph text, no quotes or formatting."""
         input_tokens = usage.prompt_tokens if usage else 0
         output_tokens = usage.completion_tokens if usage else 0
 
-        cost_usd = (input_tokens / 1_000_000 * input_per_1m) + (
-            output_tokens / 1_000_000 * output_per_1m
-        )
+        cost_usd = _cost_usd(input_tokens, output_tokens)
 
         logger.info(
             "final_thoughts_generated",
@@ -242,9 +476,12 @@ Return only the 5-sentence paragraph text, no quotes or formatting."""
             "output_tokens": 0,
             "cost_usd": 0.0,
         }
+    finally:
+        if owns_client:
+            await client.close()
 
 
-def generate_storefront_report_card(
+async def generate_storefront_report_card_async(
     url: str,
     stage_scores: dict,
     stage_summaries: list[dict],
@@ -253,7 +490,11 @@ def generate_storefront_report_card(
     model: str = "gpt-5.2",
 ) -> dict:
     """
-    Generate complete storefront report card data.
+    Generate complete storefront report card data with overlapping OpenAI calls.
+
+    The batched stage descriptions and final thoughts are requested concurrently; if the
+    batched call cannot be used, the per-stage descriptions are also gathered concurrently.
+    All calls share one client (and its keep-alive connection pool), closed before returning.
 
     Returns dict with:
     - stage_descriptions: {awareness: str, consideration: str, conversion: str}
@@ -261,37 +502,77 @@ def generate_storefront_report_card(
     - token_usage: dict with aggregated input_tokens, output_tokens, cost_usd
     - model_version: str
     """
-    stage_descriptions = {}
-    total_input_tokens = 0
-    total_output_tokens = 0
-    total_cost_usd = 0.0
-
-    for stage in ["Awareness", "Consideration", "Conversion"]:
-        stage_key = stage.lower()
-        score = stage_scores.get(stage_key, 0.0)
-        stage_summary_obj = next((s for s in stage_summaries if s.get("stage") == stage), None)
-        summary_text = stage_summary_obj.get("summary", "") if stage_summary_obj else ""
-
-        description, token_data = generate_stage_description(stage, score, summary_text, model)
-        stage_descriptions[stage_key] = description
-        total_input_tokens += token_data.get("input_tokens", 0)
-        total_output_tokens += token_data.get("output_tokens", 0)
-        total_cost_usd += token_data.get("cost_usd", 0.0)
-
-    final_thoughts, final_token_data = generate_final_thoughts(
-        url, stage_scores, stage_summaries, actionable_findings, overall_score, model
-    )
-    total_input_tokens += final_token_data.get("input_tokens", 0)
-    total_output_tokens += final_token_data.get("output_tokens", 0)
-    total_cost_usd += final_token_data.get("cost_usd", 0.0)
+    # Normally preloaded at worker startup; if that failed, this card trims by characters.
+    _retry_tokenizer_load_in_background()
+    api_key = os.getenv("OPENAI_API_KEY")
+    client = _new_client(api_key) if api_key else None
+    try:
+        batched, (final_thoughts, final_token_data) = await asyncio.gather(
+            generate_stage_descriptions_batched(stage_scores, stage_summaries, model, client),
+            generate_final_thoughts(
+                url,
+                stage_scores,
+                stage_summaries,
+                actionable_findings,
+                overall_score,
+                model,
+                client,
+            ),
+        )
+
+        token_datas = [final_token_data]
+        if batched is not None:
+            stage_descriptions, token_data = batched
+            token_datas.append(token_data)
+        else:
+            summaries_by_stage = {s.get("stage"): s.get("summary", "") for s in stage_summaries}
+            results = await asyncio.gather(
+                *[
+                    generate_stage_description(
+                        stage,
+                        stage_scores.get(stage.lower(), 0.0),
+                        summaries_by_stage.get(stage) or "",
+                        model,
+                        client,
+                    )
+                    for stage in STAGES
+                ]
+            )
+            stage_descriptions = {}
+            for stage, (description, token_data) in zip(STAGES, results):
+                stage_descriptions[stage.lower()] = description
+                token_datas.append(token_data)
+    finally:
+        if client is not None:
+            await client.close()
 
     return {
         "stage_descriptions": stage_descriptions,
         "final_thoughts": final_thoughts,
         "token_usage": {
-            "input_tokens": total_input_tokens,
-            "output_tokens": total_output_tokens,
+            "input_tokens": sum(t.get("input_tokens", 0) for t in token_datas),
+            "output_tokens": sum(t.get("output_tokens", 0) for t in token_datas),
         },
-        "cost_usd": total_cost_usd,
+        "cost_usd": sum(t.get("cost_usd", 0.0) for t in token_datas),
         "model_version": model,
     }
+
+
+def generate_storefront_report_card(
+    url: str,
+    stage_scores: dict,
+    stage_summaries: list[dict],
+    actionable_findings: list[dict],
+    overall_score: float,
+    model: str = "gpt-5.2",
+) -> dict:
+    """
+    Generate complete storefront report card data.
+
+    Sync wrapper around generate_storefront_report_card_async for non-async callers.
+    """
+    return asyncio.run(
+        generate_storefront_report_card_async(
+            url, stage_scores, stage_summaries, actionable_findings, overall_score, model
+        )
+    )
@@ -0,0 +1,157 @@
+"""
+Pytest configuration and fixtures for worker tests.
+
+Unit-test fixtures build fresh state per test (no module-level mutation). The exception
+is browser tests: they share one session-scoped Chromium browser and a single page,
+because with pytest-asyncio 0.23 a function-scoped async fixture would move the test
+onto a fresh event loop, away from the one the browser is bound to. Browser tests
+must therefore load their own document with page.set_content and leave no other
+state behind (routes, cookies, storage, handlers).
+
+Sessions are per process, so the suite is still safe to run in parallel with
+pytest-xdist (`python -m pytest -n auto worker/tests/`); each worker gets its own
+browser and page.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Callable
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import async_playwright
+
+from worker.storage import reset_storage_cache
+
+try:
+    import fakeredis
+except ImportError:  # pragma: no cover - optional test dependency
+    fakeredis = None
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional test dependency
+    uvloop = None
+
+
+def _lock_config(
+    ttl_seconds: int = 300,
+    max_retries: int = 3,
+    backoff_base_ms: int = 1000,
+    backoff_cap_ms: int = 10000,
+    min_delay_ms: int = 2000,
+    throttle_ttl_seconds: int = 60,
+    disable_throttle: bool = False,
+    disable_locks: bool = False,
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        domain_lock_ttl_seconds=ttl_seconds,
+        domain_lock_max_retries=max_retries,
+        domain_lock_backoff_base_ms=backoff_base_ms,
+        domain_lock_backoff_cap_ms=backoff_cap_ms,
+        domain_min_delay_ms=min_delay_ms,
+        domain_throttle_ttl_seconds=throttle_ttl_seconds,
+        disable_throttle=disable_throttle,
+        disable_locks=disable_locks,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_storage_cache():
+    """Storage caches config per process; tests patch get_config/env, so start each test fresh."""
+    reset_storage_cache()
+    yield
+    reset_storage_cache()
+
+
+@pytest.fixture(scope="session")
+def lock_config() -> Callable[..., SimpleNamespace]:
+    """Factory for the config fields read by worker.locking; keyword overrides per test."""
+    return _lock_config
+
+
+@pytest.fixture
+def redis():
+    """In-process Redis with Lua support; a new, empty server per test."""
+    if fakeredis is None:
+        pytest.skip("fakeredis is not installed")
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture
+def async_redis():
+    """redis.asyncio counterpart of the redis fixture (fresh in-process server per test)."""
+    if fakeredis is None:
+        pytest.skip("fakeredis is not installed")
+    return fakeredis.FakeAsyncRedis()
+
+
+@pytest.fixture(scope="session")
+def make_page() -> Callable[..., AsyncMock]:
+    """Factory for a Playwright Page mock; goto/reload/title/inner_text are configurable."""
+
+    def _make(
+        goto_return: Any = None,
+        goto_side_effect: Any = None,
+        reload_side_effect: Any = None,
+        title: str = "",
+        inner_text: str = "",
+    ) -> AsyncMock:
+        page = AsyncMock()
+        page.goto = AsyncMock(return_value=goto_return, side_effect=goto_side_effect)
+        page.reload = AsyncMock(return_value=None, side_effect=reload_side_effect)
+        page.title = AsyncMock(return_value=title)
+        page.inner_text = AsyncMock(return_value=inner_text)
+        return page
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """uvloop for async tests when installed (cheaper per-await overhead); stdlib otherwise."""
+    if uvloop is None:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+# Browser tests only set_content and query the DOM: skip image decoding and GPU setup.
+_CHROMIUM_TEST_ARGS = ["--blink-settings=imagesEnabled=false", "--disable-gpu"]
+
+
+@pytest_asyncio.fixture(scope="session")
+async def browser():
+    """
+    One headless Chromium per test process; tests using it need asyncio(scope="session").
+
+    Session scope is per xdist worker, so `-n auto` runs browser tests on one Chromium each.
+    Skips (rather than errors) when the Chromium binary has not been installed.
+    """
+    async with async_playwright() as pw:
+        try:
+            browser = await pw.chromium.launch(headless=True, args=_CHROMIUM_TEST_ARGS)
+        except PlaywrightError as e:
+            if "Executable doesn't exist" not in str(e):
+                raise
+            pytest.skip("Chromium not installed; run `playwright install chromium`")
+        yield browser
+        await browser.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def page(browser):
+    """
+    One context and page reused by every browser test; each test loads its own document.
+
+    Session-scoped on purpose: with pytest-asyncio 0.23 a function-scoped async fixture runs
+    the test on a fresh loop, away from the loop the session browser is bound to. Tests only
+    call set_content, which replaces the whole document, so no per-test context is needed.
+    """
+    context = await browser.new_context()
+    page = await context.new_page()
+    yield page
+    await context.close()
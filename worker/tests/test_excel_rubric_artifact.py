@@ -20,7 +20,7 @@ from worker.excel_rubric import save_excel_rubric_workbook
 
 
 def _config(artifacts_dir: str) -> SimpleNamespace:
-    return SimpleNamespace(artifacts_dir=artifacts_dir)
+    return SimpleNamespace(artifacts_dir=artifacts_dir, artifact_checksum_algo="md5")
 
 
 class _RepoStub:
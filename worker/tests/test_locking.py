@@ -1,46 +1,45 @@
 """
 Unit tests for Redis domain lock and throttle helpers (TECH_SPEC_V1.1.md).
 
-Uses mocked Redis; no real Redis required. Covers acquire/release, throttle delay, retry backoff.
+Uses fakeredis (in-process Redis with Lua support); no real Redis required.
+Covers acquire/release, throttle delay, retry backoff, and the acquire+throttle Lua script.
 """
 
 from __future__ import annotations
 
-import time
-from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from worker.constants import LOCK_KEY_PREFIX, THROTTLE_KEY_PREFIX
+from worker.constants import LOCK_KEY_PREFIX, LOCK_KEY_SHARDS, THROTTLE_KEY_PREFIX
 from worker.locking import (
     DomainLockTimeoutError,
+    _lock_key,
+    _lock_value,
+    _throttle_key,
     acquire_domain_lock,
+    acquire_domain_lock_and_throttle,
+    acquire_domain_lock_async,
     normalize_domain,
     release_domain_lock,
     throttle_wait,
+    throttle_wait_async,
     update_throttle_after_session,
 )
 
+# crc32("example.com") % 64 == 57
+LOCK_KEY = f"{LOCK_KEY_PREFIX}{{p57}}:example.com"
+THROTTLE_KEY = f"{THROTTLE_KEY_PREFIX}{{p57}}:example.com"
+
+# Frozen wall clock for throttle tests (ms)
+NOW_MS = 1_738_253_400_000
 
-def _lock_config(
-    ttl_seconds: int = 300,
-    max_retries: int = 3,
-    backoff_base_ms: int = 1000,
-    min_delay_ms: int = 2000,
-    throttle_ttl_seconds: int = 60,
-    disable_throttle: bool = False,
-    disable_locks: bool = False,
-) -> SimpleNamespace:
-    return SimpleNamespace(
-        domain_lock_ttl_seconds=ttl_seconds,
-        domain_lock_max_retries=max_retries,
-        domain_lock_backoff_base_ms=backoff_base_ms,
-        domain_min_delay_ms=min_delay_ms,
-        domain_throttle_ttl_seconds=throttle_ttl_seconds,
-        disable_throttle=disable_throttle,
-        disable_locks=disable_locks,
-    )
+
+@pytest.fixture
+def frozen_now():
+    """Freeze worker.locking's wall clock at NOW_MS."""
+    with patch("worker.locking.time.time", return_value=NOW_MS / 1000):
+        yield NOW_MS
 
 
 # --- normalize_domain ---
@@ -60,184 +59,420 @@ def test_normalize_domain_netloc_only():
     assert normalize_domain("www.example.com") == "example.com"
 
 
+def test_normalize_domain_ignores_scheme_embedded_after_the_host():
+    """A "://" inside a path or query is not a scheme: the host is never taken from it."""
+    assert normalize_domain("example.com/?r=https://evil.com") == "example.com/?r=https://evil.com"
+    assert normalize_domain("https://example.com/?r=https://evil.com") == "example.com"
+
+
+def test_normalize_domain_url_stops_at_query_fragment_and_keeps_port():
+    assert normalize_domain("https://www.example.com?q=1") == "example.com"
+    assert normalize_domain("https://example.com#top") == "example.com"
+    assert normalize_domain("http://example.com:8080/path") == "example.com:8080"
+
+
+def test_normalize_domain_cached():
+    first = normalize_domain("https://www.Cached-Example.com/path")
+    assert normalize_domain("https://www.Cached-Example.com/path") is first
+
+
 # --- acquire_domain_lock ---
 
 
-def test_acquire_domain_lock_success_when_key_not_set():
-    redis = MagicMock()
-    redis.set.return_value = True
-    config = _lock_config()
+def test_acquire_domain_lock_success_when_key_not_set(redis, lock_config):
+    acquire_domain_lock(redis, "example.com", "worker-1", "sess-123", lock_config())
 
-    acquire_domain_lock(redis, "example.com", "worker-1", "sess-123", config)
+    assert redis.get(LOCK_KEY).decode().startswith("worker-1:sess-123:")
+    assert 0 < redis.ttl(LOCK_KEY) <= 300
 
-    redis.set.assert_called_once()
-    call_kw = redis.set.call_args[1]
-    assert call_kw.get("nx") is True
-    assert call_kw.get("ex") == 300
-    assert "worker-1:sess-123:" in redis.set.call_args[0][1]
 
+def test_lock_value_is_bytes_token_with_unix_seconds():
+    with patch("worker.locking.time.time_ns", return_value=1_738_253_400_123_456_789):
+        assert _lock_value("worker-1", "sess-123") == b"worker-1:sess-123:1738253400"
 
-def test_acquire_domain_lock_uses_correct_key_prefix():
-    redis = MagicMock()
-    redis.set.return_value = True
-    config = _lock_config()
 
-    acquire_domain_lock(redis, "example.com", "w", "s", config)
+def test_acquire_domain_lock_uses_correct_key_prefix(redis, lock_config):
+    acquire_domain_lock(redis, "example.com", "w", "s", lock_config())
 
-    key = redis.set.call_args[0][0]
-    assert key == f"{LOCK_KEY_PREFIX}example.com"
+    assert redis.keys() == [LOCK_KEY.encode()]
 
 
-def test_acquire_domain_lock_timeout_after_max_retries():
-    redis = MagicMock()
-    redis.set.return_value = False
-    config = _lock_config(max_retries=3)
+def test_acquire_domain_lock_timeout_after_max_retries(redis, lock_config):
+    redis.set(LOCK_KEY, "other:sess:1")
+    config = lock_config(max_retries=3)
 
     with patch("worker.locking.time.sleep") as mock_sleep:
         with pytest.raises(DomainLockTimeoutError) as exc_info:
             acquire_domain_lock(redis, "example.com", "w", "s", config)
 
     assert "Domain lock timeout" in str(exc_info.value)
-    assert redis.set.call_count == 3
-    mock_sleep.assert_called()
+    assert redis.get(LOCK_KEY) == b"other:sess:1"
     calls = [c[0][0] for c in mock_sleep.call_args_list]
     assert len(calls) == 2
-    assert 1.0 <= calls[0] <= 1.5
-    assert 2.0 <= calls[1] <= 2.5
+    assert 1.0 <= calls[0] <= 3.0
+    assert 1.0 <= calls[1] <= min(10.0, calls[0] * 3)
+
+
+def test_acquire_domain_lock_backoff_is_decorrelated_jitter_capped(redis, lock_config):
+    """Each wait is drawn from [base, min(cap, previous * 3)]."""
+    redis.set(LOCK_KEY, "other:sess:1")
+    config = lock_config(max_retries=4, backoff_base_ms=1000, backoff_cap_ms=5000)
+
+    with (
+        patch("worker.locking.time.sleep"),
+        patch("worker.locking.random.uniform", side_effect=lambda lo, hi: hi) as uniform,
+    ):
+        with pytest.raises(DomainLockTimeoutError):
+            acquire_domain_lock(redis, "example.com", "w", "s", config)
 
+    assert [c.args for c in uniform.call_args_list] == [
+        (1000, 3000),
+        (1000, 5000),
+        (1000, 5000),
+    ]
 
-def test_acquire_domain_lock_succeeds_on_second_attempt():
+
+def test_acquire_domain_lock_logs_no_retry_after_last_attempt(redis, lock_config):
+    """Only attempts that are followed by another one log lock.acquire.retry."""
+    redis.set(LOCK_KEY, "other:sess:1")
+
+    with (
+        patch("worker.locking.time.sleep"),
+        patch("worker.locking.logger") as mock_logger,
+    ):
+        with pytest.raises(DomainLockTimeoutError):
+            acquire_domain_lock(redis, "example.com", "w", "s", lock_config(max_retries=3))
+
+    retries = [
+        c.kwargs["attempt"]
+        for c in mock_logger.info.call_args_list
+        if c.args == ("lock.acquire.retry",)
+    ]
+    assert retries == [1, 2]
+    mock_logger.error.assert_called_once()
+    assert mock_logger.error.call_args.args == ("lock.acquire.timeout",)
+
+
+def test_acquire_domain_lock_succeeds_on_second_attempt(redis, lock_config):
+    """The lock is freed between attempts (holder released during our backoff)."""
+    redis.set(LOCK_KEY, "other:sess:1")
+    config = lock_config(max_retries=3)
+
+    with patch("worker.locking.time.sleep", side_effect=lambda _s: redis.delete(LOCK_KEY)):
+        acquire_domain_lock(redis, "example.com", "w", "s", config)
+
+    assert redis.get(LOCK_KEY).decode().startswith("w:s:")
+
+
+def test_acquire_domain_lock_noop_when_disabled(lock_config):
     redis = MagicMock()
-    redis.set.side_effect = [False, True]
-    config = _lock_config(max_retries=3)
+
+    acquire_domain_lock(redis, "example.com", "w", "s", lock_config(disable_locks=True))
+
+    redis.set.assert_not_called()
+    redis.register_script.assert_not_called()
+
+
+# --- acquire_domain_lock_and_throttle ---
+
+
+def test_acquire_domain_lock_and_throttle_takes_lock_and_waits_remaining_delay(
+    redis, frozen_now, lock_config
+):
+    redis.set(THROTTLE_KEY, str(frozen_now - 500))
+    config = lock_config(min_delay_ms=2000)
+
+    with patch("worker.locking.time.sleep") as mock_sleep:
+        token = acquire_domain_lock_and_throttle(redis, "example.com", "w", "s", config, "standard")
+
+    mock_sleep.assert_called_once_with(1.5)
+    assert redis.get(LOCK_KEY) == token
+    assert token.startswith(b"w:s:")
+    assert 0 < redis.ttl(LOCK_KEY) <= 300
+    # Throttle slot advanced to when this crawl may start
+    assert int(redis.get(THROTTLE_KEY)) == frozen_now + 1500
+    assert 0 < redis.ttl(THROTTLE_KEY) <= 60
+
+
+def test_acquire_domain_lock_and_throttle_clamps_future_timestamp(redis, frozen_now, lock_config):
+    redis.set(THROTTLE_KEY, str(frozen_now + 3_600_000))
+
+    with patch("worker.locking.time.sleep") as mock_sleep:
+        acquire_domain_lock_and_throttle(
+            redis, "example.com", "w", "s", lock_config(min_delay_ms=2000), "standard"
+        )
+
+    mock_sleep.assert_called_once_with(4.0)
+
+
+def test_acquire_domain_lock_and_throttle_no_wait_when_key_missing(redis, frozen_now, lock_config):
+    with patch("worker.locking.time.sleep") as mock_sleep:
+        acquire_domain_lock_and_throttle(redis, "example.com", "w", "s", lock_config(), "standard")
+
+    mock_sleep.assert_not_called()
+    assert int(redis.get(THROTTLE_KEY)) == frozen_now
+
+
+def test_acquire_domain_lock_and_throttle_retries_until_acquired(redis, frozen_now, lock_config):
+    redis.set(LOCK_KEY, "other:sess:1")
+
+    with patch(
+        "worker.locking.time.sleep", side_effect=lambda _s: redis.delete(LOCK_KEY)
+    ) as mock_sleep:
+        acquire_domain_lock_and_throttle(
+            redis, "example.com", "w", "s", lock_config(max_retries=3), "standard"
+        )
+
+    assert mock_sleep.call_count == 1
+    assert redis.get(LOCK_KEY).decode().startswith("w:s:")
+
+
+def test_acquire_domain_lock_and_throttle_debug_mode_skips_wait(redis, frozen_now, lock_config):
+    redis.set(THROTTLE_KEY, str(frozen_now - 500))
+
+    with patch("worker.locking.time.sleep") as mock_sleep:
+        acquire_domain_lock_and_throttle(redis, "example.com", "w", "s", lock_config(), "debug")
+
+    mock_sleep.assert_not_called()
+    assert int(redis.get(THROTTLE_KEY)) == frozen_now
+
+
+def test_acquire_domain_lock_and_throttle_timeout_leaves_throttle_untouched(
+    redis, frozen_now, lock_config
+):
+    redis.set(LOCK_KEY, "other:sess:1")
+    redis.set(THROTTLE_KEY, str(frozen_now - 500))
 
     with patch("worker.locking.time.sleep"):
-        acquire_domain_lock(redis, "example.com", "w", "s", config)
+        with pytest.raises(DomainLockTimeoutError):
+            acquire_domain_lock_and_throttle(
+                redis, "example.com", "w", "s", lock_config(max_retries=3), "standard"
+            )
+
+    assert redis.get(LOCK_KEY) == b"other:sess:1"
+    assert int(redis.get(THROTTLE_KEY)) == frozen_now - 500
+
+
+def test_acquire_domain_lock_and_throttle_noop_when_disabled(lock_config):
+    redis = MagicMock()
 
-    assert redis.set.call_count == 2
+    token = acquire_domain_lock_and_throttle(
+        redis, "example.com", "w", "s", lock_config(disable_locks=True), "standard"
+    )
+
+    assert token is None
+    redis.register_script.assert_not_called()
 
 
 # --- release_domain_lock ---
 
 
-def test_release_domain_lock_deletes_when_value_matches():
-    redis = MagicMock()
-    redis.get.return_value = b"worker-1:sess-123:1738253400"
+def test_release_domain_lock_deletes_when_value_matches(redis, lock_config):
+    token = acquire_domain_lock(redis, "example.com", "worker-1", "sess-123", lock_config())
+    assert redis.get(LOCK_KEY) == token
 
-    release_domain_lock(redis, "example.com", "worker-1", "sess-123")
+    release_domain_lock(redis, "example.com", "sess-123", token)
 
-    redis.delete.assert_called_once_with(f"{LOCK_KEY_PREFIX}example.com")
+    assert redis.exists(LOCK_KEY) == 0
 
 
-def test_release_domain_lock_no_delete_when_value_mismatch():
-    redis = MagicMock()
-    redis.get.return_value = b"other-worker:sess-456:1738253400"
+def test_release_domain_lock_no_delete_when_token_differs_in_timestamp(redis):
+    """Same worker and session but a different token (lock expired and re-acquired)."""
+    redis.set(LOCK_KEY, "worker-1:sess-123:1738253460")
 
-    release_domain_lock(redis, "example.com", "worker-1", "sess-123")
+    release_domain_lock(redis, "example.com", "sess-123", b"worker-1:sess-123:1738253400")
 
-    redis.delete.assert_not_called()
+    assert redis.get(LOCK_KEY) == b"worker-1:sess-123:1738253460"
+
+
+def test_release_domain_lock_no_delete_when_value_mismatch(redis):
+    redis.set(LOCK_KEY, "other-worker:sess-456:1738253400")
+
+    release_domain_lock(redis, "example.com", "sess-123", b"worker-1:sess-123:1738253400")
 
+    assert redis.get(LOCK_KEY) == b"other-worker:sess-456:1738253400"
 
-def test_release_domain_lock_no_op_when_key_missing():
+
+def test_release_domain_lock_is_single_script_call():
+    """Release is one compare-and-delete script call (EVALSHA), not GET then DEL."""
     redis = MagicMock()
-    redis.get.return_value = None
+    redis.register_script.return_value.return_value = 1
 
-    release_domain_lock(redis, "example.com", "worker-1", "sess-123")
+    release_domain_lock(redis, "example.com", "sess-123", b"worker-1:sess-123:1738253400")
 
+    script = redis.register_script.return_value
+    script.assert_called_once_with(keys=[LOCK_KEY], args=[b"worker-1:sess-123:1738253400"])
+    redis.get.assert_not_called()
     redis.delete.assert_not_called()
 
 
-# --- throttle_wait ---
+def test_release_domain_lock_no_op_when_key_missing(redis):
+    release_domain_lock(redis, "example.com", "sess-123", b"worker-1:sess-123:1738253400")
+
+    assert redis.exists(LOCK_KEY) == 0
 
 
-def test_throttle_wait_skips_when_disable_throttle():
+def test_release_domain_lock_noop_when_disabled(lock_config):
     redis = MagicMock()
-    config = _lock_config(disable_throttle=True)
 
-    throttle_wait(redis, "example.com", "sess-123", config, "standard")
+    release_domain_lock(redis, "example.com", "s", b"w:s:1", lock_config(disable_locks=True))
 
     redis.get.assert_not_called()
-    redis.set.assert_called_once()
-    call = redis.set.call_args
-    assert call[0][0] == f"{THROTTLE_KEY_PREFIX}example.com"
-    assert call[1].get("ex") == 60
+    redis.register_script.assert_not_called()
 
 
-def test_throttle_wait_skips_when_mode_debug():
-    redis = MagicMock()
-    config = _lock_config(disable_throttle=False)
+# --- throttle_wait ---
+
+
+def test_throttle_wait_skips_when_disable_throttle(redis, frozen_now, lock_config):
+    redis.set(THROTTLE_KEY, str(frozen_now - 500))
+    config = lock_config(disable_throttle=True)
 
-    throttle_wait(redis, "example.com", "sess-123", config, "debug")
+    with patch("worker.locking.time.sleep") as mock_sleep:
+        throttle_wait(redis, "example.com", "sess-123", config, "standard")
 
-    redis.set.assert_called_once()
-    assert redis.set.call_args[1].get("ex") == 60
+    mock_sleep.assert_not_called()
+    assert int(redis.get(THROTTLE_KEY)) == frozen_now
+    assert 0 < redis.ttl(THROTTLE_KEY) <= 60
 
 
-def test_throttle_wait_waits_when_within_min_delay():
-    redis = MagicMock()
-    now_ms = int(time.time() * 1000)
-    last_ms = now_ms - 500
-    redis.get.return_value = str(last_ms).encode()
-    config = _lock_config(min_delay_ms=2000)
+def test_throttle_wait_skips_when_mode_debug(redis, frozen_now, lock_config):
+    redis.set(THROTTLE_KEY, str(frozen_now - 500))
+    config = lock_config(disable_throttle=False)
+
+    with patch("worker.locking.time.sleep") as mock_sleep:
+        throttle_wait(redis, "example.com", "sess-123", config, "debug")
+
+    mock_sleep.assert_not_called()
+    assert 0 < redis.ttl(THROTTLE_KEY) <= 60
+
+
+def test_throttle_wait_waits_when_within_min_delay(redis, frozen_now, lock_config):
+    redis.set(THROTTLE_KEY, str(frozen_now - 500))
+    config = lock_config(min_delay_ms=2000)
 
     with patch("worker.locking.time.sleep") as mock_sleep:
         throttle_wait(redis, "example.com", "sess-123", config, "standard")
 
-    mock_sleep.assert_called_once()
-    wait_s = mock_sleep.call_args[0][0]
-    assert 1.4 <= wait_s <= 1.6
-    redis.set.assert_called()
+    mock_sleep.assert_called_once_with(1.5)
+    # Read and advance happen in one script: the slot is reserved before sleeping
+    assert int(redis.get(THROTTLE_KEY)) == frozen_now + 1500
 
 
-def test_throttle_wait_no_wait_when_elapsed_exceeds_min_delay():
-    redis = MagicMock()
-    now_ms = int(time.time() * 1000)
-    last_ms = now_ms - 5000
-    redis.get.return_value = str(last_ms).encode()
-    config = _lock_config(min_delay_ms=2000)
+def test_throttle_wait_ignores_non_numeric_timestamp(redis, frozen_now, lock_config):
+    redis.set(THROTTLE_KEY, "not-a-timestamp")
+
+    with patch("worker.locking.time.sleep") as mock_sleep:
+        throttle_wait(redis, "example.com", "sess-123", lock_config(), "standard")
+
+    mock_sleep.assert_not_called()
+    assert int(redis.get(THROTTLE_KEY)) == frozen_now
+
+
+def test_throttle_wait_clamps_negative_elapsed(redis, frozen_now, lock_config):
+    """A throttle timestamp far in the future (clock step) caps the wait at 2 * min delay."""
+    redis.set(THROTTLE_KEY, str(frozen_now + 10_000))
+    config = lock_config(min_delay_ms=2000)
+
+    with patch("worker.locking.time.sleep") as mock_sleep:
+        throttle_wait(redis, "example.com", "sess-123", config, "standard")
+
+    mock_sleep.assert_called_once_with(4.0)
+
+
+def test_throttle_wait_no_wait_when_elapsed_exceeds_min_delay(redis, frozen_now, lock_config):
+    redis.set(THROTTLE_KEY, str(frozen_now - 5000))
+    config = lock_config(min_delay_ms=2000)
 
     with patch("worker.locking.time.sleep") as mock_sleep:
         throttle_wait(redis, "example.com", "sess-123", config, "standard")
 
     mock_sleep.assert_not_called()
-    redis.set.assert_called_once()
+    assert int(redis.get(THROTTLE_KEY)) == frozen_now
 
 
-def test_throttle_wait_no_wait_when_key_missing():
-    redis = MagicMock()
-    redis.get.return_value = None
-    config = _lock_config(min_delay_ms=2000)
+def test_throttle_wait_no_wait_when_key_missing(redis, frozen_now, lock_config):
+    config = lock_config(min_delay_ms=2000)
 
     with patch("worker.locking.time.sleep") as mock_sleep:
         throttle_wait(redis, "example.com", "sess-123", config, "standard")
 
     mock_sleep.assert_not_called()
-    redis.set.assert_called_once()
+    assert int(redis.get(THROTTLE_KEY)) == frozen_now
 
 
-# --- update_throttle_after_session ---
+# --- async variants ---
 
 
-def test_update_throttle_after_session_sets_key():
-    redis = MagicMock()
-    config = _lock_config()
+@pytest.mark.asyncio
+async def test_acquire_domain_lock_async_success_when_key_not_set(async_redis, lock_config):
+    await acquire_domain_lock_async(async_redis, "example.com", "w", "s", lock_config())
 
-    update_throttle_after_session(redis, "example.com", config)
+    assert (await async_redis.get(LOCK_KEY)).decode().startswith("w:s:")
+    assert 0 < await async_redis.ttl(LOCK_KEY) <= 300
 
-    redis.set.assert_called_once()
-    key, value = redis.set.call_args[0][:2]
-    assert key == f"{THROTTLE_KEY_PREFIX}example.com"
-    assert value.isdigit()
-    assert redis.set.call_args[1].get("ex") == 60
 
+@pytest.mark.asyncio
+async def test_acquire_domain_lock_async_timeout_backs_off_without_blocking(
+    async_redis, lock_config
+):
+    await async_redis.set(LOCK_KEY, "other:sess:1")
 
-def test_update_throttle_after_session_no_op_when_disable_throttle():
-    redis = MagicMock()
-    config = _lock_config(disable_throttle=True)
+    with (
+        patch("worker.locking.time.sleep") as mock_sleep,
+        patch("worker.locking.asyncio.sleep") as mock_async_sleep,
+    ):
+        with pytest.raises(DomainLockTimeoutError):
+            await acquire_domain_lock_async(
+                async_redis, "example.com", "w", "s", lock_config(max_retries=3)
+            )
+
+    mock_sleep.assert_not_called()
+    assert mock_async_sleep.await_count == 2
+    assert await async_redis.get(LOCK_KEY) == b"other:sess:1"
 
-    update_throttle_after_session(redis, "example.com", config)
 
-    redis.set.assert_not_called()
+@pytest.mark.asyncio
+async def test_throttle_wait_async_waits_when_within_min_delay(
+    async_redis, frozen_now, lock_config
+):
+    await async_redis.set(THROTTLE_KEY, str(frozen_now - 500))
+
+    with patch("worker.locking.asyncio.sleep") as mock_async_sleep:
+        await throttle_wait_async(
+            async_redis, "example.com", "sess-123", lock_config(min_delay_ms=2000), "standard"
+        )
+
+    mock_async_sleep.assert_awaited_once_with(1.5)
+    assert int(await async_redis.get(THROTTLE_KEY)) == frozen_now + 1500
+
+
+@pytest.mark.asyncio
+async def test_throttle_wait_async_skips_when_mode_debug(async_redis, frozen_now, lock_config):
+    await async_redis.set(THROTTLE_KEY, str(frozen_now - 500))
+
+    with patch("worker.locking.asyncio.sleep") as mock_async_sleep:
+        await throttle_wait_async(async_redis, "example.com", "sess-123", lock_config(), "debug")
+
+    mock_async_sleep.assert_not_called()
+    assert int(await async_redis.get(THROTTLE_KEY)) == frozen_now
+    assert 0 < await async_redis.ttl(THROTTLE_KEY) <= 60
+
+
+# --- update_throttle_after_session ---
+
+
+def test_update_throttle_after_session_sets_key(redis, frozen_now, lock_config):
+    update_throttle_after_session(redis, "example.com", lock_config())
+
+    assert int(redis.get(THROTTLE_KEY)) == frozen_now
+    assert 0 < redis.ttl(THROTTLE_KEY) <= 60
+
+
+def test_update_throttle_after_session_no_op_when_disable_throttle(redis, lock_config):
+    update_throttle_after_session(redis, "example.com", lock_config(disable_throttle=True))
+
+    assert redis.exists(THROTTLE_KEY) == 0
 
 
 # --- key constants ---
@@ -249,3 +484,11 @@ def test_lock_key_prefix():
 
 def test_throttle_key_prefix():
     assert THROTTLE_KEY_PREFIX == "throttle:domain:"
+
+
+def test_lock_and_throttle_keys_share_shard_hash_tag():
+    """A domain's lock and throttle keys share one {p<n>} tag (same Cluster slot)."""
+    for domain in ("example.com", "shop.example.org", "another-store.de"):
+        lock_tag = _lock_key(domain).split(":")[2]
+        assert lock_tag == _throttle_key(domain).split(":")[2]
+        assert 0 <= int(lock_tag[2:-1]) < LOCK_KEY_SHARDS
@@ -6,7 +6,7 @@ Per TECH_SPEC_V1.1.md §5 Navigation retry policy (v1.3). No Playwright/network
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
@@ -23,6 +23,60 @@ from worker.crawl.navigation_retry import (
     navigate_with_retry,
 )
 
+
+def _resp(status: int) -> MagicMock:
+    response = MagicMock()
+    response.status = status
+    response.__bool__ = lambda self: True
+    return response
+
+
+# Shared Playwright Response stand-ins; tests only read them, never mutate.
+RESP_200 = _resp(200)
+RESP_403 = _resp(403)
+RESP_404 = _resp(404)
+RESP_429 = _resp(429)
+RESP_500 = _resp(500)
+
+SESSION_ID = uuid4()
+
+
+@pytest.fixture
+def nav_kwargs() -> dict:
+    """Default navigate_with_retry keyword arguments; tests override what they exercise."""
+    return {
+        "session_id": SESSION_ID,
+        "repository": None,
+        "page_type": "homepage",
+        "viewport": "desktop",
+        "domain": "example.com",
+        "nav_timeout_ms": 100,
+        "hard_page_timeout_ms": 10000,
+    }
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    """Backoff and bot-block waits return immediately."""
+
+    async def _sleep(_delay):
+        return None
+
+    monkeypatch.setattr("worker.crawl.navigation_retry.asyncio.sleep", _sleep)
+
+
+@pytest.fixture
+def bot_block(monkeypatch):
+    """Stub is_bot_block_page: bot_block(False) or bot_block(side_effect=[True, False])."""
+
+    def _set(return_value: bool = False, side_effect=None) -> AsyncMock:
+        mock = AsyncMock(return_value=return_value, side_effect=side_effect)
+        monkeypatch.setattr("worker.crawl.navigation_retry.is_bot_block_page", mock)
+        return mock
+
+    return _set
+
+
 # --- Max attempts and backoff ---
 
 
@@ -32,20 +86,21 @@ def test_backoff_seconds_max_attempts_constants():
     assert BACKOFF_SECONDS == (1, 2, 4)
 
 
-def test_backoff_seconds_in_range_for_attempts_1_2_3():
-    """Backoff for attempts 1–3 is base (1s, 2s, 4s) plus jitter 0–500 ms."""
-    for attempt in (1, 2, 3):
-        base = BACKOFF_SECONDS[attempt - 1]
-        for _ in range(20):
-            got = _backoff_seconds(attempt)
-            assert base <= got <= base + 0.5, f"attempt={attempt} got={got}"
+@pytest.mark.parametrize(
+    "attempt,jitter",
+    [(attempt, jitter) for attempt in (1, 2, 3) for jitter in (0.0, 0.25, 0.5)],
+)
+def test_backoff_seconds_is_base_plus_jitter_for_attempts_1_2_3(monkeypatch, attempt, jitter):
+    """Backoff for attempts 1–3 is base (1s, 2s, 4s) plus jitter drawn from 0–500 ms."""
+    monkeypatch.setattr("worker.crawl.navigation_retry.random.uniform", lambda lo, hi: jitter)
+    assert _backoff_seconds(attempt) == BACKOFF_SECONDS[attempt - 1] + jitter
 
 
-def test_backoff_seconds_attempt_beyond_three_uses_last_base():
-    """Attempt > 3 still uses last backoff base (4s) plus jitter."""
-    for attempt in (4, 5, 10):
-        got = _backoff_seconds(attempt)
-        assert 4 <= got <= 4.5, f"attempt={attempt} got={got}"
+@pytest.mark.parametrize("attempt", [4, 5, 10])
+def test_backoff_seconds_attempt_beyond_three_uses_last_base(monkeypatch, attempt):
+    """Attempt > 3 still uses last backoff base (4s) plus jitter (upper bound 500 ms)."""
+    monkeypatch.setattr("worker.crawl.navigation_retry.random.uniform", lambda lo, hi: hi)
+    assert _backoff_seconds(attempt) == 4.5
 
 
 # --- Failure classification ---
@@ -88,69 +143,57 @@ def test_classify_failure_non_retryable():
 # --- Retryable status (403, 503, 429) ---
 
 
-def test_is_retryable_status_403_503_429():
-    """403, 503, 429 are retryable per spec."""
-    assert _is_retryable_status(403) is True
-    assert _is_retryable_status(503) is True
-    assert _is_retryable_status(429) is True
-
-
-def test_is_retryable_status_4xx_5xx_other_not_retryable():
-    """4xx (other than 403, 429) and 5xx (other than 503) are not retryable."""
-    assert _is_retryable_status(404) is False
-    assert _is_retryable_status(400) is False
-    assert _is_retryable_status(500) is False
-    assert _is_retryable_status(502) is False
-    assert _is_retryable_status(200) is False
-    assert _is_retryable_status(None) is False
-
-
-def test_retry_reason_for_status_429_vs_403_503():
-    """429 maps to status_429; 403/503 map to status_403_503."""
-    assert _retry_reason_for_status(429) == "status_429"
-    assert _retry_reason_for_status(403) == "status_403_503"
-    assert _retry_reason_for_status(503) == "status_403_503"
+@pytest.mark.parametrize(
+    "status,retryable,reason",
+    [
+        (403, True, "status_403_503"),
+        (503, True, "status_403_503"),
+        (429, True, "status_429"),
+        (404, False, None),
+        (400, False, None),
+        (500, False, None),
+        (502, False, None),
+        (200, False, None),
+        (None, False, None),
+    ],
+)
+def test_status_retryable_and_reason(status, retryable, reason):
+    """Only 403, 503 and 429 are retryable; 429 maps to status_429, 403/503 to status_403_503."""
+    assert _is_retryable_status(status) is retryable
+    if retryable:
+        assert _retry_reason_for_status(status) == reason
 
 
 # --- Bot-block detection ---
 
 
-@pytest.mark.asyncio
-async def test_is_bot_block_page_detects_challenge_captcha():
+@pytest.mark.asyncio(scope="module")
+async def test_is_bot_block_page_detects_challenge_captcha(make_page):
     """Page with strong bot-block indicators (per BOT_BLOCK_STRONG_INDICATORS) is detected."""
     # Current indicators: captcha, verify you are human, ddos protection
-    page1 = AsyncMock()
-    page1.title = AsyncMock(return_value="Please complete the captcha")
-    page1.inner_text = AsyncMock(return_value="Verify you are human")
+    page1 = make_page(title="Please complete the captcha", inner_text="Verify you are human")
     assert await is_bot_block_page(page1) is True
 
-    page2 = AsyncMock()
-    page2.title = AsyncMock(return_value="Shop")
-    page2.inner_text = AsyncMock(return_value="Verify you are human to continue")
+    page2 = make_page(title="Shop", inner_text="Verify you are human to continue")
     assert await is_bot_block_page(page2) is True
 
-    page3 = AsyncMock()
-    page3.title = AsyncMock(return_value="Blocked")
-    page3.inner_text = AsyncMock(return_value="DDoS protection active")
+    page3 = make_page(title="Blocked", inner_text="DDoS protection active")
     assert await is_bot_block_page(page3) is True
 
 
-@pytest.mark.asyncio
-async def test_is_bot_block_page_normal_page_false():
+@pytest.mark.asyncio(scope="module")
+async def test_is_bot_block_page_normal_page_false(make_page):
     """Page without bot-block indicators returns False."""
-    page = AsyncMock()
-    page.title = AsyncMock(return_value="Product Page")
-    page.inner_text = AsyncMock(return_value="Add to cart, price, description")
+    page = make_page(title="Product Page", inner_text="Add to cart, price, description")
 
     assert await is_bot_block_page(page) is False
 
 
-@pytest.mark.asyncio
-async def test_is_bot_block_page_exception_returns_false():
+@pytest.mark.asyncio(scope="module")
+async def test_is_bot_block_page_exception_returns_false(make_page):
     """If title/body access fails, treat as not bot-block (safe fallback)."""
-    page = AsyncMock()
-    page.title = AsyncMock(side_effect=Exception("DOM error"))
-    page.inner_text = AsyncMock(return_value="")
+    page = make_page(inner_text="")
+    page.title.side_effect = Exception("DOM error")
 
     assert await is_bot_block_page(page) is False
 
@@ -158,97 +201,43 @@ async def test_is_bot_block_page_exception_returns_false():
 # --- navigate_with_retry: success and max attempts ---
 
 
-@pytest.mark.asyncio
-async def test_navigate_with_retry_success_first_attempt():
+@pytest.mark.asyncio(scope="module")
+async def test_navigate_with_retry_success_first_attempt(make_page, bot_block, nav_kwargs):
     """Success on first attempt returns success, no retries."""
-    page = AsyncMock()
-    mock_response = MagicMock()
-    mock_response.status = 200
-    mock_response.__bool__ = lambda self: True
-    page.goto = AsyncMock(return_value=mock_response)
-
-    with patch(
-        "worker.crawl.navigation_retry.is_bot_block_page",
-        new_callable=AsyncMock,
-        return_value=False,
-    ):
-        result = await navigate_with_retry(
-            page,
-            "https://example.com/",
-            session_id=uuid4(),
-            repository=None,
-            page_type="homepage",
-            viewport="desktop",
-            domain="example.com",
-            nav_timeout_ms=500,
-            hard_page_timeout_ms=5000,
-        )
+    page = make_page(goto_return=RESP_200)
+
+    bot_block(False)
+
+    result = await navigate_with_retry(page, "https://example.com/", **nav_kwargs)
 
     assert result.success is True
     assert result.error_summary is None
-    assert result.response is mock_response
+    assert result.response is RESP_200
     assert page.goto.await_count == 1
 
 
-@pytest.mark.asyncio
-async def test_navigate_with_retry_timeout_then_success():
+@pytest.mark.asyncio(scope="module")
+async def test_navigate_with_retry_timeout_then_success(make_page, bot_block, nav_kwargs):
     """Timeout on attempt 1, success on attempt 2 (retry with backoff)."""
-    page = AsyncMock()
-    mock_response = MagicMock()
-    mock_response.status = 200
-    mock_response.__bool__ = lambda self: True
-    page.goto = AsyncMock(side_effect=[PlaywrightTimeoutError("timeout"), mock_response])
-
-    with (
-        patch("worker.crawl.navigation_retry.asyncio.sleep", new_callable=AsyncMock),
-        patch(
-            "worker.crawl.navigation_retry.is_bot_block_page",
-            new_callable=AsyncMock,
-            return_value=False,
-        ),
-    ):
-        result = await navigate_with_retry(
-            page,
-            "https://example.com/",
-            session_id=uuid4(),
-            repository=None,
-            page_type="homepage",
-            viewport="desktop",
-            domain="example.com",
-            nav_timeout_ms=100,
-            hard_page_timeout_ms=10000,
-        )
+    page = make_page(goto_side_effect=[PlaywrightTimeoutError("timeout"), RESP_200])
+
+    bot_block(False)
+
+    result = await navigate_with_retry(page, "https://example.com/", **nav_kwargs)
 
     assert result.success is True
     assert result.error_summary is None
     assert page.goto.await_count == 2
 
 
-@pytest.mark.asyncio
-async def test_navigate_with_retry_max_attempts_exhausted_timeout():
+@pytest.mark.asyncio(scope="module")
+async def test_navigate_with_retry_max_attempts_exhausted_timeout(make_page, bot_block, nav_kwargs):
     """Three timeouts → failure, error_summary Navigation timeout."""
-    page = AsyncMock()
-    page.goto = AsyncMock(side_effect=PlaywrightTimeoutError("timeout"))
-
-    with (
-        patch("worker.crawl.navigation_retry.asyncio.sleep", new_callable=AsyncMock),
-        patch(
-            "worker.crawl.navigation_retry.is_bot_block_page",
-            new_callable=AsyncMock,
-            return_value=False,
-        ),
-    ):
-        result = await navigate_with_retry(
-            page,
-            "https://example.com/",
-            session_id=uuid4(),
-            repository=None,
-            page_type="homepage",
-            viewport="desktop",
-            domain="example.com",
-            nav_timeout_ms=50,
-            hard_page_timeout_ms=10000,
-        )
+    page = make_page(goto_side_effect=PlaywrightTimeoutError("timeout"))
+
+    bot_block(False)
+
+    result = await navigate_with_retry(page, "https://example.com/", **nav_kwargs)
 
     assert result.success is False
     assert result.error_summary == "Navigation timeout"
@@ -256,177 +245,74 @@ async def test_navigate_with_retry_max_attempts_exhausted_timeout():
     assert page.goto.await_count == MAX_NAV_ATTEMPTS
 
 
-@pytest.mark.asyncio
-async def test_navigate_with_retry_403_then_success():
+@pytest.mark.asyncio(scope="module")
+async def test_navigate_with_retry_403_then_success(make_page, bot_block, nav_kwargs):
     """403 on attempt 1, success on attempt 2 (retryable status)."""
-    page = AsyncMock()
-    resp_403 = MagicMock()
-    resp_403.status = 403
-    resp_403.__bool__ = lambda self: True
-    resp_200 = MagicMock()
-    resp_200.status = 200
-    resp_200.__bool__ = lambda self: True
-    page.goto = AsyncMock(side_effect=[resp_403, resp_200])
-
-    with (
-        patch("worker.crawl.navigation_retry.asyncio.sleep", new_callable=AsyncMock),
-        patch(
-            "worker.crawl.navigation_retry.is_bot_block_page",
-            new_callable=AsyncMock,
-            return_value=False,
-        ),
-    ):
-        result = await navigate_with_retry(
-            page,
-            "https://example.com/",
-            session_id=uuid4(),
-            repository=None,
-            page_type="homepage",
-            viewport="desktop",
-            domain="example.com",
-            nav_timeout_ms=100,
-            hard_page_timeout_ms=10000,
-        )
+    page = make_page(goto_side_effect=[RESP_403, RESP_200])
+
+    bot_block(False)
+
+    result = await navigate_with_retry(page, "https://example.com/", **nav_kwargs)
 
     assert result.success is True
     assert page.goto.await_count == 2
 
 
-@pytest.mark.asyncio
-async def test_navigate_with_retry_429_three_times_fails():
+@pytest.mark.asyncio(scope="module")
+async def test_navigate_with_retry_429_three_times_fails(make_page, bot_block, nav_kwargs):
     """429 on all three attempts → failure, error_summary Rate limited (429)."""
-    page = AsyncMock()
-    resp_429 = MagicMock()
-    resp_429.status = 429
-    resp_429.__bool__ = lambda self: True
-    page.goto = AsyncMock(return_value=resp_429)
-
-    with (
-        patch("worker.crawl.navigation_retry.asyncio.sleep", new_callable=AsyncMock),
-        patch(
-            "worker.crawl.navigation_retry.is_bot_block_page",
-            new_callable=AsyncMock,
-            return_value=False,
-        ),
-    ):
-        result = await navigate_with_retry(
-            page,
-            "https://example.com/",
-            session_id=uuid4(),
-            repository=None,
-            page_type="pdp",
-            viewport="desktop",
-            domain="example.com",
-            nav_timeout_ms=100,
-            hard_page_timeout_ms=10000,
-        )
+    page = make_page(goto_return=RESP_429)
+
+    bot_block(False)
+
+    nav_kwargs["page_type"] = "pdp"
+    result = await navigate_with_retry(page, "https://example.com/", **nav_kwargs)
 
     assert result.success is False
     assert result.error_summary == "Rate limited (429)"
     assert page.goto.await_count == MAX_NAV_ATTEMPTS
 
 
-@pytest.mark.asyncio
-async def test_navigate_with_retry_404_non_retryable_log_and_fail():
-    """404 is non-retryable per spec; do not retry, log and fail the page."""
-    page = AsyncMock()
-    resp_404 = MagicMock()
-    resp_404.status = 404
-    resp_404.__bool__ = lambda self: True
-    page.goto = AsyncMock(return_value=resp_404)
-
-    with patch(
-        "worker.crawl.navigation_retry.is_bot_block_page",
-        new_callable=AsyncMock,
-        return_value=False,
-    ):
-        result = await navigate_with_retry(
-            page,
-            "https://example.com/404",
-            session_id=uuid4(),
-            repository=None,
-            page_type="homepage",
-            viewport="desktop",
-            domain="example.com",
-            nav_timeout_ms=100,
-            hard_page_timeout_ms=10000,
-        )
-
-    assert result.success is False
-    assert result.error_summary == "Crawl failed"
-    assert result.response is resp_404
-    assert page.goto.await_count == 1
+@pytest.mark.parametrize(
+    "response,url,page_type",
+    [
+        (RESP_404, "https://example.com/404", "homepage"),
+        (RESP_500, "https://example.com/error", "pdp"),
+    ],
+    ids=["404", "500"],
+)
+@pytest.mark.asyncio(scope="module")
+async def test_navigate_with_retry_non_retryable_status_log_and_fail(
+    make_page, bot_block, nav_kwargs, response, url, page_type
+):
+    """404 and 500 (other than 503) are non-retryable per spec; do not retry, log and fail."""
+    page = make_page(goto_return=response)
 
+    bot_block(False)
 
-@pytest.mark.asyncio
-async def test_navigate_with_retry_500_non_retryable_log_and_fail():
-    """500 (other than 503) is non-retryable per spec; log and fail the page."""
-    page = AsyncMock()
-    resp_500 = MagicMock()
-    resp_500.status = 500
-    resp_500.__bool__ = lambda self: True
-    page.goto = AsyncMock(return_value=resp_500)
-
-    with patch(
-        "worker.crawl.navigation_retry.is_bot_block_page",
-        new_callable=AsyncMock,
-        return_value=False,
-    ):
-        result = await navigate_with_retry(
-            page,
-            "https://example.com/error",
-            session_id=uuid4(),
-            repository=None,
-            page_type="pdp",
-            viewport="desktop",
-            domain="example.com",
-            nav_timeout_ms=100,
-            hard_page_timeout_ms=10000,
-        )
+    nav_kwargs["page_type"] = page_type
+    result = await navigate_with_retry(page, url, **nav_kwargs)
 
     assert result.success is False
     assert result.error_summary == "Crawl failed"
-    assert result.response is resp_500
+    assert result.response is response
     assert page.goto.await_count == 1
 
 
 # --- Bot-block: one mitigation only ---
 
 
-@pytest.mark.asyncio
-async def test_navigate_with_retry_bot_block_one_mitigation_then_success():
+@pytest.mark.asyncio(scope="module")
+async def test_navigate_with_retry_bot_block_one_mitigation_then_success(
+    make_page, bot_block, nav_kwargs
+):
     """Bot-block detected → one reload (mitigation) → not bot-block → success."""
-    page = AsyncMock()
-    mock_response = MagicMock()
-    mock_response.status = 200
-    mock_response.__bool__ = lambda self: True
-    page.goto = AsyncMock(return_value=mock_response)
-    page.reload = AsyncMock(return_value=None)
-
-    is_bot_block_calls = [True, False]  # first load: bot-block; after reload: not
-
-    async def bot_block_side_effect(*args, **kwargs):
-        return is_bot_block_calls.pop(0) if is_bot_block_calls else False
-
-    with (
-        patch("worker.crawl.navigation_retry.asyncio.sleep", new_callable=AsyncMock),
-        patch(
-            "worker.crawl.navigation_retry.is_bot_block_page",
-            new_callable=AsyncMock,
-            side_effect=bot_block_side_effect,
-        ),
-    ):
-        result = await navigate_with_retry(
-            page,
-            "https://example.com/",
-            session_id=uuid4(),
-            repository=None,
-            page_type="homepage",
-            viewport="desktop",
-            domain="example.com",
-            nav_timeout_ms=100,
-            hard_page_timeout_ms=10000,
-        )
+    page = make_page(goto_return=RESP_200)
+
+    # First load: bot-block; after reload: not
+    bot_block(side_effect=[True, False])
+
+    result = await navigate_with_retry(page, "https://example.com/", **nav_kwargs)
 
     assert result.success is True
     assert result.bot_block_mitigation_used is True
@@ -435,35 +321,16 @@ async def test_navigate_with_retry_bot_block_one_mitigation_then_success():
     assert page.reload.await_count == 1
 
 
-@pytest.mark.asyncio
-async def test_navigate_with_retry_bot_block_one_mitigation_still_blocked_fails():
+@pytest.mark.asyncio(scope="module")
+async def test_navigate_with_retry_bot_block_one_mitigation_still_blocked_fails(
+    make_page, bot_block, nav_kwargs
+):
     """Bot-block → one reload → still bot-block → failure (no second mitigation)."""
-    page = AsyncMock()
-    mock_response = MagicMock()
-    mock_response.status = 200
-    mock_response.__bool__ = lambda self: True
-    page.goto = AsyncMock(return_value=mock_response)
-    page.reload = AsyncMock(return_value=None)
-
-    with (
-        patch("worker.crawl.navigation_retry.asyncio.sleep", new_callable=AsyncMock),
-        patch(
-            "worker.crawl.navigation_retry.is_bot_block_page",
-            new_callable=AsyncMock,
-            return_value=True,
-        ),
-    ):
-        result = await navigate_with_retry(
-            page,
-            "https://example.com/",
-            session_id=uuid4(),
-            repository=None,
-            page_type="homepage",
-            viewport="desktop",
-            domain="example.com",
-            nav_timeout_ms=100,
-            hard_page_timeout_ms=10000,
-        )
+    page = make_page(goto_return=RESP_200)
+
+    bot_block(True)
+
+    result = await navigate_with_retry(page, "https://example.com/", **nav_kwargs)
 
     assert result.success is False
     assert result.error_summary == "Bot-block"
@@ -472,35 +339,14 @@ async def test_navigate_with_retry_bot_block_one_mitigation_still_blocked_fails(
     assert page.reload.await_count == 1
 
 
-@pytest.mark.asyncio
-async def test_navigate_with_retry_bot_block_reload_fails():
+@pytest.mark.asyncio(scope="module")
+async def test_navigate_with_retry_bot_block_reload_fails(make_page, bot_block, nav_kwargs):
     """Bot-block → reload throws → failure, error_summary Bot-block; reload failed."""
-    page = AsyncMock()
-    mock_response = MagicMock()
-    mock_response.status = 200
-    mock_response.__bool__ = lambda self: True
-    page.goto = AsyncMock(return_value=mock_response)
-    page.reload = AsyncMock(side_effect=Exception("reload failed"))
-
-    with (
-        patch("worker.crawl.navigation_retry.asyncio.sleep", new_callable=AsyncMock),
-        patch(
-            "worker.crawl.navigation_retry.is_bot_block_page",
-            new_callable=AsyncMock,
-            return_value=True,
-        ),
-    ):
-        result = await navigate_with_retry(
-            page,
-            "https://example.com/",
-            session_id=uuid4(),
-            repository=None,
-            page_type="homepage",
-            viewport="desktop",
-            domain="example.com",
-            nav_timeout_ms=100,
-            hard_page_timeout_ms=10000,
-        )
+    page = make_page(goto_return=RESP_200, reload_side_effect=Exception("reload failed"))
+
+    bot_block(True)
+
+    result = await navigate_with_retry(page, "https://example.com/", **nav_kwargs)
 
     assert result.success is False
     assert result.error_summary == "Bot-block; reload failed"
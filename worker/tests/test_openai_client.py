@@ -0,0 +1,97 @@
+"""
+Tests for the OpenAI call helper: transient errors retried with backoff, permanent errors raised.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import openai
+import pytest
+
+from worker.openai_client import (
+    BACKOFF_MAX_SECONDS,
+    MAX_OPENAI_ATTEMPTS,
+    _backoff_seconds,
+    acreate_chat_completion,
+    create_chat_completion,
+)
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def _rate_limit_error() -> openai.RateLimitError:
+    return openai.RateLimitError(
+        "rate limited", response=httpx.Response(429, request=_REQUEST), body=None
+    )
+
+
+def _bad_request_error() -> openai.BadRequestError:
+    return openai.BadRequestError(
+        "bad request", response=httpx.Response(400, request=_REQUEST), body=None
+    )
+
+
+def test_create_chat_completion_retries_transient_error_then_succeeds():
+    """Rate limit / connection errors are retried; the eventual response is returned."""
+    client = MagicMock()
+    response = MagicMock()
+    client.chat.completions.create.side_effect = [
+        _rate_limit_error(),
+        openai.APIConnectionError(request=_REQUEST),
+        response,
+    ]
+    with patch("worker.openai_client.time.sleep") as sleep:
+        result = create_chat_completion(client, model="gpt-5.2", messages=[])
+
+    assert result is response
+    assert client.chat.completions.create.call_count == 3
+    assert sleep.call_count == 2
+    client.chat.completions.create.assert_called_with(model="gpt-5.2", messages=[])
+
+
+def test_create_chat_completion_raises_after_max_attempts():
+    """The last transient error is raised once attempts are exhausted."""
+    client = MagicMock()
+    client.chat.completions.create.side_effect = _rate_limit_error()
+    with patch("worker.openai_client.time.sleep"):
+        with pytest.raises(openai.RateLimitError):
+            create_chat_completion(client, model="gpt-5.2", messages=[])
+
+    assert client.chat.completions.create.call_count == MAX_OPENAI_ATTEMPTS
+
+
+def test_create_chat_completion_does_not_retry_permanent_error():
+    """Non-transient errors (e.g. 400) are raised immediately."""
+    client = MagicMock()
+    client.chat.completions.create.side_effect = _bad_request_error()
+    with patch("worker.openai_client.time.sleep") as sleep:
+        with pytest.raises(openai.BadRequestError):
+            create_chat_completion(client, model="gpt-5.2", messages=[])
+
+    assert client.chat.completions.create.call_count == 1
+    sleep.assert_not_called()
+
+
+def test_acreate_chat_completion_retries_with_async_sleep():
+    """The async variant retries transient errors without blocking the event loop."""
+    client = MagicMock()
+    response = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=[_rate_limit_error(), response])
+    with patch("worker.openai_client.asyncio.sleep", new=AsyncMock()) as sleep:
+        result = asyncio.run(acreate_chat_completion(client, model="gpt-5.2", messages=[]))
+
+    assert result is response
+    assert client.chat.completions.create.await_count == 2
+    sleep.assert_awaited_once()
+
+
+def test_backoff_seconds_exponential_and_capped():
+    """Backoff doubles per attempt (plus jitter) and never exceeds the cap plus jitter."""
+    with patch("worker.openai_client.random.uniform", return_value=0.0):
+        assert _backoff_seconds(1) == 1.0
+        assert _backoff_seconds(2) == 2.0
+        assert _backoff_seconds(3) == 4.0
+        assert _backoff_seconds(10) == BACKOFF_MAX_SECONDS
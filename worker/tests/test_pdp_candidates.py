@@ -2,11 +2,14 @@
 Unit tests for PDP candidate link filtering and normalization (pure functions).
 
 Covers: eTLD+1 / same-site subdomains, external exclusion, category URLs,
-ordering/cap, dedupe, nav/footer exclusion, and existing pattern-based selection.
+ordering/cap, dedupe, and existing pattern-based selection. The real-browser nav/footer
+check lives in test_pdp_candidates_e2e.py.
 """
 
 from __future__ import annotations
 
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 
 from worker.crawl import (
@@ -18,32 +21,40 @@ from worker.crawl import (
     normalize_internal_url,
 )
 
-
-def test_is_pdp_candidate_path_product():
-    assert is_pdp_candidate_path("/product/foo") is True
-    assert is_pdp_candidate_path("/products/bar") is True
-    assert is_pdp_candidate_path("/Product/foo") is True
-
-
-def test_is_pdp_candidate_path_p_item():
-    assert is_pdp_candidate_path("/p/123") is True
-    assert is_pdp_candidate_path("/item/abc") is True
-    assert is_pdp_candidate_path("/items/") is True
-
-
-def test_is_pdp_candidate_path_shopify():
-    assert is_pdp_candidate_path("/collections/sale/products/thing") is True
-    assert is_pdp_candidate_path("/products/something") is True
-
-
-def test_is_pdp_candidate_path_shop():
-    assert is_pdp_candidate_path("/shop/widget") is True
+# Shared immutable inputs: the filters accept any iterable, so every run reuses one tuple.
+BASE_URL = "https://example.com/"
+CANONICAL_PDP_URLS = (
+    "https://example.com/products/z",
+    "https://example.com/product/a",
+    "https://example.com/products/m",
+    "https://example.com/product/b",
+)
+CANONICAL_CONTEXT_URLS = (
+    "https://example.com/categories/z",
+    "https://example.com/categories/a",
+    "https://example.com/categories/m",
+)
 
 
-def test_is_pdp_candidate_path_rejects_root_and_non_pdp():
-    assert is_pdp_candidate_path("/") is False
-    assert is_pdp_candidate_path("/about") is False
-    assert is_pdp_candidate_path("/contact") is False
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("/product/foo", True),
+        ("/products/bar", True),
+        ("/Product/foo", True),
+        ("/p/123", True),
+        ("/item/abc", True),
+        ("/items/", True),
+        ("/collections/sale/products/thing", True),
+        ("/products/something", True),
+        ("/shop/widget", True),
+        ("/", False),
+        ("/about", False),
+        ("/contact", False),
+    ],
+)
+def test_is_pdp_candidate_path(path, expected):
+    assert is_pdp_candidate_path(path) is expected
 
 
 def test_normalize_internal_url_same_domain():
@@ -62,6 +73,33 @@ def test_normalize_internal_url_rejects_mailto_tel():
     assert normalize_internal_url("#section", base) is None
 
 
+@pytest.mark.parametrize(
+    "href,expected",
+    [
+        ("https://Shop.Example.com/Product/1/", "https://shop.example.com/Product/1"),
+        ("http://example.com", "http://example.com/"),
+        ("https://example.com/p/1?variant=2#reviews", "https://example.com/p/1"),
+        ("https://example.com#top", "https://example.com/"),
+        ("https://example.com/p/1;jsessionid=abc", "https://example.com/p/1"),
+        ("HTTPS://EXAMPLE.com/p/1", "https://example.com/p/1"),
+        ("https:///p/1", "https://example.com/p/1"),
+        ("https://user@Example.com:8443/p", "https://user@example.com:8443/p"),
+    ],
+    ids=[
+        "case",
+        "no-path",
+        "query-fragment",
+        "fragment-only",
+        "params",
+        "upper-scheme",
+        "empty-host",
+        "userinfo-port",
+    ],
+)
+def test_normalize_internal_url_absolute_matches_urlparse(href, expected):
+    assert normalize_internal_url(href, "https://example.com/") == expected
+
+
 def test_normalize_internal_url_rejects_empty():
     assert normalize_internal_url("", "https://example.com/") is None
     assert normalize_internal_url("   ", "https://example.com/") is None
@@ -96,6 +134,44 @@ def test_filter_pdp_candidate_urls_excludes_account_cart():
     assert "https://example.com/account" not in out
 
 
+def test_filter_pdp_candidate_urls_excludes_whole_segments_only():
+    """Excluded words match whole path segments anywhere in the path, not substrings."""
+    base = "https://example.com/"
+    urls = [
+        "https://example.com/en/Cart/product/x",
+        "https://example.com/shop/account/orders",
+        "https://example.com/cartoons/product/y",
+        "https://example.com/products/login-kit",
+    ]
+    out = filter_pdp_candidate_urls(urls, base, max_candidates=10)
+    assert out == [
+        "https://example.com/cartoons/product/y",
+        "https://example.com/products/login-kit",
+    ]
+
+
+def test_filter_pdp_candidate_urls_excluded_segment_not_prefix_match():
+    """Words that merely start with an excluded segment (/accountants) are not excluded."""
+    base = "https://example.com/"
+    urls = [
+        "https://example.com/accountants/product/a",
+        "https://example.com/products/cart-organizer",
+        "https://example.com/account/product/b",
+    ]
+    out = filter_pdp_candidate_urls(urls, base, max_candidates=10)
+    assert out == [
+        "https://example.com/accountants/product/a",
+        "https://example.com/products/cart-organizer",
+    ]
+
+
+def test_filter_pdp_candidate_urls_zero_cap_returns_empty():
+    base = "https://example.com/"
+    urls = ["https://example.com/product/a"]
+    assert filter_pdp_candidate_urls(urls, base, max_candidates=0) == []
+    assert filter_product_context_urls(urls, base, max_candidates=0) == []
+
+
 def test_filter_pdp_candidate_urls_dedupe_and_cap():
     base = "https://example.com/"
     urls = ["https://example.com/product/x"] * 5 + [
@@ -206,6 +282,16 @@ def test_get_etld_plus_one_subdomain():
     assert get_etld_plus_one("example.com") == "example.com"
 
 
+def test_get_etld_plus_one_multi_label_suffix():
+    """Known multi-label public suffixes keep one label in front of the suffix."""
+    assert get_etld_plus_one("shop.example.co.uk") == "example.co.uk"
+    assert get_etld_plus_one("www.example.co.uk") == "example.co.uk"
+    assert get_etld_plus_one("example.com.al") == "example.com.al"
+    assert get_etld_plus_one("co.uk") == "co.uk"
+    # Unknown second-level labels fall back to the last two labels
+    assert get_etld_plus_one("a.b.example.de") == "example.de"
+
+
 def test_filter_pdp_candidate_urls_cross_subdomain_internal():
     """Cross-subdomain links (example.com -> www.example.com) accepted as internal."""
     base = "https://example.com/"
@@ -368,36 +454,27 @@ def test_filter_pdp_candidate_urls_pattern_based_still_works():
 
 def test_filter_pdp_candidate_urls_stable_across_runs():
     """Same input produces identical output across multiple runs (determinism)."""
-    base = "https://example.com/"
-    urls = [
-        "https://example.com/products/z",
-        "https://example.com/product/a",
-        "https://example.com/products/m",
-        "https://example.com/product/b",
-    ]
-
     # Run 10 times, should get identical results
-    results = [filter_pdp_candidate_urls(urls, base, max_candidates=10) for _ in range(10)]
+    results = [
+        filter_pdp_candidate_urls(CANONICAL_PDP_URLS, BASE_URL, max_candidates=10)
+        for _ in range(10)
+    ]
 
     # All results identical
     for result in results:
         assert result == results[0]
 
     # Order matches input order
-    assert results[0] == urls
+    assert results[0] == list(CANONICAL_PDP_URLS)
 
 
 def test_filter_product_context_urls_stable_across_runs():
     """Product-context filter produces deterministic output."""
-    base = "https://example.com/"
-    urls = [
-        "https://example.com/categories/z",
-        "https://example.com/categories/a",
-        "https://example.com/categories/m",
+    results = [
+        filter_product_context_urls(CANONICAL_CONTEXT_URLS, BASE_URL, max_candidates=10)
+        for _ in range(10)
     ]
 
-    results = [filter_product_context_urls(urls, base, max_candidates=10) for _ in range(10)]
-
     # All results identical
     for result in results:
         assert result == results[0]
@@ -539,28 +616,23 @@ def test_filter_pdp_candidate_urls_case_insensitive_patterns():
 
 
 @pytest.mark.asyncio
-async def test_extract_pdp_candidate_links_nav_footer_excluded():
-    """Links inside nav/footer are excluded from pattern pass; main content links included."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html>
-    <html><body>
-    <nav><a href="/product/nav-link">Nav</a></nav>
-    <footer><a href="/product/footer-link">Footer</a></footer>
-    <main><a href="/product/main-link">Main</a></main>
-    </body></html>
-    """
-    base_url = "https://example.com/"
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        result = await extract_pdp_candidate_links(page, base_url, max_candidates=20)
-        await browser.close()
-    main_url = "https://example.com/product/main-link"
-    nav_url = "https://example.com/product/nav-link"
-    footer_url = "https://example.com/product/footer-link"
-    assert main_url in result
-    assert nav_url not in result
-    assert footer_url not in result
+async def test_extract_pdp_candidate_links_pattern_pass_single_evaluate():
+    """Pattern pass reads all hrefs with one page.evaluate, then filters/dedupes/caps in Python."""
+    page = MagicMock()
+    page.locator.return_value.all = AsyncMock(return_value=[])  # no product containers
+    page.evaluate = AsyncMock(
+        return_value=[
+            "/product/a",
+            "/about",
+            "/product/a/",
+            "https://other.com/product/x",
+            "/cart/product/y",
+            "/products/b",
+            "/products/c",
+        ]
+    )
+
+    result = await extract_pdp_candidate_links(page, "https://example.com/", max_candidates=2)
+
+    assert result == ["https://example.com/product/a", "https://example.com/products/b"]
+    assert page.evaluate.await_count == 1
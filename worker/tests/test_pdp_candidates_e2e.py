@@ -0,0 +1,60 @@
+"""
+Browser tests for PDP candidate link extraction (real Chromium via Playwright).
+
+Marked `playwright` so the pure-Python unit job can deselect them with -m "not playwright".
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("playwright.async_api")
+
+from worker.crawl import extract_pdp_candidate_links  # noqa: E402
+
+pytestmark = pytest.mark.playwright
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_extract_pdp_candidate_links_nav_footer_excluded(page):
+    """Links inside nav/footer are excluded from pattern pass; main content links included."""
+    html = """
+    <!DOCTYPE html>
+    <html><body>
+    <nav><a href="/product/nav-link">Nav</a></nav>
+    <footer><a href="/product/footer-link">Footer</a></footer>
+    <main><a href="/product/main-link">Main</a></main>
+    </body></html>
+    """
+    base_url = "https://example.com/"
+    await page.set_content(html, wait_until="domcontentloaded")
+    result = await extract_pdp_candidate_links(page, base_url, max_candidates=20)
+    main_url = "https://example.com/product/main-link"
+    nav_url = "https://example.com/product/nav-link"
+    footer_url = "https://example.com/product/footer-link"
+    assert main_url in result
+    assert nav_url not in result
+    assert footer_url not in result
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_extract_pdp_candidate_links_pierces_open_shadow_roots(page):
+    """Pattern pass collects links inside open shadow roots (as page.locator does)."""
+    html = """
+    <!DOCTYPE html>
+    <html><body>
+    <main>
+      <product-card>
+        <template shadowrootmode="open">
+          <a href="/product/shadow-link">Shadow</a>
+          <nav><a href="/product/shadow-nav-link">Nav</a></nav>
+        </template>
+      </product-card>
+    </main>
+    </body></html>
+    """
+    base_url = "https://example.com/"
+    await page.set_content(html, wait_until="domcontentloaded")
+    result = await extract_pdp_candidate_links(page, base_url, max_candidates=20)
+    assert "https://example.com/product/shadow-link" in result
+    assert "https://example.com/product/shadow-nav-link" not in result
@@ -7,178 +7,125 @@ No logic change to low_confidence.py.
 
 from __future__ import annotations
 
-from worker.low_confidence import MIN_TEXT_LENGTH_PDP, evaluate_low_confidence_pdp
-
-
-def test_pdp_low_confidence_missing_h1():
-    low_confidence, reasons = evaluate_low_confidence_pdp(
-        has_h1=False,
-        has_primary_cta=True,
-        has_price=True,
-        has_add_to_cart=True,
-        visible_text_length=500,
-        screenshot_failed=False,
-        screenshot_blank=False,
-    )
-    assert low_confidence is True
-    assert "missing_h1" in reasons
-
+from types import MappingProxyType
+from typing import Any, Mapping
 
-def test_pdp_low_confidence_missing_price():
-    low_confidence, reasons = evaluate_low_confidence_pdp(
-        has_h1=True,
-        has_primary_cta=True,
-        has_price=False,
-        has_add_to_cart=True,
-        visible_text_length=500,
-        screenshot_failed=False,
-        screenshot_blank=False,
-    )
-    assert low_confidence is True
-    assert "missing_price" in reasons
-
-
-def test_pdp_low_confidence_missing_add_to_cart():
-    low_confidence, reasons = evaluate_low_confidence_pdp(
-        has_h1=True,
-        has_primary_cta=True,
-        has_price=True,
-        has_add_to_cart=False,
-        visible_text_length=500,
-        screenshot_failed=False,
-        screenshot_blank=False,
-    )
-    assert low_confidence is True
-    assert "missing_add_to_cart" in reasons
+import pytest
 
+from worker.low_confidence import MIN_TEXT_LENGTH_PDP, evaluate_low_confidence_pdp
 
-def test_pdp_low_confidence_text_too_short():
-    low_confidence, reasons = evaluate_low_confidence_pdp(
-        has_h1=True,
-        has_primary_cta=True,
-        has_price=True,
-        has_add_to_cart=True,
-        visible_text_length=50,
-        screenshot_failed=False,
-        screenshot_blank=False,
+# Spec-defined PDP reasons besides the dynamic text_too_short_<length>.
+_ALLOWED_PDP_REASONS: frozenset[str] = frozenset(
+    {
+        "missing_h1",
+        "missing_primary_cta",
+        "missing_price",
+        "missing_add_to_cart",
+        "screenshot_failed",
+        "screenshot_blank",
+    }
+)
+
+# Every PDP rule tripped at once (shared, read-only).
+_ALL_BAD = MappingProxyType(
+    {
+        "has_h1": False,
+        "has_primary_cta": False,
+        "has_price": False,
+        "has_add_to_cart": False,
+        "visible_text_length": 50,
+        "screenshot_failed": True,
+        "screenshot_blank": True,
+    }
+)
+
+
+@pytest.fixture(scope="module")
+def pdp_ok_kwargs() -> Mapping[str, Any]:
+    """A high-confidence PDP (read-only); each case overrides only the signals it is about."""
+    return MappingProxyType(
+        {
+            "has_h1": True,
+            "has_primary_cta": True,
+            "has_price": True,
+            "has_add_to_cart": True,
+            "visible_text_length": 500,
+            "screenshot_failed": False,
+            "screenshot_blank": False,
+        }
     )
-    assert low_confidence is True
-    assert any("text_too_short" in r for r in reasons)
 
 
-def test_pdp_low_confidence_screenshot_failed():
+@pytest.mark.parametrize(
+    "overrides,expected_reasons",
+    [
+        ({"has_h1": False}, ["missing_h1"]),
+        ({"has_primary_cta": False}, ["missing_primary_cta"]),
+        ({"has_price": False}, ["missing_price"]),
+        ({"has_add_to_cart": False}, ["missing_add_to_cart"]),
+        ({"visible_text_length": 50}, ["text_too_short_50"]),
+        ({"screenshot_failed": True}, ["screenshot_failed"]),
+        ({"screenshot_blank": True}, ["screenshot_blank"]),
+        (
+            _ALL_BAD,
+            [
+                "missing_h1",
+                "missing_primary_cta",
+                "missing_price",
+                "missing_add_to_cart",
+                "text_too_short_50",
+                "screenshot_failed",
+                "screenshot_blank",
+            ],
+        ),
+        ({}, []),
+    ],
+    ids=[
+        "missing_h1",
+        "missing_cta",
+        "missing_price",
+        "missing_add_to_cart",
+        "text_too_short",
+        "screenshot_failed",
+        "screenshot_blank",
+        "all_reasons",
+        "all_ok",
+    ],
+)
+def test_pdp_low_confidence(
+    pdp_ok_kwargs: Mapping[str, Any], overrides: Mapping[str, Any], expected_reasons: list[str]
+):
+    """Each rule contributes its exact reason string, in spec order."""
+    low_confidence, reasons = evaluate_low_confidence_pdp(**{**pdp_ok_kwargs, **overrides})
+
+    assert low_confidence is bool(expected_reasons)
+    assert reasons == expected_reasons
+
+
+@pytest.mark.parametrize(
+    "length,expect_reason",
+    [(0, True), (99, True), (100, False), (101, False), (10_000, False)],
+)
+def test_pdp_low_confidence_text_threshold(
+    pdp_ok_kwargs: Mapping[str, Any], length: int, expect_reason: bool
+):
+    """MIN_TEXT_LENGTH_PDP (100): below triggers text_too_short_<length>, at or above does not."""
     low_confidence, reasons = evaluate_low_confidence_pdp(
-        has_h1=True,
-        has_primary_cta=True,
-        has_price=True,
-        has_add_to_cart=True,
-        visible_text_length=500,
-        screenshot_failed=True,
-        screenshot_blank=False,
+        **{**pdp_ok_kwargs, "visible_text_length": length}
     )
-    assert low_confidence is True
-    assert "screenshot_failed" in reasons
 
-
-def test_pdp_high_confidence_all_ok():
-    low_confidence, reasons = evaluate_low_confidence_pdp(
-        has_h1=True,
-        has_primary_cta=True,
-        has_price=True,
-        has_add_to_cart=True,
-        visible_text_length=500,
-        screenshot_failed=False,
-        screenshot_blank=False,
-    )
-    assert low_confidence is False
-    assert len(reasons) == 0
+    assert low_confidence is expect_reason
+    assert reasons == ([f"text_too_short_{length}"] if expect_reason else [])
 
 
 def test_pdp_min_text_length_constant():
     assert MIN_TEXT_LENGTH_PDP == 100
 
 
-# --- Exact reason strings and threshold (spec alignment) ---
-
-
-def test_pdp_low_confidence_exact_reason_strings():
-    """PDP reason strings match spec: missing_h1, missing_price, missing_add_to_cart, etc."""
-    _, reasons = evaluate_low_confidence_pdp(
-        has_h1=False,
-        has_primary_cta=False,
-        has_price=False,
-        has_add_to_cart=False,
-        visible_text_length=50,
-        screenshot_failed=True,
-        screenshot_blank=True,
-    )
-    assert "missing_h1" in reasons
-    assert "missing_primary_cta" in reasons
-    assert "missing_price" in reasons
-    assert "missing_add_to_cart" in reasons
-    assert "screenshot_failed" in reasons
-    assert "screenshot_blank" in reasons
-    text_reasons = [r for r in reasons if r.startswith("text_too_short_")]
-    assert len(text_reasons) == 1
-    assert text_reasons[0] == "text_too_short_50"
-
-
-def test_pdp_low_confidence_text_threshold_boundary():
-    """PDP text threshold MIN_TEXT_LENGTH_PDP (100): below triggers, at or above does not."""
-    _, reasons_below = evaluate_low_confidence_pdp(
-        has_h1=True,
-        has_primary_cta=True,
-        has_price=True,
-        has_add_to_cart=True,
-        visible_text_length=99,
-        screenshot_failed=False,
-        screenshot_blank=False,
-    )
-    assert any(r == "text_too_short_99" for r in reasons_below)
-
-    _, reasons_at = evaluate_low_confidence_pdp(
-        has_h1=True,
-        has_primary_cta=True,
-        has_price=True,
-        has_add_to_cart=True,
-        visible_text_length=100,
-        screenshot_failed=False,
-        screenshot_blank=False,
-    )
-    assert not any(r.startswith("text_too_short_") for r in reasons_at)
-
-    _, reasons_above = evaluate_low_confidence_pdp(
-        has_h1=True,
-        has_primary_cta=True,
-        has_price=True,
-        has_add_to_cart=True,
-        visible_text_length=101,
-        screenshot_failed=False,
-        screenshot_blank=False,
-    )
-    assert not any(r.startswith("text_too_short_") for r in reasons_above)
-
-
 def test_pdp_low_confidence_no_extra_reasons():
     """Only spec-defined PDP reasons appear."""
-    allowed = {
-        "missing_h1",
-        "missing_primary_cta",
-        "missing_price",
-        "missing_add_to_cart",
-        "screenshot_failed",
-        "screenshot_blank",
-    }
-    _, reasons = evaluate_low_confidence_pdp(
-        has_h1=False,
-        has_primary_cta=False,
-        has_price=False,
-        has_add_to_cart=False,
-        visible_text_length=50,
-        screenshot_failed=True,
-        screenshot_blank=True,
+    _, reasons = evaluate_low_confidence_pdp(**_ALL_BAD)
+    unexpected = (
+        set(reasons) - _ALLOWED_PDP_REASONS - {f"text_too_short_{_ALL_BAD['visible_text_length']}"}
     )
-    for r in reasons:
-        if r.startswith("text_too_short_"):
-            continue
-        assert r in allowed, f"Unexpected reason: {r}"
+    assert not unexpected, f"Unexpected reasons: {sorted(unexpected)}"
@@ -4,35 +4,64 @@ Unit tests for PDP parsing helpers (parse_product_ldjson, pure functions).
 
 from __future__ import annotations
 
+from unittest.mock import patch
+
+import pytest
+
 from worker.crawl import parse_product_ldjson
+from worker.crawl.features import LDJSON_CACHE_MAX_CHARS
 
 
-def test_parse_product_ldjson_single_product():
-    content = '{"@type": "Product", "name": "Widget", "sku": "W1"}'
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        ('{"@type": "Product", "name": "Widget", "sku": "W1"}', {"name": "Widget", "sku": "W1"}),
+        (
+            '{"@type": "Product", "name": "Thing", "brand": {"@type": "Brand", "name": "Acme"}}',
+            {"name": "Thing", "brand": "Acme"},
+        ),
+        ('[{"@type": "Organization"}, {"@type": "Product", "name": "Item"}]', {"name": "Item"}),
+    ],
+    ids=["single_product", "with_brand", "array"],
+)
+def test_parse_product_ldjson(content: str, expected: dict):
     out = parse_product_ldjson(content)
-    assert out.get("name") == "Widget"
-    assert out.get("sku") == "W1"
+    for key, value in expected.items():
+        assert out.get(key) == value
 
 
-def test_parse_product_ldjson_with_brand():
-    content = '{"@type": "Product", "name": "Thing", "brand": {"@type": "Brand", "name": "Acme"}}'
-    out = parse_product_ldjson(content)
-    assert out.get("name") == "Thing"
-    assert out.get("brand") == "Acme"
+@pytest.mark.parametrize(
+    "content",
+    ['{"@type": "WebPage", "name": "Home"}', "not json"],
+    ids=["no_product", "invalid_json"],
+)
+def test_parse_product_ldjson_empty(content: str):
+    assert parse_product_ldjson(content) == {}
 
 
-def test_parse_product_ldjson_array():
-    content = '[{"@type": "Organization"}, {"@type": "Product", "name": "Item"}]'
-    out = parse_product_ldjson(content)
-    assert out.get("name") == "Item"
+def test_parse_product_ldjson_repeat_content_returns_fresh_dict():
+    """Memoized parse: repeated content gives equal results that callers can mutate safely."""
+    content = '{"@type": "Product", "name": "Cached", "sku": "C1"}'
+    first = parse_product_ldjson(content)
+    first["name"] = "mutated"
+    second = parse_product_ldjson(content)
+    assert second == {"name": "Cached", "sku": "C1"}
+    assert second is not first
 
 
-def test_parse_product_ldjson_no_product():
-    content = '{"@type": "WebPage", "name": "Home"}'
-    out = parse_product_ldjson(content)
-    assert out == {}
+def test_parse_product_ldjson_repeat_content_nested_values_are_not_shared():
+    """Mutating a nested value (offers) does not leak into later calls for the same content."""
+    content = '{"@type": "Product", "name": "Nested", "offers": {"price": "9.99"}}'
+    first = parse_product_ldjson(content)
+    first["offers"]["price"] = "0.00"
+    second = parse_product_ldjson(content)
+    assert second["offers"] == {"price": "9.99"}
 
 
-def test_parse_product_ldjson_invalid_json():
-    out = parse_product_ldjson("not json")
-    assert out == {}
+def test_parse_product_ldjson_large_content_is_not_cached():
+    """Blocks over LDJSON_CACHE_MAX_CHARS are parsed every time and never kept in the cache."""
+    description = "x" * LDJSON_CACHE_MAX_CHARS
+    content = f'{{"@type": "Product", "name": "Big", "description": "{description}"}}'
+    with patch("worker.crawl.features._parse_product_ldjson_cached") as cached:
+        assert parse_product_ldjson(content) == {"name": "Big"}
+    cached.assert_not_called()
@@ -7,129 +7,60 @@ schema.org detection, title+image detection, and the current validation rule.
 
 from __future__ import annotations
 
+import asyncio
+import itertools
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from worker.crawl import (
     PRICE_PATTERN,
+    build_pdp_validation_signals,
     evaluate_pdp_validation_signals,
     extract_pdp_validation_signals,
     is_valid_pdp_page,
 )
-
-
-def test_evaluate_pdp_validation_signals_valid_base_plus_add_to_cart():
-    """Valid: price + title+image + add-to-cart (no schema)."""
-    valid, base_met, strong_met = evaluate_pdp_validation_signals(
-        has_price=True,
-        has_add_to_cart=True,
-        has_product_schema=False,
-        has_title_and_image=True,
-    )
-    assert valid is True
-    assert base_met is True
-    assert strong_met is True
-
-
-def test_evaluate_pdp_validation_signals_valid_base_plus_schema():
-    """Valid: price + title+image + product schema (no add-to-cart)."""
-    valid, base_met, strong_met = evaluate_pdp_validation_signals(
-        has_price=True,
-        has_add_to_cart=False,
-        has_product_schema=True,
-        has_title_and_image=True,
-    )
-    assert valid is True
-    assert base_met is True
-    assert strong_met is True
-
-
-def test_evaluate_pdp_validation_signals_valid_base_only():
-    """Valid: price + title+image only (no strong signal)."""
-    valid, base_met, strong_met = evaluate_pdp_validation_signals(
-        has_price=True,
-        has_add_to_cart=False,
-        has_product_schema=False,
-        has_title_and_image=True,
-    )
-    assert valid is True
-    assert base_met is True
-    assert strong_met is False
-
-
-def test_evaluate_pdp_validation_signals_invalid_strong_only():
-    """Invalid: add-to-cart + schema but missing base (no price or no title+image)."""
-    valid, base_met, strong_met = evaluate_pdp_validation_signals(
-        has_price=False,
-        has_add_to_cart=True,
-        has_product_schema=True,
-        has_title_and_image=False,
-    )
-    assert valid is False
-    assert base_met is False
-    assert strong_met is True
-
-
-def test_evaluate_pdp_validation_signals_zero_met():
-    valid, base_met, strong_met = evaluate_pdp_validation_signals(
-        has_price=False,
-        has_add_to_cart=False,
-        has_product_schema=False,
-        has_title_and_image=False,
-    )
-    assert valid is False
-    assert base_met is False
-    assert strong_met is False
-
-
-def test_evaluate_pdp_validation_signals_four_met():
-    """Valid: all four signals (base + both strong)."""
-    valid, base_met, strong_met = evaluate_pdp_validation_signals(
-        has_price=True,
-        has_add_to_cart=True,
-        has_product_schema=True,
-        has_title_and_image=True,
-    )
-    assert valid is True
-    assert base_met is True
-    assert strong_met is True
-
-
-def test_is_valid_pdp_page_dict():
-    # Valid: base (price + title+image) + add-to-cart
-    assert (
-        is_valid_pdp_page(
-            {
-                "has_price": True,
-                "has_add_to_cart": True,
-                "has_product_schema": False,
-                "has_title_and_image": True,
-            }
-        )
-        is True
-    )
-    # Invalid: price only (missing title+image)
-    assert (
-        is_valid_pdp_page(
-            {
-                "has_price": True,
-                "has_add_to_cart": False,
-                "has_product_schema": False,
-                "has_title_and_image": False,
-            }
-        )
-        is False
-    )
-    # Valid: base + product schema
+from worker.crawl.pdp_validation import PDP_BODY_TIMEOUT_MS
+
+
+@pytest.mark.parametrize(
+    "price,cart,schema,title_img,expected",
+    [
+        # Valid: price + title+image, with or without strong signals
+        (True, True, False, True, (True, True, True)),
+        (True, False, True, True, (True, True, True)),
+        (True, False, False, True, (True, True, False)),
+        (True, True, True, True, (True, True, True)),
+        # Invalid: strong signals alone never make up for missing base
+        (False, True, True, False, (False, False, True)),
+        (False, False, False, False, (False, False, False)),
+    ],
+    ids=[
+        "base_plus_add_to_cart",
+        "base_plus_schema",
+        "base_only",
+        "four_met",
+        "strong_only",
+        "zero_met",
+    ],
+)
+def test_evaluate_pdp_validation_signals(
+    price: bool,
+    cart: bool,
+    schema: bool,
+    title_img: bool,
+    expected: tuple[bool, bool, bool],
+):
+    """Returns (valid, base_met, strong_met); valid iff base (price + title+image)."""
     assert (
-        is_valid_pdp_page(
-            {
-                "has_price": True,
-                "has_add_to_cart": False,
-                "has_product_schema": True,
-                "has_title_and_image": True,
-            }
+        evaluate_pdp_validation_signals(
+            has_price=price,
+            has_add_to_cart=cart,
+            has_product_schema=schema,
+            has_title_and_image=title_img,
         )
-        is True
+        == expected
     )
 
 
@@ -167,363 +98,255 @@ def test_price_pattern_no_match():
     assert PRICE_PATTERN.search("Quantity: 5") is None
 
 
-# --- Signal extraction (async; requires page) ---
-
-
-@pytest.mark.asyncio
-async def test_extract_signals_price_via_regex():
-    """Price detected from body text via PRICE_PATTERN."""
-    from playwright.async_api import async_playwright
-
-    html = """<!DOCTYPE html><html><body><p>Product $29.99</p></body></html>"""
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
-    assert signals["has_price"] is True
-
-
-@pytest.mark.asyncio
-async def test_extract_signals_price_via_selector_fallback():
-    """Price detected via selector when body text has no regex match."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html><html><body>
-    <p>No currency in text</p>
-    <span class="product-price">x</span>
-    </body></html>
-    """
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
-    assert signals["has_price"] is True
-
-
-@pytest.mark.asyncio
-async def test_extract_signals_price_via_data_price():
-    """Price detected via [data-price] selector fallback."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html><html><body>
-    <span data-price="19.99">19.99</span>
-    </body></html>
-    """
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
-    assert signals["has_price"] is True
-
-
-@pytest.mark.asyncio
-async def test_extract_signals_add_to_cart_button_text():
-    """Add-to-cart detected via button text selectors."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html><html><body>
-    <button>Add to Cart</button>
-    </body></html>
-    """
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
-    assert signals["has_add_to_cart"] is True
-
-
-@pytest.mark.asyncio
-async def test_extract_signals_add_to_cart_name_attribute():
-    """Add-to-cart detected via [name="add-to-cart"]."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html><html><body>
-    <input type="submit" name="add-to-cart" value="Add" />
-    </body></html>
-    """
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
-    assert signals["has_add_to_cart"] is True
-
-
-@pytest.mark.asyncio
-async def test_extract_signals_add_to_cart_class():
-    """Add-to-cart detected via class addToCart."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html><html><body>
-    <button class="btn addToCart">Add</button>
-    </body></html>
-    """
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
-    assert signals["has_add_to_cart"] is True
-
-
-@pytest.mark.asyncio
-async def test_extract_signals_schema_org_product():
-    """Product schema.org JSON-LD sets has_product_schema."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html><html><head>
-    <script type="application/ld+json">
-    {"@type": "Product", "name": "Widget", "sku": "123"}
-    </script>
-    </head><body></body></html>
-    """
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
-    assert signals["has_product_schema"] is True
-
-
-@pytest.mark.asyncio
-async def test_extract_signals_schema_org_no_product():
-    """Non-Product JSON-LD does not set has_product_schema."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html><html><head>
-    <script type="application/ld+json">
-    {"@type": "WebPage", "name": "Home"}
-    </script>
-    </head><body></body></html>
-    """
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
-    assert signals["has_product_schema"] is False
-
-
-@pytest.mark.asyncio
-async def test_extract_signals_title_and_image_h1_and_img():
-    """Title+image detected when h1 and img present."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html><html><body>
-    <h1>Product Name</h1>
-    <img src="product.jpg" alt="Product" />
-    </body></html>
-    """
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
-    assert signals["has_title_and_image"] is True
-
-
-@pytest.mark.asyncio
-async def test_extract_signals_title_and_image_product_title_selector():
-    """Title+image detected via product-title class and img."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html><html><body>
-    <span class="product-title">Widget</span>
-    <img src="w.jpg" alt="W" />
-    </body></html>
-    """
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
-    assert signals["has_title_and_image"] is True
-
-
-@pytest.mark.asyncio
-async def test_extract_signals_title_and_image_fails_without_image():
-    """Title+image is False when no img present."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html><html><body>
-    <h1>Product Name</h1>
-    </body></html>
-    """
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
-    assert signals["has_title_and_image"] is False
-
-
-@pytest.mark.asyncio
-async def test_extract_signals_title_and_image_fails_without_title():
-    """Title+image is False when no h1 or product title."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html><html><body>
-    <img src="x.jpg" alt="X" />
-    </body></html>
-    """
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
-    assert signals["has_title_and_image"] is False
+# --- Signal building from page facts (pure; no browser) ---
+
+_NO_FACTS = {
+    "body_text": "",
+    "has_price_element": False,
+    "has_add_to_cart": False,
+    "has_product_schema": False,
+    "has_title": False,
+    "has_image": False,
+}
+
+
+@pytest.mark.parametrize(
+    "facts,key",
+    [
+        ({"body_text": "Product $29.99"}, "has_price"),
+        ({"body_text": "No currency in text", "has_price_element": True}, "has_price"),
+        ({"has_add_to_cart": True}, "has_add_to_cart"),
+        ({"has_product_schema": True}, "has_product_schema"),
+        ({"has_title": True, "has_image": True}, "has_title_and_image"),
+    ],
+    ids=[
+        "price_regex",
+        "price_element",
+        "add_to_cart",
+        "product_schema",
+        "title_and_image",
+    ],
+)
+def test_build_pdp_validation_signals_sets_only_its_signal(facts: dict, key: str):
+    signals = build_pdp_validation_signals(**{**_NO_FACTS, **facts})
+    assert signals == {k: k == key for k in signals}
+
+
+@pytest.mark.parametrize(
+    "facts",
+    [
+        {"body_text": "Quantity: 5"},
+        {"has_title": True},
+        {"has_image": True},
+        {},
+    ],
+    ids=["no_currency", "title_only", "image_only", "empty"],
+)
+def test_build_pdp_validation_signals_all_false(facts: dict):
+    signals = build_pdp_validation_signals(**{**_NO_FACTS, **facts})
+    assert not any(signals.values())
+
+
+# --- Signal extraction wrapper (mocked page) ---
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_extract_signals_single_evaluate_round_trip():
+    """All page facts come from one page.evaluate; the pure builder decides the signals."""
+    page = MagicMock()
+    page.wait_for_selector = AsyncMock()
+    page.evaluate = AsyncMock(
+        return_value={
+            "bodyText": "Widget $29.99",
+            "hasPriceElement": False,
+            "hasAddToCart": True,
+            "hasProductSchema": True,
+            "hasTitle": True,
+            "hasImage": False,
+        }
+    )
+    signals = await extract_pdp_validation_signals(page)
+    assert signals == {
+        "has_price": True,
+        "has_add_to_cart": True,
+        "has_product_schema": True,
+        "has_title_and_image": False,
+    }
+    page.wait_for_selector.assert_awaited_once_with(
+        "body", state="attached", timeout=PDP_BODY_TIMEOUT_MS
+    )
+    assert page.evaluate.await_count == 1
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_extract_signals_evaluate_failure_returns_all_false():
+    page = MagicMock()
+    page.wait_for_selector = AsyncMock()
+    page.evaluate = AsyncMock(side_effect=RuntimeError("Target closed"))
+    signals = await extract_pdp_validation_signals(page)
+    assert signals == {
+        "has_price": False,
+        "has_add_to_cart": False,
+        "has_product_schema": False,
+        "has_title_and_image": False,
+    }
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_extract_signals_body_wait_timeout_returns_all_false_without_evaluate():
+    """No <body> within the timeout: nothing is read from the page."""
+    page = MagicMock()
+    page.wait_for_selector = AsyncMock(side_effect=PlaywrightTimeoutError("Timeout 5000ms"))
+    page.evaluate = AsyncMock()
+    signals = await extract_pdp_validation_signals(page)
+    assert not any(signals.values())
+    page.evaluate.assert_not_awaited()
+
+
+# --- Signal extraction (async; real Chromium via the shared session browser) ---
+
+# Standards-mode page around each case's body markup; cases store only what they are about.
+_HTML_SHELL = "<!DOCTYPE html><html><body>{}</body></html>"
+
+
+@pytest.mark.playwright
+@pytest.mark.asyncio(scope="session")
+@pytest.mark.parametrize(
+    "body,key,expected",
+    [
+        # Price detected from body text via PRICE_PATTERN.
+        ("<p>Product $29.99</p>", "has_price", True),
+        # Price detected via selector when body text has no regex match.
+        ('<p>No currency in text</p><span class="product-price">x</span>', "has_price", True),
+        # Price detected via [data-price] selector fallback.
+        ('<span data-price="19.99">19.99</span>', "has_price", True),
+        # Add-to-cart detected via button text selectors.
+        ("<button>Add to Cart</button>", "has_add_to_cart", True),
+        # Add-to-cart detected via [name="add-to-cart"].
+        ('<input type="submit" name="add-to-cart" value="Add" />', "has_add_to_cart", True),
+        # Add-to-cart detected via class addToCart.
+        ('<button class="btn addToCart">Add</button>', "has_add_to_cart", True),
+        # Product schema.org JSON-LD sets has_product_schema.
+        (
+            '<script type="application/ld+json">{"@type": "Product", "name": "Widget"}</script>',
+            "has_product_schema",
+            True,
+        ),
+        # Any JSON-LD block may carry the Product, not only the first.
+        (
+            '<script type="application/ld+json">{"@type": "Organization"}</script>'
+            '<script type="application/ld+json">[{"@type": "Product"}]</script>',
+            "has_product_schema",
+            True,
+        ),
+        # Non-Product JSON-LD does not set has_product_schema.
+        (
+            '<script type="application/ld+json">{"@type": "WebPage", "name": "Home"}</script>',
+            "has_product_schema",
+            False,
+        ),
+        # Title+image detected when h1 and img present.
+        (
+            '<h1>Product Name</h1><img src="product.jpg" alt="Product" />',
+            "has_title_and_image",
+            True,
+        ),
+        # Title+image detected via product-title class and img.
+        (
+            '<span class="product-title">Widget</span><img src="w.jpg" alt="W" />',
+            "has_title_and_image",
+            True,
+        ),
+        # Title+image is False when no img present.
+        ("<h1>Product Name</h1>", "has_title_and_image", False),
+        # Title+image is False when no h1 or product title.
+        ('<img src="x.jpg" alt="X" />', "has_title_and_image", False),
+        # Open shadow roots are searched, as page.locator() does.
+        (
+            '<x-price><template shadowrootmode="open"><span class="price">x</span>'
+            "</template></x-price>",
+            "has_price",
+            True,
+        ),
+        (
+            '<x-buy><template shadowrootmode="open"><button>Add to Bag</button></template></x-buy>',
+            "has_add_to_cart",
+            True,
+        ),
+        # Button text includes the button's own shadow content but not script/style text.
+        (
+            '<button><x-label><template shadowrootmode="open">Buy now</template></x-label>'
+            "</button>",
+            "has_add_to_cart",
+            True,
+        ),
+        ("<button><style>/* add to cart */</style>Add</button>", "has_add_to_cart", False),
+        (
+            '<x-title><template shadowrootmode="open"><h1>Widget</h1><img src="w.jpg" />'
+            "</template></x-title>",
+            "has_title_and_image",
+            True,
+        ),
+    ],
+    ids=[
+        "price_via_regex",
+        "price_via_selector_fallback",
+        "price_via_data_price",
+        "add_to_cart_button_text",
+        "add_to_cart_name_attribute",
+        "add_to_cart_class",
+        "schema_org_product",
+        "schema_org_second_block",
+        "schema_org_no_product",
+        "title_and_image_h1_and_img",
+        "title_and_image_product_title_selector",
+        "title_and_image_fails_without_image",
+        "title_and_image_fails_without_title",
+        "price_in_shadow_root",
+        "add_to_cart_button_in_shadow_root",
+        "add_to_cart_button_text_in_shadow_root",
+        "add_to_cart_button_ignores_style_text",
+        "title_and_image_in_shadow_root",
+    ],
+)
+async def test_extract_signals(page, body: str, key: str, expected: bool):
+    """Each selector/text rule sets (or leaves unset) its own signal on a real page."""
+    await page.set_content(_HTML_SHELL.format(body), wait_until="domcontentloaded")
+    signals = await extract_pdp_validation_signals(page)
+    assert signals[key] is expected
 
 
 # --- Validation rule edge cases: price + title+image ---
 
 
-def _expected_valid(price: bool, cart: bool, schema: bool, title_img: bool) -> bool:
-    """Valid iff base (price + title+image)."""
-    base = price and title_img
-    return base
-
-
-def test_evaluate_pdp_validation_signals_all_combinations():
-    """Test all 16 combinations for base-only rule."""
-    for price in (False, True):
-        for cart in (False, True):
-            for schema in (False, True):
-                for title_img in (False, True):
-                    valid, base_met, strong_met = evaluate_pdp_validation_signals(
-                        has_price=price,
-                        has_add_to_cart=cart,
-                        has_product_schema=schema,
-                        has_title_and_image=title_img,
-                    )
-                    expected = _expected_valid(price, cart, schema, title_img)
-                    assert valid == expected, (
-                        f"price={price} cart={cart} schema={schema} title_img={title_img}"
-                    )
-                    assert base_met == (price and title_img)
-                    assert strong_met == (cart or schema)
-
-
-def test_evaluate_pdp_validation_signals_boundary():
-    """Boundary: base only is valid; missing base is invalid."""
-    # Base met, no strong signal -> valid
-    valid_1, base_1, strong_1 = evaluate_pdp_validation_signals(
-        has_price=True,
-        has_add_to_cart=False,
-        has_product_schema=False,
-        has_title_and_image=True,
-    )
-    assert valid_1 is True
-    assert base_1 is True
-    assert strong_1 is False
-
-    # Missing base -> invalid
-    valid_2, base_2, strong_2 = evaluate_pdp_validation_signals(
-        has_price=False,
-        has_add_to_cart=True,
-        has_product_schema=True,
-        has_title_and_image=False,
-    )
-    assert valid_2 is False
-    assert base_2 is False
-    assert strong_2 is True
+_SIGNAL_KEYS = ("has_price", "has_add_to_cart", "has_product_schema", "has_title_and_image")
 
 
-def test_is_valid_pdp_page_all_signal_combinations():
-    """Test is_valid_pdp_page wrapper with various signal dicts."""
-    # Valid: base + add-to-cart
-    assert (
-        is_valid_pdp_page(
-            {
-                "has_price": True,
-                "has_add_to_cart": True,
-                "has_product_schema": False,
-                "has_title_and_image": True,
-            }
-        )
-        is True
-    )
+@pytest.mark.parametrize(
+    "flags",
+    list(itertools.product((False, True), repeat=4)),
+    ids=lambda flags: "".join("1" if f else "0" for f in flags),
+)
+def test_pdp_validation_all_signal_combinations(flags: tuple[bool, bool, bool, bool]):
+    """All 16 signal states: valid iff base (price + title+image); wrapper agrees."""
+    price, cart, schema, title_img = flags
+    signals = dict(zip(_SIGNAL_KEYS, flags))
 
-    # Valid: base + product schema
-    assert (
-        is_valid_pdp_page(
-            {
-                "has_price": True,
-                "has_add_to_cart": False,
-                "has_product_schema": True,
-                "has_title_and_image": True,
-            }
-        )
-        is True
-    )
+    valid, base_met, strong_met = evaluate_pdp_validation_signals(**signals)
 
-    # Invalid: title+image only (no price, no strong signal)
-    assert (
-        is_valid_pdp_page(
-            {
-                "has_price": False,
-                "has_add_to_cart": False,
-                "has_product_schema": False,
-                "has_title_and_image": True,
-            }
-        )
-        is False
-    )
+    assert base_met == (price and title_img)
+    assert strong_met == (cart or schema)
+    assert valid == base_met
+    assert is_valid_pdp_page(signals) is base_met
 
-    # Valid: base only (no strong signal)
-    assert (
-        is_valid_pdp_page(
-            {
-                "has_price": True,
-                "has_add_to_cart": False,
-                "has_product_schema": False,
-                "has_title_and_image": True,
-            }
-        )
-        is True
-    )
 
-    # Invalid: 0 signals
-    assert (
-        is_valid_pdp_page(
-            {
-                "has_price": False,
-                "has_add_to_cart": False,
-                "has_product_schema": False,
-                "has_title_and_image": False,
-            }
-        )
-        is False
-    )
+# --- Price pattern edge cases ---
 
 
-# --- Price pattern edge cases ---
+def test_price_pattern_long_digit_run_is_linear():
+    """A long digit run without currency fails fast (was quadratic: ~5s for 20k digits)."""
+    assert PRICE_PATTERN.search("9" * 20_000) is None
+    assert PRICE_PATTERN.search("9" * 20_000 + " $").group() == "9" * 20_000 + " $"
 
 
 def test_price_pattern_decimal_separator_variations():
@@ -555,13 +378,11 @@ def test_price_pattern_whitespace_variations():
 # --- Signal extraction determinism ---
 
 
-@pytest.mark.asyncio
-async def test_extract_signals_deterministic():
+@pytest.mark.playwright
+@pytest.mark.asyncio(scope="session")
+async def test_extract_signals_deterministic(page):
     """Signal extraction produces consistent results across runs."""
-    from playwright.async_api import async_playwright
-
-    html = """
-    <!DOCTYPE html><html><body>
+    body = """
     <h1>Product Name</h1>
     <p>Price: $29.99</p>
     <button>Add to Cart</button>
@@ -569,20 +390,14 @@ async def test_extract_signals_deterministic():
     <script type="application/ld+json">
     {"@type": "Product", "name": "Widget"}
     </script>
-    </body></html>
     """
 
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-
-        # Extract signals multiple times
-        signals1 = await extract_pdp_validation_signals(page)
-        signals2 = await extract_pdp_validation_signals(page)
-        signals3 = await extract_pdp_validation_signals(page)
+    await page.set_content(_HTML_SHELL.format(body), wait_until="domcontentloaded")
 
-        await browser.close()
+    # Extract signals multiple times (concurrently; each is a single page.evaluate)
+    signals1, signals2, signals3 = await asyncio.gather(
+        *(extract_pdp_validation_signals(page) for _ in range(3))
+    )
 
     # All runs produce identical results
     assert signals1 == signals2 == signals3
@@ -592,19 +407,12 @@ async def test_extract_signals_deterministic():
     assert signals1["has_title_and_image"] is True
 
 
-@pytest.mark.asyncio
-async def test_extract_signals_all_false():
+@pytest.mark.playwright
+@pytest.mark.asyncio(scope="session")
+async def test_extract_signals_all_false(page):
     """Signal extraction with no matching elements returns all False."""
-    from playwright.async_api import async_playwright
-
-    html = """<!DOCTYPE html><html><body><p>Empty page</p></body></html>"""
-
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(html, wait_until="domcontentloaded")
-        signals = await extract_pdp_validation_signals(page)
-        await browser.close()
+    await page.set_content(_HTML_SHELL.format("<p>Empty page</p>"), wait_until="domcontentloaded")
+    signals = await extract_pdp_validation_signals(page)
 
     assert signals["has_price"] is False
     assert signals["has_add_to_cart"] is False
@@ -20,7 +20,7 @@ from worker.storage import write_jsonl
 
 
 def _config(artifacts_dir: str) -> SimpleNamespace:
-    return SimpleNamespace(artifacts_dir=artifacts_dir)
+    return SimpleNamespace(artifacts_dir=artifacts_dir, artifact_checksum_algo="md5")
 
 
 def test_save_session_logs_success_writes_jsonl_and_creates_artifact():
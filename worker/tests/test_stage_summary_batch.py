@@ -0,0 +1,292 @@
+"""
+Tests for stage summary Batch API support: pending submission and poll-and-save.
+"""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from worker.jobs import process_stage_summary_batch_job
+from worker.stage_summary_generator import (
+    BATCH_COMPLETION_WINDOW,
+    BATCH_ENDPOINT,
+    BATCH_POLL_INTERVAL_SECONDS,
+    BATCH_STATUS_COMPLETED,
+    BATCH_STATUS_FAILED,
+    BATCH_STATUS_PENDING,
+    generate_stage_summaries,
+    generate_stage_summary,
+    poll_and_save_batch,
+)
+
+
+def _repo() -> MagicMock:
+    repo = MagicMock()
+    repo.get_pages_by_session_id.return_value = [
+        {"page_type": "homepage", "status": "ok"},
+    ]
+    repo.get_session_by_id.return_value = {"functional_flow_score": 5}
+    return repo
+
+
+def _summaries_repo(session_id) -> MagicMock:
+    """Repository with one failed Awareness question; the other stages have no questions."""
+    repo = _repo()
+    repo.get_session_by_id.return_value = {
+        "url": "https://www.example.com",
+        "functional_flow_score": 5,
+    }
+    repo.list_questions.return_value = [
+        {"question_id": "q1", "question": "Clear headline?", "category": "Awareness", "tier": 1}
+    ]
+    repo.get_audit_results_by_session_id.return_value = [
+        {"question_id": "q1", "result": "fail", "reason": "No headline"}
+    ]
+    return repo
+
+
+def _batch_client(batch_id: str = "batch_123") -> MagicMock:
+    client = MagicMock()
+    client.files.create.return_value = SimpleNamespace(id="file_in")
+    client.batches.create.return_value = SimpleNamespace(id=batch_id)
+    return client
+
+
+def _output_line(custom_id: str, content: str, status_code: int = 200) -> str:
+    return json.dumps(
+        {
+            "custom_id": custom_id,
+            "response": {
+                "status_code": status_code,
+                "body": {
+                    "model": "gpt-5.2",
+                    "choices": [{"message": {"content": content}}],
+                    "usage": {"prompt_tokens": 1000, "completion_tokens": 100},
+                },
+            },
+            "error": None,
+        }
+    )
+
+
+def test_generate_stage_summary_batch_mode_returns_pending_request_without_api_call():
+    """batch_mode skips the API call and returns the JSONL request keyed by session:stage."""
+    session_id = uuid4()
+    questions = [
+        {"result": "fail", "tier": 1, "severity": 3, "question": "Clear headline?"},
+        {"result": "pass", "tier": 1, "severity": 1, "question": "Logo visible?"},
+    ]
+    with (
+        patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}),
+        patch("worker.stage_summary_generator.OpenAI") as openai_cls,
+    ):
+        summary = generate_stage_summary(
+            "Awareness", questions, "https://example.com", session_id, _repo(), batch_mode=True
+        )
+
+    openai_cls.assert_not_called()
+    request = summary["batch_request"]
+    assert request["custom_id"] == f"{session_id}:Awareness"
+    assert request["url"] == BATCH_ENDPOINT
+    assert request["body"]["model"] == "gpt-5.2"
+    assert "pending" in summary["summary"].lower()
+
+
+def test_generate_stage_summaries_batch_mode_submits_saves_placeholders_and_enqueues_poll():
+    """Pending stages are uploaded as one batch, saved with its ID and a poll is enqueued."""
+    session_id = uuid4()
+    repo = _summaries_repo(session_id)
+    client = _batch_client()
+    with (
+        patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}),
+        patch("worker.stage_summary_generator.OpenAI", return_value=client),
+        patch("worker.stage_summary_generator.enqueue_stage_summary_batch_job") as enqueue,
+    ):
+        summaries = generate_stage_summaries(session_id, repo, batch_mode=True)
+
+    repo.get_audit_results_by_session_id.assert_called_once_with(f"example.com__{session_id}")
+    create_kw = client.files.create.call_args.kwargs
+    assert create_kw["purpose"] == "batch"
+    lines = create_kw["file"][1].getvalue().decode("utf-8").splitlines()
+    assert [json.loads(line)["custom_id"] for line in lines] == [f"{session_id}:Awareness"]
+    client.batches.create.assert_called_once_with(
+        input_file_id="file_in",
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW,
+    )
+
+    saved = {c.kwargs["stage"]: c.kwargs for c in repo.save_stage_summary.call_args_list}
+    assert saved["Awareness"]["batch_id"] == "batch_123"
+    assert "pending" in saved["Awareness"]["summary"].lower()
+    assert saved["Consideration"]["batch_id"] is None
+    assert saved["Conversion"]["batch_id"] is None
+    enqueue.assert_called_once_with("batch_123", delay_seconds=BATCH_POLL_INTERVAL_SECONDS)
+    assert [s.get("batch_id") for s in summaries] == ["batch_123", None, None]
+    repo.delete_batch_stage_summaries.assert_not_called()
+
+
+def test_generate_stage_summaries_batch_enqueue_failure_clears_placeholders():
+    """If the poll job cannot be enqueued, nothing would collect the batch: drop placeholders."""
+    session_id = uuid4()
+    repo = _summaries_repo(session_id)
+    with (
+        patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}),
+        patch("worker.stage_summary_generator.OpenAI", return_value=_batch_client()),
+        patch(
+            "worker.stage_summary_generator.enqueue_stage_summary_batch_job",
+            side_effect=ValueError("REDIS_URL is not configured"),
+        ),
+    ):
+        generate_stage_summaries(session_id, repo, batch_mode=True)
+
+    repo.delete_batch_stage_summaries.assert_called_once_with("batch_123", keep_stages=[])
+
+
+@pytest.mark.parametrize(
+    "status,requeued",
+    [(BATCH_STATUS_PENDING, True), (BATCH_STATUS_COMPLETED, False), (BATCH_STATUS_FAILED, False)],
+)
+def test_process_stage_summary_batch_job_requeues_only_while_pending(status: str, requeued: bool):
+    """The poll job enqueues itself again with a delay until the batch has ended."""
+    result = {"status": status, "saved": [], "cleared_count": 0}
+    with (
+        patch("worker.jobs.get_db_session"),
+        patch("worker.jobs.AuditRepository"),
+        patch("worker.stage_summary_generator.poll_and_save_batch", return_value=result),
+        patch("worker.job_queue.enqueue_stage_summary_batch_job") as enqueue,
+    ):
+        assert process_stage_summary_batch_job("batch_123") == status
+
+    if requeued:
+        enqueue.assert_called_once_with("batch_123", delay_seconds=BATCH_POLL_INTERVAL_SECONDS)
+    else:
+        enqueue.assert_not_called()
+
+
+def test_poll_and_save_batch_pending_returns_pending_status():
+    """A batch still in progress saves nothing, clears nothing and reports pending."""
+    client = MagicMock()
+    client.batches.retrieve.return_value = SimpleNamespace(
+        status="in_progress", output_file_id=None
+    )
+    repo = MagicMock()
+    with (
+        patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}),
+        patch("worker.stage_summary_generator.OpenAI", return_value=client),
+    ):
+        result = poll_and_save_batch("batch_123", repo)
+
+    assert result == {"status": BATCH_STATUS_PENDING, "saved": [], "cleared_count": 0}
+    client.files.content.assert_not_called()
+    repo.save_stage_summary.assert_not_called()
+    repo.delete_batch_stage_summaries.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "status,output_file_id",
+    [("failed", None), ("expired", None), ("cancelled", None), ("completed", None)],
+    ids=["failed", "expired", "cancelled", "completed_without_output"],
+)
+def test_poll_and_save_batch_ended_without_output_is_terminal_and_clears_placeholders(
+    status: str, output_file_id: str | None
+):
+    """A batch that can no longer produce output reports failed and drops its placeholders."""
+    client = MagicMock()
+    client.batches.retrieve.return_value = SimpleNamespace(
+        status=status, output_file_id=output_file_id
+    )
+    repo = MagicMock()
+    repo.delete_batch_stage_summaries.return_value = 3
+    with (
+        patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}),
+        patch("worker.stage_summary_generator.OpenAI", return_value=client),
+    ):
+        result = poll_and_save_batch("batch_123", repo)
+
+    assert result == {"status": BATCH_STATUS_FAILED, "saved": [], "cleared_count": 3}
+    repo.delete_batch_stage_summaries.assert_called_once_with("batch_123", keep_stages=[])
+    repo.save_stage_summary.assert_not_called()
+
+
+def test_poll_and_save_batch_completed_saves_each_successful_line():
+    """Completed output is saved line by line; failed items' placeholders are cleared."""
+    session_id = uuid4()
+    client = MagicMock()
+    client.batches.retrieve.return_value = SimpleNamespace(
+        status="completed", output_file_id="file_out"
+    )
+    client.files.content.return_value = SimpleNamespace(
+        text="\n".join(
+            [
+                _output_line(f"{session_id}:Awareness", " Awareness summary. "),
+                _output_line(f"{session_id}:Conversion", "", status_code=500),
+            ]
+        )
+    )
+    repo = MagicMock()
+    with (
+        patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}),
+        patch("worker.stage_summary_generator.OpenAI", return_value=client),
+    ):
+        result = poll_and_save_batch("batch_123", repo)
+
+    client.files.content.assert_called_once_with("file_out")
+    assert result["status"] == BATCH_STATUS_COMPLETED
+    assert [s["stage"] for s in result["saved"]] == ["Awareness"]
+    repo.delete_batch_stage_summaries.assert_called_once_with(
+        "batch_123", keep_stages=["Awareness"]
+    )
+    repo.save_stage_summary.assert_called_once()
+    call_kw = repo.save_stage_summary.call_args.kwargs
+    assert call_kw["session_id"] == session_id
+    assert call_kw["stage"] == "Awareness"
+    assert call_kw["summary"] == "Awareness summary."
+    assert call_kw["batch_id"] == "batch_123"
+    assert call_kw["token_usage"] == {"input_tokens": 1000, "output_tokens": 100}
+
+
+def test_poll_and_save_batch_skips_malformed_lines_and_still_clears_placeholders():
+    """Bad JSON, error bodies, null content and bad custom_ids are skipped, not raised."""
+    session_id = uuid4()
+    error_body = json.dumps(
+        {
+            "custom_id": f"{session_id}:Awareness",
+            "response": {"status_code": 200, "body": {"error": {"message": "boom"}}},
+            "error": None,
+        }
+    )
+    null_content = _output_line(f"{session_id}:Conversion", "").replace('""', "null")
+    client = MagicMock()
+    client.batches.retrieve.return_value = SimpleNamespace(
+        status="completed", output_file_id="file_out"
+    )
+    client.files.content.return_value = SimpleNamespace(
+        text="\n".join(
+            [
+                "{not json",
+                error_body,
+                null_content,
+                _output_line("not-a-uuid:Awareness", "Orphan summary."),
+                _output_line(f"{session_id}:Consideration", "Consideration summary."),
+            ]
+        )
+    )
+    repo = MagicMock()
+    with (
+        patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}),
+        patch("worker.stage_summary_generator.OpenAI", return_value=client),
+    ):
+        result = poll_and_save_batch("batch_123", repo)
+
+    assert result["status"] == BATCH_STATUS_COMPLETED
+    assert [s["stage"] for s in result["saved"]] == ["Consideration"]
+    repo.save_stage_summary.assert_called_once()
+    assert repo.save_stage_summary.call_args.kwargs["session_id"] == session_id
+    repo.delete_batch_stage_summaries.assert_called_once_with(
+        "batch_123", keep_stages=["Consideration"]
+    )
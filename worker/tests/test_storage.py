@@ -7,7 +7,11 @@ Session-level: {domain}__{session_id}/session_logs.jsonl
 
 from __future__ import annotations
 
+import gzip
+import hashlib
+import json
 from pathlib import Path
+from unittest.mock import patch
 from uuid import uuid4
 
 from shared.config import get_config
@@ -15,6 +19,13 @@ from worker.storage import (
     build_artifact_path,
     build_excel_rubric_artifact_path,
     build_session_log_artifact_path,
+    compute_checksum,
+    ensure_artifact_dir,
+    get_storage_uri,
+    write_html_gz,
+    write_json,
+    write_screenshot,
+    write_text,
 )
 
 DOMAIN = "example.com"
@@ -379,3 +390,90 @@ def test_build_excel_rubric_artifact_path_deterministic():
     p1 = build_excel_rubric_artifact_path(DOMAIN, session_id)
     p2 = build_excel_rubric_artifact_path(DOMAIN, session_id)
     assert p1 == p2
+
+
+def test_write_json_round_trip_size_and_checksum(tmp_path):
+    """write_json output parses back to the input; size/checksum match the file on disk."""
+    path = tmp_path / "nested" / "features_json.json"
+    data = {"title": "Caf\u00e9 \u2615", "count": 3, "items": [1, 2.5, None, True]}
+
+    size, checksum = write_json(path, data)
+
+    raw = path.read_bytes()
+    assert json.loads(raw.decode("utf-8")) == data
+    assert "Caf\u00e9" in raw.decode("utf-8")
+    assert raw.startswith(b'{\n  "title"')
+    assert size == len(raw)
+    assert checksum == hashlib.md5(raw).hexdigest()
+
+
+def test_write_screenshot_multi_chunk_size_and_checksum(tmp_path):
+    """Payloads larger than one write slice are written intact and hashed in the same pass."""
+    path = tmp_path / "screenshot.png"
+    data = bytes(range(256)) * 4097  # ~1 MiB, not a multiple of the slice size
+
+    size, checksum = write_screenshot(path, data)
+
+    assert path.read_bytes() == data
+    assert size == len(data)
+    assert checksum == hashlib.md5(data).hexdigest()
+
+
+def test_write_screenshot_blake2b_checksum_is_prefixed_when_configured(tmp_path, monkeypatch):
+    """ARTIFACT_CHECKSUM_ALGO=blake2b stores "blake2b:<hex>" so rows record the algorithm."""
+    monkeypatch.setenv("ARTIFACT_CHECKSUM_ALGO", "blake2b")
+    data = b"\x89PNG fake image"
+
+    _, checksum = write_screenshot(tmp_path / "screenshot.png", data)
+
+    assert checksum == "blake2b:" + hashlib.blake2b(data, digest_size=16).hexdigest()
+    assert compute_checksum(data) == checksum
+
+
+def test_write_html_gz_streams_valid_gzip_with_matching_size_and_checksum(tmp_path):
+    """Streamed gzip output decompresses to the HTML; size/checksum describe the file on disk."""
+    path = tmp_path / "html_gz.html.gz"
+    html = "<html><body>" + "<p>Caf\u00e9 product</p>" * 20000 + "</body></html>"
+
+    size, checksum = write_html_gz(path, html)
+
+    raw = path.read_bytes()
+    assert gzip.decompress(raw).decode("utf-8") == html
+    assert size == len(raw)
+    assert checksum == hashlib.md5(raw).hexdigest()
+
+
+def test_write_text_and_html_gz_accept_bytes(tmp_path):
+    """Pre-encoded bytes produce the same files and checksums as the equivalent str."""
+    text = "Caf\u00e9 visible text"
+
+    assert write_text(tmp_path / "a.txt", text.encode("utf-8")) == write_text(
+        tmp_path / "b.txt", text
+    )
+    _, checksum = write_html_gz(tmp_path / "html_gz.html.gz", text.encode("utf-8"))
+
+    raw = (tmp_path / "html_gz.html.gz").read_bytes()
+    assert gzip.decompress(raw).decode("utf-8") == text
+    assert checksum == hashlib.md5(raw).hexdigest()
+
+
+def test_get_storage_uri_relative_under_root_and_unchanged_outside():
+    """Paths under the artifacts root become relative URIs; other paths pass through."""
+    session_id = uuid4()
+    path = build_artifact_path(session_id, "homepage", "desktop", "screenshot", DOMAIN)
+
+    assert get_storage_uri(path) == f"{DOMAIN}__{session_id}/homepage/desktop/screenshot.png"
+    assert get_storage_uri(Path("/elsewhere/file.png")) == "/elsewhere/file.png"
+
+
+def test_ensure_artifact_dir_creates_each_directory_once(tmp_path):
+    """Repeated writes into the same directory only mkdir it the first time."""
+    target = tmp_path / "example.com__s" / "homepage" / "desktop"
+    ensure_artifact_dir(target / "screenshot.png")
+    assert target.is_dir()
+
+    with patch.object(Path, "mkdir") as mkdir:
+        ensure_artifact_dir(target / "visible_text.txt")
+        ensure_artifact_dir(target / "features_json.json")
+
+    mkdir.assert_not_called()
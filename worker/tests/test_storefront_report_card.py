@@ -0,0 +1,168 @@
+"""
+Tests for storefront report card stage descriptions: single batched JSON completion with fallback.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from worker import storefront_report_card
+from worker.storefront_report_card import (
+    _cost_per_token,
+    _cost_usd,
+    _trim,
+    generate_final_thoughts,
+    generate_stage_description,
+    generate_stage_descriptions_batched,
+    generate_storefront_report_card,
+    load_tokenizer,
+)
+
+_STAGE_SCORES = {"awareness": 85.0, "consideration": 60.0, "conversion": 30.0}
+_STAGE_SUMMARIES = [
+    {"stage": "Awareness", "summary": "Clear value proposition."},
+    {"stage": "Consideration", "summary": "Product pages lack reviews."},
+    {"stage": "Conversion", "summary": "Checkout is confusing."},
+]
+
+
+def _response(content: str, prompt_tokens: int = 200, completion_tokens: int = 50):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+    )
+
+
+def test_generate_stage_descriptions_batched_single_json_call():
+    """All three descriptions come from one JSON-mode completion."""
+    content = (
+        '{"awareness": " Strong brand. ", "consideration": "Add reviews.", '
+        '"conversion": "Simplify checkout."}'
+    )
+    client = MagicMock(close=AsyncMock())
+    with (
+        patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}),
+        patch("worker.storefront_report_card._new_client", return_value=client),
+        patch(
+            "worker.storefront_report_card.acreate_chat_completion",
+            new=AsyncMock(return_value=_response(content)),
+        ) as create,
+    ):
+        result = asyncio.run(generate_stage_descriptions_batched(_STAGE_SCORES, _STAGE_SUMMARIES))
+
+    assert create.call_count == 1
+    client.close.assert_awaited_once()
+    assert create.call_args.kwargs["response_format"] == {"type": "json_object"}
+    descriptions, token_usage = result
+    assert descriptions == {
+        "awareness": "Strong brand.",
+        "consideration": "Add reviews.",
+        "conversion": "Simplify checkout.",
+    }
+    assert token_usage["input_tokens"] == 200
+    assert token_usage["output_tokens"] == 50
+
+
+def test_stage_generators_close_only_the_clients_they_create():
+    """A generator closes a client it created (even on failure), never a caller's client."""
+    owned = MagicMock(close=AsyncMock())
+    shared = MagicMock(close=AsyncMock())
+    with (
+        patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}),
+        patch("worker.storefront_report_card._new_client", return_value=owned),
+        patch(
+            "worker.storefront_report_card.acreate_chat_completion",
+            new=AsyncMock(side_effect=RuntimeError("boom")),
+        ),
+    ):
+        asyncio.run(generate_stage_description("Awareness", 85.0, "Clear value proposition."))
+        asyncio.run(generate_final_thoughts("https://example.com", _STAGE_SCORES, [], [], 58.0))
+        asyncio.run(
+            generate_stage_descriptions_batched(_STAGE_SCORES, _STAGE_SUMMARIES, client=shared)
+        )
+
+    assert owned.close.await_count == 2
+    shared.close.assert_not_awaited()
+
+
+def test_generate_storefront_report_card_falls_back_on_unparseable_batch():
+    """Invalid batched JSON falls back to per-stage completions sharing one client."""
+    responses = {
+        "Expert e-commerce consultant. Strategic insights, optimization.": "Final thoughts text",
+    }
+
+    async def _fake_completion(client, **body):
+        system, user = body["messages"][0]["content"], body["messages"][1]["content"]
+        if system in responses:
+            return _response(responses[system])
+        if "response_format" in body:
+            return _response("not json")
+        stage = next(s for s in ("Awareness", "Consideration", "Conversion") if s in user)
+        return _response(f"{stage} text")
+
+    client = MagicMock(close=AsyncMock())
+
+    with (
+        patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}),
+        patch("worker.storefront_report_card._new_client", return_value=client) as new_client,
+        patch(
+            "worker.storefront_report_card.acreate_chat_completion",
+            new=AsyncMock(side_effect=_fake_completion),
+        ) as create,
+    ):
+        report_card = generate_storefront_report_card(
+            "https://example.com", _STAGE_SCORES, _STAGE_SUMMARIES, [], 58.0
+        )
+
+    assert create.call_count == 5
+    new_client.assert_called_once_with("sk-test")
+    assert all(call.args[0] is client for call in create.call_args_list)
+    client.close.assert_awaited_once()
+    assert report_card["stage_descriptions"] == {
+        "awareness": "Awareness text",
+        "consideration": "Consideration text",
+        "conversion": "Conversion text",
+    }
+    assert report_card["final_thoughts"] == "Final thoughts text"
+
+
+def test_trim_uses_token_limit_and_falls_back_to_characters():
+    """Text is cut on token boundaries when a tokenizer is available, else by characters."""
+    encoding = MagicMock()
+    encoding.encode.side_effect = lambda text: text.split()
+    encoding.decode.side_effect = lambda tokens: " ".join(tokens)
+
+    with patch("worker.storefront_report_card._encoding", return_value=encoding):
+        assert _trim("one two three four", max_tokens=2, max_chars=5) == "one two"
+        assert _trim("one two", max_tokens=2, max_chars=5) == "one two"
+    with patch("worker.storefront_report_card._encoding", return_value=None):
+        assert _trim("one two three four", max_tokens=2, max_chars=5) == "one t"
+
+
+def test_load_tokenizer_does_not_cache_a_failed_load(monkeypatch):
+    """A failed tiktoken load leaves trimming on characters and is retried on the next call."""
+    encoding = MagicMock()
+    fake_tiktoken = MagicMock()
+    fake_tiktoken.get_encoding.side_effect = [OSError("network down"), encoding]
+    monkeypatch.setattr(storefront_report_card, "tiktoken", fake_tiktoken)
+    monkeypatch.setattr(storefront_report_card, "_ENCODING", None)
+
+    assert load_tokenizer() is False
+    assert storefront_report_card._encoding() is None
+    assert load_tokenizer() is True
+    assert storefront_report_card._encoding() is encoding
+    assert load_tokenizer() is True
+    assert fake_tiktoken.get_encoding.call_count == 2
+
+
+def test_cost_usd_uses_env_prices_per_token(monkeypatch):
+    """Prices are read from env once (cached) and applied per token."""
+    monkeypatch.setenv("OPENAI_PRICE_INPUT_PER_1M", "2.00")
+    monkeypatch.setenv("OPENAI_PRICE_OUTPUT_PER_1M", "8.00")
+    _cost_per_token.cache_clear()
+    try:
+        assert _cost_usd(1_000_000, 500_000) == 2.0 + 4.0
+    finally:
+        _cost_per_token.cache_clear()